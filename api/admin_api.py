@@ -8,6 +8,7 @@ Designed for Railway deployments with minimal code pushes
 from fastapi import APIRouter, HTTPException, Request, Header
 from pydantic import BaseModel
 from typing import Optional, Dict, List
+import asyncio
 import logging
 import os
 import sqlalchemy as sa
@@ -19,6 +20,12 @@ from api.rate_limits import limiter, get_rate_limit
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Models that can be hot-reloaded
+MODEL_TYPES = ("threat_classifier", "visual_detector", "audio_classifier")
+
+# Models that can run a canary/shadow rollout
+ROLLOUT_MODEL_TYPES = ("visual_detector", "audio_classifier")
+
 # Admin authentication (simple token-based)
 ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "change-me-in-production")
 
@@ -53,6 +60,21 @@ class ModelReloadResponse(BaseModel):
     reloaded_at: str
 
 
+class RolloutRequest(BaseModel):
+    """Start a canary/shadow rollout of a candidate version"""
+    model_type: str  # 'visual_detector', 'audio_classifier'
+    version: str
+    mode: str = "canary"  # 'canary' or 'shadow'
+    percent: float = 5.0
+    force_download: bool = False
+
+
+class RolloutUpdateRequest(BaseModel):
+    """Change a running rollout"""
+    mode: Optional[str] = None
+    percent: Optional[float] = None
+
+
 class ModelUploadRequest(BaseModel):
     """Model upload notification (after manual S3 upload)"""
     model_name: str
@@ -85,51 +107,38 @@ async def reload_models(
     """
     verify_admin(authorization)
 
+    if reload_request.model_type != "all" and reload_request.model_type not in MODEL_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid model_type: {reload_request.model_type}"
+        )
+
     try:
         from datetime import datetime
 
-        model_manager = get_model_manager()
+        model_manager = await get_model_manager()
 
-        if reload_request.model_type == "all":
-            # Reload all models
-            logger.info("🔄 Reloading ALL models...")
+        # Each model is shadow-loaded and swapped in; requests keep being served throughout
+        model_types = MODEL_TYPES if reload_request.model_type == "all" else (reload_request.model_type,)
+        logger.info(f"🔄 Reloading {', '.join(model_types)} (v{reload_request.version})...")
 
-            # Reload each model
-            await model_manager.threat_classifier.load_model()
-            await model_manager.visual_detector.initialize()
-            await model_manager.audio_classifier.load_model()
-
-            return ModelReloadResponse(
-                success=True,
-                model_type="all",
-                version=reload_request.version,
-                message="All models reloaded successfully",
-                reloaded_at=datetime.utcnow().isoformat()
-            )
-
-        elif reload_request.model_type == "threat_classifier":
-            logger.info(f"🔄 Reloading threat classifier (v{reload_request.version})...")
-            await model_manager.threat_classifier.load_model()
-
-        elif reload_request.model_type == "visual_detector":
-            logger.info(f"🔄 Reloading visual detector (v{reload_request.version})...")
-            await model_manager.visual_detector.initialize()
-
-        elif reload_request.model_type == "audio_classifier":
-            logger.info(f"🔄 Reloading audio classifier (v{reload_request.version})...")
-            await model_manager.audio_classifier.load_model()
-
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid model_type: {reload_request.model_type}"
+        handles = [
+            await model_manager.reload(
+                model_type,
+                version=reload_request.version or "latest",
+                force_download=reload_request.force_download
             )
+            for model_type in model_types
+        ]
 
         return ModelReloadResponse(
             success=True,
             model_type=reload_request.model_type,
             version=reload_request.version,
-            message=f"{reload_request.model_type} reloaded successfully",
+            message=(
+                "All models reloaded successfully" if reload_request.model_type == "all"
+                else f"{reload_request.model_type} reloaded successfully"
+            ) + " (" + ", ".join(f"{h.name}: {h.version}, generation {h.generation}" for h in handles) + ")",
             reloaded_at=datetime.utcnow().isoformat()
         )
 
@@ -138,6 +147,118 @@ async def reload_models(
         raise HTTPException(status_code=500, detail=f"Model reload failed: {str(e)}")
 
 
+@router.post("/rollouts", dependencies=[])
+@limiter.limit("10/minute")
+async def start_rollout(
+    request: Request,
+    rollout_request: RolloutRequest,
+    authorization: str = Header(None)
+):
+    """
+    Load a candidate model version next to the current one and send it traffic
+
+    - canary: `percent` of requests are served by the candidate (sticky per device)
+    - shadow: the candidate re-runs live requests in the background; responses
+      always come from the current version
+
+    Compare latency and agreement with GET /admin/rollouts, then promote or abort.
+
+    Example:
+        curl -X POST https://atlas.railway.app/admin/rollouts \\
+          -H "Authorization: Bearer $ADMIN_TOKEN" \\
+          -H "Content-Type: application/json" \\
+          -d '{"model_type": "visual_detector", "version": "v2.1.0", "mode": "shadow"}'
+    """
+    verify_admin(authorization)
+
+    if rollout_request.model_type not in ROLLOUT_MODEL_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid model_type: {rollout_request.model_type}")
+
+    model_manager = await get_model_manager()
+    try:
+        rollout = await model_manager.start_rollout(
+            rollout_request.model_type,
+            rollout_request.version,
+            mode=rollout_request.mode,
+            percent=rollout_request.percent,
+            force_download=rollout_request.force_download
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Rollout failed to start: {e}")
+        raise HTTPException(status_code=500, detail=f"Rollout failed to start: {str(e)}")
+
+    return {"model_type": rollout_request.model_type, **rollout.summary()}
+
+
+@router.get("/rollouts", dependencies=[])
+@limiter.limit("60/minute")
+async def list_rollouts(request: Request, authorization: str = Header(None)):
+    """Running rollouts with per-version latency and agreement with the current version"""
+    verify_admin(authorization)
+
+    model_manager = await get_model_manager()
+    return {"rollouts": model_manager.get_rollouts()}
+
+
+@router.patch("/rollouts/{model_type}", dependencies=[])
+@limiter.limit("10/minute")
+async def update_rollout(
+    request: Request,
+    model_type: str,
+    update: RolloutUpdateRequest,
+    authorization: str = Header(None)
+):
+    """Change the mode or canary percentage of a running rollout"""
+    verify_admin(authorization)
+
+    model_manager = await get_model_manager()
+    try:
+        rollout = model_manager.update_rollout(model_type, mode=update.mode, percent=update.percent)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No rollout running for {model_type}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"model_type": model_type, **rollout.summary()}
+
+
+@router.post("/rollouts/{model_type}/promote", dependencies=[])
+@limiter.limit("10/minute")
+async def promote_rollout(request: Request, model_type: str, authorization: str = Header(None)):
+    """Make the candidate the current version (the previous one drains)"""
+    verify_admin(authorization)
+
+    model_manager = await get_model_manager()
+    try:
+        handle = model_manager.promote_rollout(model_type)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No rollout running for {model_type}")
+
+    return {
+        "model_type": model_type,
+        "version": handle.version,
+        "generation": handle.generation,
+        "message": f"{model_type} promoted to {handle.version}"
+    }
+
+
+@router.delete("/rollouts/{model_type}", dependencies=[])
+@limiter.limit("10/minute")
+async def abort_rollout(request: Request, model_type: str, authorization: str = Header(None)):
+    """Stop a rollout and unload the candidate"""
+    verify_admin(authorization)
+
+    model_manager = await get_model_manager()
+    try:
+        model_manager.abort_rollout(model_type)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No rollout running for {model_type}")
+
+    return {"model_type": model_type, "message": f"{model_type} rollout aborted"}
+
+
 @router.post("/collect-now", dependencies=[])
 @limiter.limit("20/hour")
 async def collect_now(
@@ -246,13 +367,17 @@ async def list_model_versions(
     """
     List all available versions of a model in S3
 
-    Returns versions in descending order (newest first)
+    Returns versions in descending semantic-version order (newest first).
+    Listing and metadata are served from the storage metadata cache.
     """
     verify_admin(authorization)
 
     try:
         storage = get_model_storage()
-        versions = await storage.list_model_versions(model_name)
+        versions, metadata = await asyncio.gather(
+            storage.list_model_versions(model_name),
+            storage.get_model_metadata(model_name)
+        )
 
         if not versions:
             return {
@@ -266,7 +391,8 @@ async def list_model_versions(
             "model_name": model_name,
             "versions": versions,
             "storage_type": storage.storage_type,
-            "latest": versions[0] if versions else None
+            # What 'latest' points to (metadata.json), else the highest version
+            "latest": (metadata or {}).get("version") or versions[0]
         }
 
     except Exception as e:
@@ -317,7 +443,7 @@ async def admin_health(request: Request, authorization: str = Header(None)):
         import psutil
         from datetime import datetime
 
-        model_manager = get_model_manager()
+        model_manager = await get_model_manager()
         storage = get_model_storage()
 
         return {
@@ -328,24 +454,15 @@ async def admin_health(request: Request, authorization: str = Header(None)):
                 "memory_percent": psutil.virtual_memory().percent,
                 "disk_percent": psutil.disk_usage('/').percent
             },
-            "models": {
-                "threat_classifier": {
-                    "loaded": True,
-                    "type": type(model_manager.threat_classifier).__name__
-                },
-                "visual_detector": {
-                    "loaded": model_manager.visual_detector.loaded,
-                    "device": model_manager.visual_detector.device
-                },
-                "audio_classifier": {
-                    "loaded": model_manager.audio_classifier.loaded,
-                    "device": model_manager.audio_classifier.device
-                }
-            },
+            # Reported from the manager's handles (does not trigger lazy loads)
+            "models": model_manager.get_model_info()["models"],
+            "model_memory": model_manager.get_model_info()["memory"],
             "storage": {
                 "type": storage.storage_type,
                 "bucket": storage.s3_bucket if storage.storage_type == "s3" else None,
-                "cache_dir": str(storage.local_cache_dir)
+                "cache_dir": str(storage.local_cache_dir),
+                "cache": storage.cache.stats(),
+                "prefetch": storage.prefetch_status()
             }
         }
 
@@ -363,37 +480,22 @@ async def clear_model_cache(request: Request, authorization: str = Header(None))
     """
     Clear local model cache (forces re-download from S3)
 
-    Use this after uploading a new model with the same version number
+    Use this after uploading a new model with the same version number.
+    Versions currently loaded stay cached until they are swapped out.
     """
     verify_admin(authorization)
 
     try:
-        import shutil
-
         storage = get_model_storage()
-        cache_dir = storage.local_cache_dir
-
-        if cache_dir.exists():
-            # Remove all .pt and .pth files
-            cleared = []
-            for model_file in cache_dir.glob("*.pt"):
-                model_file.unlink()
-                cleared.append(model_file.name)
-            for model_file in cache_dir.glob("*.pth"):
-                model_file.unlink()
-                cleared.append(model_file.name)
+        # Versions of loaded models are kept (pinned); local-mode files in models/ are untouched
+        cleared = await asyncio.to_thread(storage.cache.clear)
 
-            return {
-                "success": True,
-                "cleared_files": cleared,
-                "message": f"Cleared {len(cleared)} model files from cache"
-            }
-        else:
-            return {
-                "success": True,
-                "cleared_files": [],
-                "message": "Cache directory does not exist"
-            }
+        return {
+            "success": True,
+            "cleared_files": cleared,
+            "message": f"Cleared {len(cleared)} cached model versions",
+            "cache": storage.cache.stats()
+        }
 
     except Exception as e:
         logger.error(f"Cache clear failed: {e}")
@@ -7,11 +7,18 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Request
 from pydantic import BaseModel, constr, validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+import asyncio
 import base64
+import logging
 
-from services.model_manager import get_model_manager
+from services.model_manager import ModelNotReadyError, get_model_manager
+from services.media_analyzer import get_media_analyzer
+from services.media_fetcher import get_media_fetcher, MediaFetchError
+from config.settings import settings
 from api.rate_limits import limiter, get_rate_limit
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -67,7 +74,7 @@ class IncidentClassificationResponse(BaseModel):
 
 @router.post("/halo/analyze", response_model=ThreatAnalysisResponse)
 @limiter.limit(get_rate_limit("halo"))
-async def analyze_threat(request: ThreatAnalysisRequest):
+async def analyze_threat(request: Request, analysis_request: ThreatAnalysisRequest):
     """
     Unified threat analysis endpoint for Halo
 
@@ -77,6 +84,9 @@ async def analyze_threat(request: ThreatAnalysisRequest):
     - Audio (audio classifier)
     - Multi-modal combinations
 
+    **Media URLs** are fetched concurrently through the shared pooled fetcher
+    (keep-alive connections to the Halo CDN) and analyzed via the result cache.
+
     **Uses shared models** - same models as SAIT and Frontline
     **Product-specific** - returns Halo incident types and severity
     """
@@ -90,31 +100,42 @@ async def analyze_threat(request: ThreatAnalysisRequest):
         results = {
             "text_analysis": None,
             "visual_analysis": None,
-            "audio_analysis": None
+            "audio_analysis": None,
+            "video_analysis": None
         }
 
         # Analyze text if provided
-        if request.text:
+        if analysis_request.text:
             threat_classifier = manager.threat_classifier
             text_result = await threat_classifier.classify_text(
-                description=request.text,
-                context=request.context or {}
+                description=analysis_request.text,
+                context=analysis_request.context or {}
             )
             results["text_analysis"] = text_result
 
-        # Analyze image if provided
-        if request.image_url:
-            visual_detector = manager.visual_detector
-            # TODO: Download image from URL and analyze
-            # For now, placeholder
-            results["visual_analysis"] = {"status": "pending", "url": request.image_url}
-
-        # Analyze audio if provided
-        if request.audio_url:
-            audio_classifier = manager.audio_classifier
-            # TODO: Download audio from URL and analyze
-            # For now, placeholder
-            results["audio_analysis"] = {"status": "pending", "url": request.audio_url}
+        # Fetch and analyze media URLs concurrently
+        media_jobs = [
+            (result_key, media_type, url)
+            for result_key, media_type, url in (
+                ("visual_analysis", "photo", analysis_request.image_url),
+                ("audio_analysis", "audio", analysis_request.audio_url),
+                ("video_analysis", "video", analysis_request.video_url),
+            )
+            if url
+        ]
+        if media_jobs:
+            analyzer = await get_media_analyzer()
+            media_results = await asyncio.gather(*[
+                _analyze_media_url(analyzer, media_type, url)
+                for _, media_type, url in media_jobs
+            ], return_exceptions=True)
+            for (result_key, media_type, url), media_result in zip(media_jobs, media_results):
+                if isinstance(media_result, ModelNotReadyError):
+                    raise media_result  # 503 + Retry-After for the whole request
+                if isinstance(media_result, BaseException):
+                    logger.error(f"{media_type} analysis failed for {url}: {media_result}")
+                    media_result = {"status": "failed", "url": url, "error": str(media_result)}
+                results[result_key] = media_result
 
         # Combine results and map to Halo incident types
         final_threat = _combine_analysis_results(results)
@@ -131,10 +152,25 @@ async def analyze_threat(request: ThreatAnalysisRequest):
             processing_time_ms=processing_time
         )
 
+    except ModelNotReadyError:
+        raise  # 503 + Retry-After (main.py handler)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+async def _analyze_media_url(analyzer, media_type: str, url: str) -> Dict[str, Any]:
+    """Fetch media by URL and analyze it (errors are reported per modality)"""
+    try:
+        media = await get_media_fetcher().fetch(url)
+    except MediaFetchError as e:
+        return {"status": "failed", "url": url, "error": str(e), "error_code": e.status_code}
+
+    analysis = await analyzer.analyze_cached(media_type, media.content)
+    analysis["url"] = url
+    analysis["size_bytes"] = media.size_bytes
+    return analysis
+
+
 @router.post("/halo/classify-incident", response_model=IncidentClassificationResponse)
 @limiter.limit(get_rate_limit("halo"))
 async def classify_incident(request: Request, incident: IncidentSubmission):
@@ -196,38 +232,45 @@ async def analyze_media(request: Request, file: UploadFile = File(...)):
     start = time.time()
 
     try:
-        # Get shared model manager
-        manager = await get_model_manager()
-
         # Detect media type
-        content_type = file.content_type
+        content_type = file.content_type or ""
 
         if content_type.startswith("image/"):
-            # Use shared visual detector
-            detector = manager.visual_detector
-            # TODO: Process image
-            result = {"type": "image", "status": "pending"}
-
+            media_type = "photo"
         elif content_type.startswith("audio/"):
-            # Use shared audio classifier
-            classifier = manager.audio_classifier
-            # TODO: Process audio
-            result = {"type": "audio", "status": "pending"}
-
+            media_type = "audio"
         elif content_type.startswith("video/"):
-            # Use shared visual detector
-            detector = manager.visual_detector
-            # TODO: Process video
-            result = {"type": "video", "status": "pending"}
-
+            media_type = "video"
         else:
             raise HTTPException(status_code=400, detail=f"Unsupported media type: {content_type}")
 
+        media_bytes = await file.read()
+        if len(media_bytes) > settings.MAX_MEDIA_SIZE_MB * 1024 * 1024:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Media too large: {len(media_bytes)/1024/1024:.1f}MB (max {settings.MAX_MEDIA_SIZE_MB}MB)"
+            )
+
+        # Shared analyzer (same models as SAIT/Frontline), consulted through the
+        # content-addressed cache so client retries don't re-run inference
+        analyzer = await get_media_analyzer()
+        analysis = await analyzer.analyze_cached(media_type, media_bytes)
+
+        result = {
+            "type": "image" if media_type == "photo" else media_type,
+            "status": "completed" if analysis.get("success") else "failed",
+            "analysis": analysis
+        }
+
         processing_time = int((time.time() - start) * 1000)
         result["processing_time_ms"] = processing_time
 
         return result
 
+    except HTTPException:
+        raise
+    except ModelNotReadyError:
+        raise  # 503 + Retry-After (main.py handler)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Media analysis failed: {str(e)}")
 
@@ -269,17 +312,37 @@ async def get_nearby_intelligence(request: Request,
 
 
 def _combine_analysis_results(results: Dict[str, Any]) -> Dict[str, Any]:
-    """Combine multi-modal analysis results"""
-    # Simplified combination logic
-    text_result = results.get("text_analysis")
+    """Combine multi-modal analysis results (highest severity modality wins)"""
+    candidates = []
 
+    text_result = results.get("text_analysis")
     if text_result:
-        return {
-            "detected": text_result.get("severity", 1) > 2,
+        candidates.append({
             "category": text_result.get("threat_category", "unknown"),
             "confidence": text_result.get("confidence", 0.0),
             "severity": text_result.get("severity", 1),
             "recommendations": text_result.get("recommendations", [])
+        })
+
+    for key in ("visual_analysis", "audio_analysis", "video_analysis"):
+        media_result = results.get(key)
+        if not media_result or not media_result.get("success"):
+            continue
+        classification = media_result.get("threat_classification") or {}
+        if not classification:
+            continue
+        candidates.append({
+            "category": classification.get("threat_category", classification.get("category", "unknown")),
+            "confidence": classification.get("confidence", 0.0),
+            "severity": classification.get("severity", 1),
+            "recommendations": media_result.get("recommendations", [])
+        })
+
+    if candidates:
+        best = max(candidates, key=lambda c: (c["severity"], c["confidence"]))
+        return {
+            "detected": best["severity"] > 2,
+            **best
         }
 
     return {
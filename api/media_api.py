@@ -9,6 +9,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from api.rate_limits import limiter, get_rate_limit
+from services.model_manager import ModelNotReadyError
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -83,7 +84,8 @@ async def analyze_media(
 
         # Analyze based on media type
         if media_type == "photo":
-            result = await analyzer.analyze_photo(
+            result = await analyzer.analyze_cached(
+                "photo",
                 file_bytes,
                 return_detailed=(analysis_depth == "detailed")
             )
@@ -101,7 +103,7 @@ async def analyze_media(
             )
 
         elif media_type == "video":
-            result = await analyzer.analyze_video(file_bytes, keyframe_fps=1.0)
+            result = await analyzer.analyze_cached("video", file_bytes, keyframe_fps=1.0)
             return MediaAnalysisResponse(
                 success=True,
                 media_type="video",
@@ -111,7 +113,7 @@ async def analyze_media(
             )
 
         elif media_type == "audio":
-            result = await analyzer.analyze_audio(file_bytes)
+            result = await analyzer.analyze_cached("audio", file_bytes)
             return MediaAnalysisResponse(
                 success=True,
                 media_type="audio",
@@ -126,6 +128,8 @@ async def analyze_media(
 
     except HTTPException:
         raise
+    except ModelNotReadyError:
+        raise  # 503 + Retry-After (main.py handler)
     except Exception as e:
         logger.error(f"Error in analyze_media: {e}")
         raise HTTPException(status_code=500, detail=str(e))
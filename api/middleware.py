@@ -0,0 +1,60 @@
+"""
+HTTP middleware
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Bodies that are binary/already compressed - gzip costs CPU and saves nothing
+GZIP_EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/octet-stream",
+    "application/zip",
+    "application/gzip",
+    "multipart/byteranges",
+    "image/",
+    "audio/",
+    "video/",
+)
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    """GZipResponder that passes excluded content types and partial content through"""
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await super().send_with_compression(message)
+            headers = Headers(raw=message["headers"])
+            if (
+                headers.get("content-type", "").startswith(GZIP_EXCLUDED_CONTENT_TYPES)
+                or "content-range" in headers
+            ):
+                self.content_type_is_excluded = True
+            return
+        await super().send_with_compression(message)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZip for JSON/text responses only
+
+    Streamed file downloads (OTA model packages) keep their Content-Length,
+    stay chunk-streamed instead of buffered through the compressor, and
+    Range requests get byte ranges of the identity representation.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if "range" in headers:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        elif "gzip" in headers.get("Accept-Encoding", ""):
+            responder = _SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
@@ -3,18 +3,41 @@ SAIT Device Integration API
 Endpoints for edge verification, OTA updates, and device management
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+import asyncio
 import base64
+import hashlib
+import json
+import logging
 import numpy as np
 
-from services.model_manager import get_model_manager
+from services.acoustic_index import get_acoustic_index
+from services.audio_classifier import OTA_FORMATS
+from services.audio_stream import get_stream_hub
+from services.model_manager import ModelNotReadyError, get_model_manager
+from services.ota_store import etag_matches, get_ota_store
+from services.result_cache import get_analysis_cache
 from api.rate_limits import limiter, get_rate_limit
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Maximum detections per /sait/verify/batch request
+MAX_VERIFY_BATCH_SIZE = 64
+
+# Raw PCM uploads (/sait/verify/raw)
+MAX_RAW_PCM_BYTES = 5 * 1024 * 1024  # ~160s of 16kHz int16 audio
+RAW_PCM_CONTENT_TYPES = {"application/octet-stream", "audio/l16", "audio/pcm"}
+
+# Live streams (/sait/stream): largest binary frame accepted (~2s of 16kHz int16 audio)
+MAX_STREAM_FRAME_BYTES = 64 * 1024
+
 
 class EdgeDetection(BaseModel):
     """Edge detection from SAIT device"""
@@ -40,6 +63,67 @@ class EdgeVerificationResponse(BaseModel):
     processing_time_ms: int
 
 
+class EdgeDetectionBatch(BaseModel):
+    """Batch of edge detections forwarded by a SAIT mesh gateway"""
+    detections: List[EdgeDetection] = Field(..., min_length=1, max_length=MAX_VERIFY_BATCH_SIZE)
+
+
+class BatchVerificationItem(BaseModel):
+    """Per-detection result within a batch (same order as the request)"""
+    index: int
+    device_id: str
+    success: bool
+    result: Optional[EdgeVerificationResponse] = None
+    error: Optional[str] = None
+
+
+class EdgeVerificationBatchResponse(BaseModel):
+    """Batched cloud verification result"""
+    results: List[BatchVerificationItem]
+    total: int
+    cloud_inferences: int  # Clips actually run through the model (cache misses)
+    processing_time_ms: int
+
+
+class SimilarSoundsRequest(BaseModel):
+    """Similar-sound query: a clip (base64 PCM) or an already indexed clip_id"""
+    audio_base64: Optional[str] = None  # 16kHz, 16-bit PCM
+    clip_id: Optional[str] = None
+    k: int = Field(default=10, ge=1, le=100)
+    class_id: Optional[int] = None  # Only clips verified as this SAIT class
+    device_id: Optional[str] = None  # Only clips from this device
+    min_similarity: float = Field(default=0.0, ge=-1.0, le=1.0)
+
+
+class SimilarSound(BaseModel):
+    """Indexed verified clip"""
+    clip_id: str
+    similarity: float
+    device_id: str
+    class_id: int
+    class_name: str
+    threat_category: str
+    confidence: float
+    timestamp: Optional[str] = None
+
+
+class SimilarSoundsResponse(BaseModel):
+    """Similar-sound search result"""
+    results: List[SimilarSound]
+    index_size: int
+    search_mode: str
+    processing_time_ms: int
+
+
+class DeltaPackage(BaseModel):
+    """Binary delta from the device's current version to the latest"""
+    base_version: str
+    download_url: str
+    size_kb: int
+    checksum: str  # Checksum of the delta file
+    result_checksum: str  # Checksum of the reconstructed model (same as ModelMetadata.checksum)
+
+
 class ModelMetadata(BaseModel):
     """Model version metadata"""
     model_version: str
@@ -54,11 +138,121 @@ class ModelMetadata(BaseModel):
     compatible_devices: List[str]
     download_url: str
     checksum: str
+    delta: Optional[DeltaPackage] = None  # Offered when the device's current_version is known
+
+
+def _pcm16_to_float(audio_bytes: bytes) -> np.ndarray:
+    """Convert 16kHz, 16-bit little-endian PCM bytes to float32 samples in [-1, 1)"""
+    if len(audio_bytes) % 2:
+        raise ValueError("PCM payload has an odd number of bytes (expected int16 samples)")
+    # frombuffer is a zero-copy view; the scaled float32 array is the only copy
+    samples = np.frombuffer(audio_bytes, dtype="<i2").astype(np.float32)
+    samples *= 1.0 / 32768.0
+    return samples
+
+
+async def _classify_pcm_cached(audio_classifier, audio_bytes: bytes) -> Dict:
+    """Classify 16kHz int16 PCM through the analysis result cache (routed version)"""
+    async def compute():
+        manager = await get_model_manager()
+        return await manager.infer("audio_classifier", "classify_audio", _pcm16_to_float(audio_bytes))
+
+    return await get_analysis_cache().get_or_compute(
+        "sait_audio",
+        audio_bytes,
+        audio_classifier.cache_version,
+        compute
+    )
+
+
+async def _verify_pcm(
+    audio_classifier,
+    edge_class_id: int,
+    edge_confidence: float,
+    audio_bytes: bytes
+) -> Dict:
+    """Verify an edge detection against its 16kHz int16 PCM clip"""
+    # Cloud classification, shared through the content-addressed cache
+    # so duplicate forwards from SAIT gateways skip inference
+    cloud_result = None
+    if edge_confidence <= audio_classifier.EDGE_TRUST_THRESHOLD:
+        cloud_result = await _classify_pcm_cached(audio_classifier, audio_bytes)
+
+    return await audio_classifier.verify_edge_detection(
+        sait_detection={
+            "class_id": edge_class_id,
+            "confidence": edge_confidence
+        },
+        cloud_result=cloud_result
+    )
+
+
+def _clip_id(audio_bytes: bytes) -> str:
+    """Stable clip identifier (content hash of the PCM payload)"""
+    return hashlib.sha256(audio_bytes).hexdigest()[:32]
+
+
+async def _index_verified_clip(
+    audio_bytes: bytes,
+    device_id: str,
+    verification_result: Dict,
+    timestamp: Optional[datetime] = None
+):
+    """
+    Add a cloud-verified clip to the acoustic similarity index (background task)
+
+    Runs after the response, so it holds its own reference on the audio model
+    rather than reusing the request's (which a reload may have freed by then).
+    """
+    try:
+        index = get_acoustic_index()
+        clip_id = _clip_id(audio_bytes)
+        if index.contains(clip_id):
+            return
+
+        manager = await get_model_manager()
+        async with manager.use("audio_classifier", routing_key=device_id) as audio_classifier:
+            embeddings = await manager.infer("audio_classifier", "embed_audio_batch", [_pcm16_to_float(audio_bytes)])
+            class_id = verification_result["cloud_class"]
+            class_name = audio_classifier.SAIT_CLASSES.get(class_id, "unknown")
+        await asyncio.to_thread(index.add, clip_id, embeddings[0], {
+            "device_id": device_id,
+            "class_id": class_id,
+            "class_name": class_name,
+            "threat_category": verification_result["final_category"],
+            "confidence": verification_result["cloud_confidence"],
+            "timestamp": (timestamp or datetime.now()).isoformat()
+        })
+    except Exception as e:
+        logger.warning(f"Acoustic indexing failed for device {device_id}: {e}")
+
+
+async def _read_pcm_body(request: Request, max_bytes: int) -> bytearray:
+    """Stream the raw request body into one preallocated buffer (no join/b64 copies)"""
+    declared = int(request.headers.get("content-length", 0) or 0)
+    if declared > max_bytes:
+        raise HTTPException(status_code=413, detail=f"PCM payload too large: {declared} bytes (max {max_bytes})")
+
+    buffer = bytearray(declared)
+    received = 0
+    async for chunk in request.stream():
+        end = received + len(chunk)
+        if end > max_bytes:
+            raise HTTPException(status_code=413, detail=f"PCM payload too large (max {max_bytes} bytes)")
+        if end <= declared:
+            buffer[received:end] = chunk
+        else:
+            del buffer[received:]
+            buffer += chunk
+        received = end
+
+    del buffer[received:]
+    return buffer
 
 
 @router.post("/sait/verify", response_model=EdgeVerificationResponse)
 @limiter.limit(get_rate_limit("sait"))
-async def verify_edge_detection(request: Request, detection: EdgeDetection):
+async def verify_edge_detection(request: Request, detection: EdgeDetection, background_tasks: BackgroundTasks):
     """
     Verify SAIT edge detection with cloud model
 
@@ -79,68 +273,443 @@ async def verify_edge_detection(request: Request, detection: EdgeDetection):
     try:
         # Get shared model manager (singleton - loaded once for all products)
         manager = await get_model_manager()
-        audio_classifier = manager.audio_classifier
+        async with manager.use("audio_classifier", routing_key=detection.device_id) as audio_classifier:
+            # If audio provided, re-analyze with cloud model
+            if detection.audio_base64:
+                try:
+                    # Decode audio
+                    audio_bytes = base64.b64decode(detection.audio_base64)
+
+                    # Cloud verification
+                    verification_result = await _verify_pcm(
+                        audio_classifier,
+                        detection.edge_class_id,
+                        detection.edge_confidence,
+                        audio_bytes
+                    )
+                    if verification_result["action"] == "cloud_verified":
+                        background_tasks.add_task(
+                            _index_verified_clip,
+                            audio_bytes,
+                            detection.device_id,
+                            verification_result,
+                            detection.timestamp
+                        )
+
+                    processing_time = int((time.time() - start) * 1000)
+
+                    return EdgeVerificationResponse(
+                        **verification_result,
+                        processing_time_ms=processing_time
+                    )
+
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"Audio processing failed: {str(e)}")
+
+            # No audio - can only check if confidence is acceptable
+            if detection.edge_confidence > 0.85:
+                return EdgeVerificationResponse(
+                    verified=True,
+                    edge_confidence=detection.edge_confidence,
+                    cloud_confidence=detection.edge_confidence,
+                    edge_class=detection.edge_class_id,
+                    cloud_class=detection.edge_class_id,
+                    action="edge_detection_trusted",
+                    final_category=detection.edge_class_name,
+                    recommendations=["High edge confidence - no cloud verification needed"],
+                    processing_time_ms=int((time.time() - start) * 1000)
+                )
+            else:
+                return EdgeVerificationResponse(
+                    verified=False,
+                    edge_confidence=detection.edge_confidence,
+                    cloud_confidence=0.0,
+                    edge_class=detection.edge_class_id,
+                    cloud_class=-1,
+                    action="flagged_for_review",
+                    final_category="unknown",
+                    recommendations=["Low confidence, no audio provided for verification"],
+                    processing_time_ms=int((time.time() - start) * 1000)
+                )
 
-        # If audio provided, re-analyze with cloud model
-        if detection.audio_base64:
-            try:
-                # Decode audio
-                audio_bytes = base64.b64decode(detection.audio_base64)
-                # Convert to numpy array (assuming 16kHz, 16-bit PCM)
-                audio_data = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+    except ModelNotReadyError:
+        raise  # 503 + Retry-After (main.py handler)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
+
+
+@router.post("/sait/verify/raw", response_model=EdgeVerificationResponse)
+@limiter.limit(get_rate_limit("sait"))
+async def verify_edge_detection_raw(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    device_id: str,
+    edge_class_id: int,
+    edge_class_name: str,
+    edge_confidence: float,
+    timestamp: Optional[datetime] = None
+):
+    """
+    Verify SAIT edge detection with a raw binary PCM body (no base64)
+
+    **Request:**
+    - Body: 16kHz, 16-bit little-endian mono PCM
+      (`Content-Type: application/octet-stream` or `audio/L16`)
+    - Detection metadata as query parameters
+
+    Saves the 33% base64 overhead on constrained gateway links, and the server
+    skips the base64 decode and the JSON parse of a multi-hundred-KB string:
+    the body is streamed into one buffer and viewed with `np.frombuffer`.
+
+    Returns the same response as `/sait/verify`.
+    """
+    import time
+    start = time.time()
 
-                # Cloud verification
+    content_type = request.headers.get("content-type", "application/octet-stream").split(";")[0].strip().lower()
+    if content_type not in RAW_PCM_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
+
+    try:
+        manager = await get_model_manager()
+        audio_bytes = await _read_pcm_body(request, MAX_RAW_PCM_BYTES)
+
+        async with manager.use("audio_classifier", routing_key=device_id) as audio_classifier:
+            if audio_bytes:
+                try:
+                    verification_result = await _verify_pcm(
+                        audio_classifier,
+                        edge_class_id,
+                        edge_confidence,
+                        audio_bytes
+                    )
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"Audio processing failed: {str(e)}")
+            else:
                 verification_result = await audio_classifier.verify_edge_detection(
                     sait_detection={
-                        "class_id": detection.edge_class_id,
-                        "confidence": detection.edge_confidence
-                    },
-                    audio_data=audio_data
+                        "class_id": edge_class_id,
+                        "confidence": edge_confidence
+                    }
                 )
 
-                processing_time = int((time.time() - start) * 1000)
-
-                return EdgeVerificationResponse(
-                    **verification_result,
-                    processing_time_ms=processing_time
+            if audio_bytes and verification_result["action"] == "cloud_verified":
+                background_tasks.add_task(
+                    _index_verified_clip,
+                    audio_bytes,
+                    device_id,
+                    verification_result,
+                    timestamp
                 )
 
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=f"Audio processing failed: {str(e)}")
-
-        # No audio - can only check if confidence is acceptable
-        if detection.edge_confidence > 0.85:
             return EdgeVerificationResponse(
-                verified=True,
-                edge_confidence=detection.edge_confidence,
-                cloud_confidence=detection.edge_confidence,
-                edge_class=detection.edge_class_id,
-                cloud_class=detection.edge_class_id,
-                action="edge_detection_trusted",
-                final_category=detection.edge_class_name,
-                recommendations=["High edge confidence - no cloud verification needed"],
+                **verification_result,
                 processing_time_ms=int((time.time() - start) * 1000)
             )
-        else:
-            return EdgeVerificationResponse(
-                verified=False,
-                edge_confidence=detection.edge_confidence,
-                cloud_confidence=0.0,
-                edge_class=detection.edge_class_id,
-                cloud_class=-1,
-                action="flagged_for_review",
-                final_category="unknown",
-                recommendations=["Low confidence, no audio provided for verification"],
+
+    except HTTPException:
+        raise
+    except ModelNotReadyError:
+        raise  # 503 + Retry-After (main.py handler)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
+
+
+@router.post("/sait/verify/batch", response_model=EdgeVerificationBatchResponse)
+@limiter.limit(get_rate_limit("sait"))
+async def verify_edge_detections_batch(
+    request: Request,
+    batch: EdgeDetectionBatch,
+    background_tasks: BackgroundTasks
+):
+    """
+    Verify many SAIT edge detections in one request
+
+    **Flow:**
+    1. Mesh gateway collects low-confidence detections from many devices
+    2. Gateway forwards them in one request
+    3. Cloud extracts features for all clips and runs one stacked forward pass
+    4. Returns per-detection results in request order
+
+    Invalid items (e.g. undecodable audio) get an error entry; they never fail
+    the whole batch. Clips already analyzed (retries, duplicate forwards) are
+    answered from the analysis cache.
+    """
+    import time
+    start = time.time()
+
+    try:
+        manager = await get_model_manager()
+        async with manager.use("audio_classifier") as audio_classifier:
+            cache = get_analysis_cache()
+            model_version = audio_classifier.cache_version
+
+            detections = batch.detections
+            errors: Dict[int, str] = {}
+            cloud_results: Dict[int, Dict] = {}
+            pending: Dict[str, Dict[str, Any]] = {}  # cache key -> {indices, audio}
+            audio_payloads: Dict[int, bytes] = {}
+
+            # Decode audio and consult the cache
+            for index, detection in enumerate(detections):
+                if not detection.audio_base64:
+                    continue
+                if detection.edge_confidence > audio_classifier.EDGE_TRUST_THRESHOLD:
+                    continue
+
+                try:
+                    audio_bytes = base64.b64decode(detection.audio_base64)
+                    audio_data = _pcm16_to_float(audio_bytes)
+                except Exception as e:
+                    errors[index] = f"Audio processing failed: {str(e)}"
+                    continue
+
+                audio_payloads[index] = audio_bytes
+                key = cache.make_key("sait_audio", audio_bytes, model_version)
+                if key in pending:
+                    pending[key]["indices"].append(index)
+                    continue
+
+                cached = await cache.get(key)
+                if cached is not None:
+                    cloud_results[index] = cached
+                else:
+                    pending[key] = {"indices": [index], "audio": audio_data}
+
+            # One stacked forward pass for every cache miss
+            if pending:
+                keys = list(pending.keys())
+                batch_results = await manager.infer(
+                    "audio_classifier", "classify_audio_batch", [pending[key]["audio"] for key in keys]
+                )
+                for key, cloud_result in zip(keys, batch_results):
+                    if cloud_result.get("success"):
+                        await cache.set(key, cloud_result)
+                    for index in pending[key]["indices"]:
+                        cloud_results[index] = cloud_result
+
+            processing_time = int((time.time() - start) * 1000)
+
+            items = []
+            for index, detection in enumerate(detections):
+                if index in errors:
+                    items.append(BatchVerificationItem(
+                        index=index,
+                        device_id=detection.device_id,
+                        success=False,
+                        error=errors[index]
+                    ))
+                    continue
+
+                cloud_result = cloud_results.get(index)
+                if cloud_result is not None and not cloud_result.get("success"):
+                    items.append(BatchVerificationItem(
+                        index=index,
+                        device_id=detection.device_id,
+                        success=False,
+                        error=f"Audio classification failed: {cloud_result.get('error', 'unknown error')}"
+                    ))
+                    continue
+
+                verification_result = await audio_classifier.verify_edge_detection(
+                    sait_detection={
+                        "class_id": detection.edge_class_id,
+                        "confidence": detection.edge_confidence
+                    },
+                    cloud_result=cloud_result
+                )
+                if verification_result["action"] == "cloud_verified":
+                    background_tasks.add_task(
+                        _index_verified_clip,
+                        audio_payloads[index],
+                        detection.device_id,
+                        verification_result,
+                        detection.timestamp
+                    )
+                items.append(BatchVerificationItem(
+                    index=index,
+                    device_id=detection.device_id,
+                    success=True,
+                    result=EdgeVerificationResponse(
+                        **verification_result,
+                        processing_time_ms=processing_time
+                    )
+                ))
+
+            return EdgeVerificationBatchResponse(
+                results=items,
+                total=len(items),
+                cloud_inferences=len(pending),
                 processing_time_ms=int((time.time() - start) * 1000)
             )
 
+    except ModelNotReadyError:
+        raise  # 503 + Retry-After (main.py handler)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch verification failed: {str(e)}")
+
+
+@router.post("/sait/sounds/similar", response_model=SimilarSoundsResponse)
+@limiter.limit(get_rate_limit("sait"))
+async def find_similar_sounds(request: Request, query: SimilarSoundsRequest):
+    """
+    Find past verified sounds similar to a clip, across all SAIT devices
+
+    **Query by:**
+    - `audio_base64` - a new clip (embedded with the cloud audio model)
+    - `clip_id` - a clip already in the index
+
+    Every clip the cloud verifies is indexed by its 256-dim
+    AudioClassifierModel embedding; results are ranked by cosine similarity.
+    """
+    import time
+    start = time.time()
+
+    if not query.audio_base64 and not query.clip_id:
+        raise HTTPException(status_code=400, detail="Provide audio_base64 or clip_id")
+
+    index = get_acoustic_index()
+
+    if query.clip_id:
+        embedding = index.get_embedding(query.clip_id)
+        if embedding is None:
+            raise HTTPException(status_code=404, detail=f"Clip not indexed: {query.clip_id}")
+    else:
+        try:
+            audio_data = _pcm16_to_float(base64.b64decode(query.audio_base64))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Audio processing failed: {str(e)}")
+
+        manager = await get_model_manager()
+        embedding = (await manager.infer("audio_classifier", "embed_audio_batch", [audio_data]))[0]
+
+    results = index.search(
+        embedding,
+        k=query.k,
+        class_id=query.class_id,
+        device_id=query.device_id,
+        exclude_clip_id=query.clip_id,
+        min_similarity=query.min_similarity
+    )
+
+    return SimilarSoundsResponse(
+        results=[SimilarSound(**result) for result in results],
+        index_size=index.count,
+        search_mode=index.search_mode,
+        processing_time_ms=int((time.time() - start) * 1000)
+    )
+
+
+@router.websocket("/sait/stream")
+async def stream_audio(
+    websocket: WebSocket,
+    device_id: str,
+    sample_rate: int = 16000,
+    window_seconds: Optional[float] = None,
+    hop_seconds: Optional[float] = None,
+    min_confidence: Optional[float] = None
+):
+    """
+    Live SAIT audio stream with incremental classification
+
+    **Protocol:**
+    1. Gateway connects to /sait/stream?device_id=... and receives a `ready` message
+    2. Gateway sends binary frames of 16kHz, 16-bit little-endian mono PCM (any size)
+    3. Cloud pushes a `detection` message as soon as a window classifies as a threat
+    4. Gateway sends `{"type": "end"}`; cloud flushes the last window, sends `summary` and closes
+
+    Replaces repeated /sait/verify uploads of overlapping clips with one long-lived
+    connection: each frame is transformed once and windows from all streams share
+    forward passes.
+    """
+    hub = get_stream_hub()
+    await websocket.accept()
+
+    if sample_rate != 16000:
+        await websocket.close(code=1003, reason="Only 16kHz PCM is supported")
+        return
+    if (window_seconds is not None and not 0.25 <= window_seconds <= 10.0) or \
+            (hop_seconds is not None and not 0.1 <= hop_seconds <= (window_seconds or settings.SAIT_STREAM_WINDOW_SEC)):
+        await websocket.close(code=1008, reason="Invalid window/hop")
+        return
+
+    # The stream holds one model version for its lifetime (a reload swaps in the
+    # new version for new streams; this one drains on the old). During a canary
+    # rollout the device is routed to the same version for every stream.
+    manager = await get_model_manager()
+    try:
+        handle = manager.acquire("audio_classifier", routing_key=device_id)
+    except ModelNotReadyError as e:
+        await websocket.close(code=1013, reason=str(e))
+        return
+    audio_classifier = handle.model
+
+    stream = hub.open(audio_classifier, device_id, window_seconds, hop_seconds, min_confidence) \
+        if audio_classifier.loaded else None
+    if stream is None:
+        manager.release(handle)
+        if audio_classifier.loaded:
+            await websocket.close(code=1013, reason="Too many live streams, retry later")
+        else:
+            await websocket.close(code=1011, reason="Audio classifier not available")
+        return
+
+    async def send_detections(detections: List[Dict]):
+        for detection in detections:
+            await websocket.send_json({"type": "detection", "device_id": device_id, **detection})
+
+    try:
+        await websocket.send_json({
+            "type": "ready",
+            "sample_rate": stream.sample_rate,
+            "window_seconds": stream.streamer.window_frames * audio_classifier.hop_length / stream.sample_rate,
+            "hop_seconds": stream.streamer.hop_frames * audio_classifier.hop_length / stream.sample_rate,
+            "model_version": audio_classifier.cache_version
+        })
+
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                if len(message["bytes"]) > MAX_STREAM_FRAME_BYTES:
+                    await websocket.close(code=1009, reason=f"Frame larger than {MAX_STREAM_FRAME_BYTES} bytes")
+                    break
+                await send_detections(await stream.push(message["bytes"]))
+                continue
+
+            try:
+                control = json.loads(message.get("text") or "{}")
+            except json.JSONDecodeError:
+                control = {}
+
+            if control.get("type") == "end":
+                await send_detections(await stream.finish())
+                await websocket.send_json({"type": "summary", **stream.get_stats()})
+                await websocket.close()
+                break
+            elif control.get("type") == "ping":
+                await websocket.send_json({"type": "pong", **stream.get_stats()})
+            else:
+                await websocket.send_json({"type": "error", "detail": "Expected binary PCM or {\"type\": \"end\"|\"ping\"}"})
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"SAIT stream {device_id} failed: {e}")
+        try:
+            await websocket.close(code=1011, reason="Stream processing failed")
+        except Exception:
+            pass
+    finally:
+        hub.close(stream)
+        manager.release(handle)
 
 
 @router.get("/sait/models/latest", response_model=ModelMetadata)
 @limiter.limit(get_rate_limit("sait"))
-async def get_latest_model(request: Request, 
+async def get_latest_model(request: Request, response: Response,
     device_type: str = "nrf5340",
     current_version: Optional[str] = None
 ):
@@ -149,83 +718,172 @@ async def get_latest_model(request: Request,
 
     **Flow:**
     1. SAIT device checks for updates periodically
-    2. Sends current version
-    3. Cloud returns latest version metadata
-    4. Device decides whether to download
+    2. Sends current version (and the ETag of the last metadata it saw)
+    3. Cloud returns latest version metadata, or 304 if unchanged
+    4. Device decides whether to download the full model or the delta
 
     **Supports:**
     - Model versioning
     - Rollback capability
     - Performance tracking
+    - `If-None-Match` revalidation (metadata ETag)
+    - Binary deltas from `current_version` (built once per version pair)
     """
     # Get shared model manager
     manager = await get_model_manager()
-    audio_classifier = manager.audio_classifier
-    model_info = audio_classifier.get_model_version()
-
-    # Check if update available
-    update_available = (
-        current_version is None or
-        current_version != model_info['model_version']
-    )
+    async with manager.use("audio_classifier") as audio_classifier:
+        model_info = audio_classifier.get_model_version()
+        artifact = await audio_classifier.get_ota_model_package(target_format=model_info['format'])
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="No model available for OTA distribution")
+
+    # Delta from the version the device runs, if that version was published here
+    delta = None
+    if current_version and current_version != artifact.version:
+        base = get_ota_store().get(current_version, artifact.format)
+        if base is not None:
+            delta = await get_ota_store().get_delta(base, artifact)
+
+    # Metadata changes only when the version, the artifact bytes or the offered delta change
+    etag = f'"{artifact.version}-{artifact.sha256[:32]}{"-" + delta.sha256[:16] if delta else ""}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
 
     return ModelMetadata(
-        model_version=model_info['model_version'],
+        model_version=artifact.version,
         model_type=model_info['model_type'],
         architecture=model_info['architecture'],
         num_classes=model_info['num_classes'],
         input_dim=model_info['input_dim'],
-        format=model_info['format'],
+        format=artifact.format,
         accuracy=0.92,  # TODO: Get from model_registry table
-        size_kb=186,  # TODO: Get actual model size
+        size_kb=artifact.size_kb,
         deployed_at=model_info['deployed_at'],
         compatible_devices=model_info['compatible_devices'],
-        download_url=f"/api/v1/sait/models/{model_info['model_version']}/download",
-        checksum="sha256:placeholder"  # TODO: Calculate actual checksum
+        download_url=f"/api/v1/sait/models/{artifact.version}/download?format={artifact.format}",
+        checksum=artifact.checksum,
+        delta=DeltaPackage(
+            base_version=delta.base_version,
+            download_url=(
+                f"/api/v1/sait/models/{artifact.version}/delta"
+                f"?from_version={delta.base_version}&format={artifact.format}"
+            ),
+            size_kb=delta.size_kb,
+            checksum=delta.checksum,
+            result_checksum=delta.result_checksum
+        ) if delta else None
     )
 
 
 @router.get("/sait/models/{version}/download")
 @limiter.limit(get_rate_limit("sait"))
-async def download_model(request: Request, version: str, format: str = "tflite"):
+async def download_model(request: Request, version: str, format: str = "int8"):
     """
     Download SAIT model for OTA update
 
     **Formats supported:**
-    - `tflite` - TensorFlow Lite for edge deployment
-    - `cmsis-nn` - ARM CMSIS-NN optimized
+    - `int8` (default) - INT8 package as a flat little-endian binary, loaded
+      by the device at runtime
+    - `cmsis-nn` - Same INT8 package as a C header for arm_fully_connected_s8
+      (compiled into firmware images; only on explicit request)
     - `pytorch` - PyTorch (for testing only)
 
+    INT8 packages are calibrated post-training and only published when they
+    agree with the float model (top-1).
+
     **Security:**
     - Models signed with cryptographic keys
-    - Devices validate integrity before deployment
+    - Devices validate integrity before deployment (`X-Checksum`, SHA-256)
     - Rollback if new model performs worse
-    """
-    from fastapi.responses import Response
+    - Previously published versions stay downloadable
 
-    audio_classifier = await get_audio_classifier()
+    **Resumable:** honours `Range` (206 Partial Content) and `If-Range` with the
+    artifact ETag, so devices on flaky mesh links continue where they stopped.
+    """
+    if format not in OTA_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format: {format} (supported: {', '.join(OTA_FORMATS)})"
+        )
 
     try:
-        model_bytes = await audio_classifier.get_ota_model_package(target_format=format)
+        manager = await get_model_manager()
+        async with manager.use("audio_classifier") as audio_classifier:
+            if version == audio_classifier.get_model_version()['model_version']:
+                artifact = await audio_classifier.get_ota_model_package(target_format=format)
+            else:
+                artifact = get_ota_store().get(version, format)
 
-        if model_bytes is None:
+        if artifact is None:
             raise HTTPException(status_code=404, detail="Model not found")
 
-        return Response(
-            content=model_bytes,
+        headers = {
+            "ETag": artifact.etag,
+            "X-Model-Version": artifact.version,
+            "X-Model-Format": artifact.format,
+            "X-Checksum": artifact.checksum
+        }
+        if etag_matches(request.headers.get("if-none-match"), artifact.etag):
+            return Response(status_code=304, headers=headers)
+
+        # Streamed from the content-addressed blob (sendfile/pathsend where the
+        # server supports it); Range requests let devices resume partial downloads
+        return FileResponse(
+            artifact.path,
             media_type="application/octet-stream",
-            headers={
-                "Content-Disposition": f"attachment; filename=sait_model_{version}.{format}",
-                "X-Model-Version": version,
-                "X-Model-Format": format,
-                "X-Checksum": "sha256:placeholder"  # TODO: Add real checksum
-            }
+            filename=f"sait_model_{version}.{format}",
+            headers=headers
         )
 
+    except HTTPException:
+        raise
+    except ModelNotReadyError:
+        raise  # 503 + Retry-After (main.py handler)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Model download failed: {str(e)}")
 
 
+@router.get("/sait/models/{version}/delta")
+@limiter.limit(get_rate_limit("sait"))
+async def download_model_delta(request: Request, version: str, from_version: str, format: str = "int8"):
+    """
+    Download a binary delta from `from_version` to `version`
+
+    The device applies the delta to the model it holds and must verify the
+    SHA-256 of the result against `X-Result-Checksum` before installing.
+    Supports `Range` resume like the full download.
+    """
+    store = get_ota_store()
+    base = store.get(from_version, format)
+    target = store.get(version, format)
+    if base is None or target is None:
+        raise HTTPException(status_code=404, detail="Model version not found")
+
+    delta = await store.get_delta(base, target)
+    if delta is None:
+        raise HTTPException(status_code=404, detail="No delta available - download the full model")
+
+    headers = {
+        "ETag": delta.etag,
+        "X-Model-Version": version,
+        "X-Base-Version": from_version,
+        "X-Model-Format": format,
+        "X-Checksum": delta.checksum,
+        "X-Result-Checksum": delta.result_checksum
+    }
+    if etag_matches(request.headers.get("if-none-match"), delta.etag):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        delta.path,
+        media_type="application/octet-stream",
+        filename=f"sait_model_{from_version}_to_{version}.{format}.delta",
+        headers=headers
+    )
+
+
 @router.post("/sait/telemetry")
 @limiter.limit(get_rate_limit("sait"))
 async def submit_telemetry(request: Request, telemetry: Dict[str, Any]):
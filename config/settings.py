@@ -20,6 +20,8 @@ class Settings(BaseSettings):
     # Server
     HOST: str = Field(default="0.0.0.0", env="HOST")
     PORT: int = Field(default=8001, env="PORT")
+    WEB_CONCURRENCY: int = Field(default=1, env="WEB_CONCURRENCY")  # Worker processes (serve.py)
+    MODEL_PRELOAD: bool = Field(default=True, env="MODEL_PRELOAD")  # Load models before forking workers
 
     # Database (optional - can run without persistence)
     DATABASE_URL: str = Field(default="", env="DATABASE_URL")
@@ -34,15 +36,86 @@ class Settings(BaseSettings):
     REDIS_HOST: str = Field(default="localhost", env="REDIS_HOST")
     REDIS_PORT: int = Field(default=6379, env="REDIS_PORT")
 
+    # Analysis result cache (in-process LRU in front of Redis)
+    ANALYSIS_CACHE_ENABLED: bool = Field(default=True, env="ANALYSIS_CACHE_ENABLED")
+    ANALYSIS_CACHE_MAX_ENTRIES: int = Field(default=1024, env="ANALYSIS_CACHE_MAX_ENTRIES")
+    ANALYSIS_CACHE_TTL_SEC: int = Field(default=3600, env="ANALYSIS_CACHE_TTL_SEC")
+
     # Model Storage
     MODEL_STORAGE_PATH: str = Field(default="/app/models", env="MODEL_STORAGE_PATH")
     MODEL_CACHE_SIZE_MB: int = Field(default=500, env="MODEL_CACHE_SIZE_MB")
+    MODEL_PINNED: List[str] = Field(default=["audio_classifier"], env="MODEL_PINNED")  # Preloaded, never evicted
+    MODEL_LOADING_RETRY_AFTER_SEC: int = Field(default=5, env="MODEL_LOADING_RETRY_AFTER_SEC")
+    MODEL_ROLLOUT_MAX_MIRRORS: int = Field(default=4, env="MODEL_ROLLOUT_MAX_MIRRORS")  # Concurrent comparison runs per rollout
+    MODEL_DOWNLOAD_CONCURRENCY: int = Field(default=8, env="MODEL_DOWNLOAD_CONCURRENCY")  # Parallel ranged GETs per S3 download
+    MODEL_DOWNLOAD_PART_MB: int = Field(default=8, env="MODEL_DOWNLOAD_PART_MB")
+    MODEL_DISK_CACHE_DIR: str = Field(default="models/cache", env="MODEL_DISK_CACHE_DIR")  # Downloaded versions, by content hash
+    MODEL_DISK_CACHE_SIZE_MB: int = Field(default=2048, env="MODEL_DISK_CACHE_SIZE_MB")
+    MODEL_METADATA_CACHE_TTL_SEC: float = Field(default=30.0, env="MODEL_METADATA_CACHE_TTL_SEC")  # metadata.json / version listings
+    MODEL_PREFETCH_ENABLED: bool = Field(default=True, env="MODEL_PREFETCH_ENABLED")  # Download announced versions ahead of reloads (S3 only)
+    MODEL_PREFETCH_MODELS: List[str] = Field(default=["yolov8m.pt", "sait_audio_classifier.pth"], env="MODEL_PREFETCH_MODELS")
+    MODEL_PREFETCH_INTERVAL_SEC: float = Field(default=60.0, env="MODEL_PREFETCH_INTERVAL_SEC")
+    MODEL_PREFETCH_MAX_MBPS: float = Field(default=0.0, env="MODEL_PREFETCH_MAX_MBPS")  # 0 = unlimited
+    AUDIO_MODEL_COMPILE: bool = Field(default=True, env="AUDIO_MODEL_COMPILE")
+    COMPILED_MODEL_CACHE_DIR: str = Field(default="models/compiled", env="COMPILED_MODEL_CACHE_DIR")
+    COMPILED_MODEL_CACHE_KEEP: int = Field(default=3, env="COMPILED_MODEL_CACHE_KEEP")  # Compiled audio artifacts kept on disk
+    OTA_ARTIFACT_DIR: str = Field(default="models/ota", env="OTA_ARTIFACT_DIR")
+    OTA_KEEP_VERSIONS: int = Field(default=5, env="OTA_KEEP_VERSIONS")  # Model versions kept published as delta bases
+    EDGE_CALIBRATION_FEATURES_PATH: str = Field(default="models/sait_calibration_features.npy", env="EDGE_CALIBRATION_FEATURES_PATH")  # (N, 128) real SAIT features; required in production
 
     # API Configuration
     MAX_MEDIA_SIZE_MB: int = Field(default=50, env="MAX_MEDIA_SIZE_MB")
     MAX_REQUEST_TIMEOUT_SEC: int = Field(default=30, env="MAX_REQUEST_TIMEOUT_SEC")
     RATE_LIMIT_PER_MINUTE: int = Field(default=100, env="RATE_LIMIT_PER_MINUTE")
 
+    # Audio timeline mode (long recordings, constant memory)
+    AUDIO_TIMELINE_MIN_DURATION_SEC: float = Field(default=10.0, env="AUDIO_TIMELINE_MIN_DURATION_SEC")
+    AUDIO_TIMELINE_WINDOW_SEC: float = Field(default=2.0, env="AUDIO_TIMELINE_WINDOW_SEC")
+    AUDIO_TIMELINE_HOP_SEC: float = Field(default=1.0, env="AUDIO_TIMELINE_HOP_SEC")
+    AUDIO_TIMELINE_BATCH_SIZE: int = Field(default=32, env="AUDIO_TIMELINE_BATCH_SIZE")
+
+    # Live SAIT audio streams (WebSocket /sait/stream)
+    SAIT_STREAM_MAX_CONNECTIONS: int = Field(default=256, env="SAIT_STREAM_MAX_CONNECTIONS")
+    SAIT_STREAM_WINDOW_SEC: float = Field(default=2.0, env="SAIT_STREAM_WINDOW_SEC")
+    SAIT_STREAM_HOP_SEC: float = Field(default=0.5, env="SAIT_STREAM_HOP_SEC")
+    SAIT_STREAM_MIN_CONFIDENCE: float = Field(default=0.5, env="SAIT_STREAM_MIN_CONFIDENCE")
+    SAIT_STREAM_BATCH_SIZE: int = Field(default=64, env="SAIT_STREAM_BATCH_SIZE")
+    SAIT_STREAM_BATCH_WAIT_MS: float = Field(default=5.0, env="SAIT_STREAM_BATCH_WAIT_MS")
+
+    # Dedicated inference server process (python -m services.inference_server)
+    INFERENCE_SERVER_ENABLED: bool = Field(default=False, env="INFERENCE_SERVER_ENABLED")  # API workers use it
+    INFERENCE_SERVER_SOCKET: str = Field(default="/tmp/atlas-inference.sock", env="INFERENCE_SERVER_SOCKET")
+    INFERENCE_RING_SLOTS: int = Field(default=8, env="INFERENCE_RING_SLOTS")  # Shared-memory tensor slots per worker
+    INFERENCE_RING_SLOT_MB: float = Field(default=4.0, env="INFERENCE_RING_SLOT_MB")  # Larger tensors go inline
+    INFERENCE_BATCH_SIZE: int = Field(default=64, env="INFERENCE_BATCH_SIZE")
+    INFERENCE_BATCH_WAIT_MS: float = Field(default=2.0, env="INFERENCE_BATCH_WAIT_MS")
+    INFERENCE_TIMEOUT_SEC: float = Field(default=30.0, env="INFERENCE_TIMEOUT_SEC")
+
+    # Feature extraction process pool (0 workers = cpu_count - 1)
+    FEATURE_POOL_ENABLED: bool = Field(default=True, env="FEATURE_POOL_ENABLED")
+    FEATURE_POOL_WORKERS: int = Field(default=0, env="FEATURE_POOL_WORKERS")
+
+    # Audio pre-inference gate (silence / wind short-circuit)
+    AUDIO_GATE_ENABLED: bool = Field(default=True, env="AUDIO_GATE_ENABLED")
+    AUDIO_GATE_SILENCE_DBFS: float = Field(default=-55.0, env="AUDIO_GATE_SILENCE_DBFS")
+    AUDIO_GATE_WIND_MAX_ZERO_CROSS_HZ: float = Field(default=240.0, env="AUDIO_GATE_WIND_MAX_ZERO_CROSS_HZ")
+    AUDIO_GATE_WIND_MIN_FLATNESS: float = Field(default=0.03, env="AUDIO_GATE_WIND_MIN_FLATNESS")
+    AUDIO_GATE_WIND_MAX_DBFS: float = Field(default=-30.0, env="AUDIO_GATE_WIND_MAX_DBFS")
+    AUDIO_GATE_MAX_CREST_FACTOR: float = Field(default=12.0, env="AUDIO_GATE_MAX_CREST_FACTOR")
+
+    # Acoustic similarity index (embeddings of verified SAIT clips)
+    ACOUSTIC_INDEX_DIR: str = Field(default="models/acoustic_index", env="ACOUSTIC_INDEX_DIR")
+    ACOUSTIC_INDEX_IVF_MIN_VECTORS: int = Field(default=50000, env="ACOUSTIC_INDEX_IVF_MIN_VECTORS")
+    ACOUSTIC_INDEX_NPROBE: int = Field(default=8, env="ACOUSTIC_INDEX_NPROBE")
+
+    # Media fetcher (URL-based analysis)
+    MEDIA_FETCH_MAX_CONNECTIONS: int = Field(default=100, env="MEDIA_FETCH_MAX_CONNECTIONS")
+    MEDIA_FETCH_MAX_KEEPALIVE: int = Field(default=20, env="MEDIA_FETCH_MAX_KEEPALIVE")
+    MEDIA_FETCH_PER_HOST_LIMIT: int = Field(default=8, env="MEDIA_FETCH_PER_HOST_LIMIT")
+    MEDIA_FETCH_TIMEOUT_SEC: float = Field(default=10.0, env="MEDIA_FETCH_TIMEOUT_SEC")
+    MEDIA_FETCH_ALLOWED_HOSTS: List[str] = Field(default=[], env="MEDIA_FETCH_ALLOWED_HOSTS")  # Required in production
+    MEDIA_FETCH_ALLOW_PRIVATE_NETWORKS: bool = Field(default=False, env="MEDIA_FETCH_ALLOW_PRIVATE_NETWORKS")  # Local dev only
+
     # CORS
     CORS_ORIGINS: List[str] = Field(
         default=["http://localhost:3000", "http://localhost:8000"],
@@ -10,7 +10,6 @@ from datetime import datetime
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_client import make_asgi_app
@@ -26,8 +25,9 @@ from api.sait_api import router as sait_router
 from api.halo_api import router as halo_router
 from api.admin_api import router as admin_router
 from api.data_api import router as data_router
+from api.middleware import SelectiveGZipMiddleware
 from database.database import get_database
-from services.model_manager import get_model_manager
+from services.model_manager import ModelNotReadyError, get_model_manager
 from config.settings import settings
 
 # Configure logging
@@ -58,18 +58,36 @@ async def lifespan(app: FastAPI):
         db = None  # Continue without database for local development
 
     # Load ML models (singleton - shared across all products)
+    # Heavy models keep loading in worker threads; their endpoints answer 503 until ready
     try:
         logger.info("Loading unified model manager (central stack)...")
         manager = await get_model_manager()
         model_info = manager.get_model_info()
-        logger.info("✅ ML models loaded and shared across products:")
+        logger.info("✅ Model manager serving, models shared across products:")
         for model_name, info in model_info["models"].items():
-            if info["loaded"]:
-                logger.info(f"   - {model_name}: {info['type']}")
-                logger.info(f"     Shared by: {', '.join(info['shared_by'])}")
+            logger.info(f"   - {model_name}: {info['type']} ({info['status']})")
+            logger.info(f"     Shared by: {', '.join(info['shared_by'])}")
     except Exception as e:
         logger.warning("⚠️ ML models not loaded: %s", e)
 
+    # Start feature extraction workers (audio STFT off the event loop)
+    try:
+        from services.feature_pool import get_feature_pool
+        feature_pool = get_feature_pool()
+        if feature_pool is not None:
+            await feature_pool.warm_up()
+    except Exception as e:
+        logger.warning("⚠️ Feature extraction pool not started (extracting inline): %s", e)
+
+    # Prefetch newly announced model versions into the local cache (S3 storage only)
+    # With the inference server enabled the models (and their downloads) live there
+    if not settings.INFERENCE_SERVER_ENABLED:
+        try:
+            from services.model_storage import get_model_storage
+            get_model_storage().start_prefetcher()
+        except Exception as e:
+            logger.warning("⚠️ Model prefetcher not started: %s", e)
+
     # Start data collection service
     if db:
         try:
@@ -94,6 +112,36 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("⚠️ Error stopping data collection: %s", e)
 
+    # Stop model prefetcher (a partial download resumes on next start)
+    if not settings.INFERENCE_SERVER_ENABLED:
+        try:
+            from services.model_storage import get_model_storage
+            await get_model_storage().stop_prefetcher()
+        except Exception as e:
+            logger.warning("⚠️ Error stopping model prefetcher: %s", e)
+
+    # Close pooled media fetcher connections
+    try:
+        from services.media_fetcher import close_media_fetcher
+        await close_media_fetcher()
+    except Exception as e:
+        logger.warning("⚠️ Error closing media fetcher: %s", e)
+
+    # Disconnect from the inference server (its models stay loaded)
+    if settings.INFERENCE_SERVER_ENABLED:
+        try:
+            from services.inference_client import close_inference_client
+            close_inference_client()
+        except Exception as e:
+            logger.warning("⚠️ Error closing inference server connection: %s", e)
+
+    # Stop feature extraction worker processes
+    try:
+        from services.feature_pool import shutdown_feature_pool
+        shutdown_feature_pool()
+    except Exception as e:
+        logger.warning("⚠️ Error stopping feature extraction pool: %s", e)
+
     if db:
         await db.close()
     logger.info("✅ Shutdown complete")
@@ -154,8 +202,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# GZip compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# GZip compression (JSON/text only - binary downloads are streamed as-is)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000)
 
 # Include API routers - Product-specific namespaces with shared models
 app.include_router(halo_router, prefix="/api/v1", tags=["halo"])
@@ -210,20 +258,46 @@ async def health_check(request: Request):
     app_status = "healthy"
     mode = "full" if db_status == "healthy" else "degraded"
 
+    # Models still loading in the background are reported, not waited for;
+    # unloaded (evicted or not preloaded) models load on their first request
+    model_status = (await get_model_manager()).get_model_status()
+    status_names = {
+        "ready": "operational",
+        "loading": "loading",
+        "unloaded": "on_demand",
+        "failed": "unavailable"
+    }
+
     return {
         "status": app_status,
         "database": db_status,
         "mode": mode,
         "services": {
-            "threat_classifier": "operational",
-            "visual_detector": "operational",
-            "audio_classifier": "operational"
+            name: status_names.get(model_status.get(name, "unloaded"), "unknown")
+            for name in ("threat_classifier", "visual_detector", "audio_classifier")
         },
         "version": settings.VERSION,
         "timestamp": datetime.now().isoformat()
     }
 
 
+@app.exception_handler(ModelNotReadyError)
+async def model_not_ready_handler(request: Request, exc: ModelNotReadyError):
+    """Fast 503 for requests needing a model that is still loading"""
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(
+        status_code=503,
+        headers=headers,
+        content={
+            "error": "Model not ready",
+            "detail": str(exc),
+            "model": exc.model_name,
+            "status": exc.status,
+            "timestamp": datetime.now().isoformat()
+        }
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Atlas Intelligence server with preloaded, shared model weights
+
+Loads the models once in this (parent) process, then forks WEB_CONCURRENCY
+uvicorn workers on one listening socket. Workers share the parent's weight
+pages copy-on-write (inference only reads them), so each extra worker costs
+its activations and Python heap, not another copy of YOLOv8 and the audio model.
+
+    python serve.py                    # WEB_CONCURRENCY workers, preloaded
+    python serve.py --workers 4
+    MODEL_PRELOAD=false python serve.py --workers 4   # each worker loads its own models
+
+Notes:
+- The parent runs no inference before forking and uses one intra-op thread,
+  so no OpenMP/CUDA state is inherited; workers warm the models up themselves
+- Admin reloads and rollouts apply to the worker that serves the request
+- Dead workers are re-forked from the parent (no model reload)
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from config.settings import settings
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("atlas.serve")
+
+# Minimum worker lifetime before a crash counts as a crash loop (restart is delayed)
+MIN_WORKER_UPTIME_SEC = 5.0
+
+
+def _process_memory_mb() -> dict:
+    """RSS and private (USS) / proportional (PSS) memory of this process"""
+    try:
+        import psutil
+        info = psutil.Process().memory_full_info()
+        return {
+            "rss_mb": round(info.rss / 2**20, 1),
+            "uss_mb": round(info.uss / 2**20, 1),
+            "pss_mb": round(getattr(info, "pss", 0) / 2**20, 1)
+        }
+    except Exception:
+        return {}
+
+
+def preload_models():
+    """Load every model that fits the budget into the parent process"""
+    import torch
+    torch.set_num_threads(1)
+
+    # Imported for its side effects: app and routers built once, inherited by workers
+    importlib.import_module("main")
+    from services.model_manager import get_model_manager
+
+    async def load():
+        manager = await get_model_manager()
+        ready = await manager.preload()
+        memory = manager.get_model_info()["memory"]
+        logger.info(
+            f"✅ Models preloaded ({memory['resident_mb']}MB, budget {memory['budget_mb']}MB)"
+            + ("" if ready else f" - not ready: {manager.get_model_status()}")
+        )
+
+    asyncio.run(load())
+
+    stray = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+    if stray:
+        logger.warning(f"⚠️ Threads alive before fork (not inherited by workers): {', '.join(stray)}")
+
+
+def run_worker(sock: socket.socket, workers: int, preloaded: bool):
+    """Worker process body: warm up and serve on the inherited socket"""
+    import uvicorn
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_DFL)
+
+    if preloaded:
+        import torch
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+        from services.model_manager import ModelManager
+        if ModelManager._instance is not None:
+            ModelManager._instance.warm_up()
+        logger.info(f"Worker {os.getpid()} ready: {_process_memory_mb()}")
+
+    config = uvicorn.Config(
+        "main:app",
+        log_level=settings.LOG_LEVEL.lower(),
+        timeout_graceful_shutdown=30
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int, preload: bool) -> int:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    if preload:
+        logger.info("🚀 Preloading models before forking workers...")
+        preload_models()
+
+    children = {}
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(sock, workers, preload)
+            except BaseException as e:
+                logger.error(f"❌ Worker {os.getpid()} failed: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.time()
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    logger.info(f"🎉 Serving on {host}:{port} with {workers} workers (preload={'on' if preload else 'off'})")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, time.time())
+        if stopping:
+            continue
+        logger.warning(f"⚠️ Worker {pid} exited ({os.waitstatus_to_exitcode(status)}), restarting")
+        if time.time() - started < MIN_WORKER_UPTIME_SEC:
+            time.sleep(MIN_WORKER_UPTIME_SEC)
+        if not stopping:
+            spawn()
+
+    sock.close()
+    logger.info("👋 All workers stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Atlas Intelligence with preforked workers")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY)
+    parser.add_argument("--no-preload", action="store_true", help="Load models in each worker instead")
+    args = parser.parse_args()
+
+    sys.exit(serve(args.host, args.port, max(1, args.workers), settings.MODEL_PRELOAD and not args.no_preload))
@@ -0,0 +1,431 @@
+"""
+Acoustic Vector Index
+Similarity search over AudioClassifierModel embeddings of verified SAIT clips
+
+- Embeddings (256-dim, L2-normalized) live in a memory-mapped float32 file,
+  so the index opens instantly and the OS pages vectors in on demand
+- Per-clip metadata (device, class, confidence, time) is an append-only JSONL log
+- Small indexes are searched brute-force (one matrix-vector product)
+- Above IVF_MIN_VECTORS an IVF (inverted file) coarse quantizer is trained with
+  k-means; searches only score the nprobe closest lists
+
+Cosine similarity = dot product of normalized vectors.
+
+API workers share the files: appends happen under a file lock and take the
+next row from meta.jsonl, and each process picks up rows, growth and IVF
+retraining done by the others before it reads or writes. k-means runs
+without holding the index lock.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows allocated when the vector file is created/grown
+INITIAL_CAPACITY = 1024
+
+# k-means settings for the IVF coarse quantizer
+KMEANS_ITERATIONS = 12
+KMEANS_SAMPLES_PER_LIST = 64
+
+
+class AcousticVectorIndex:
+    """Append-only, memory-mapped cosine similarity index"""
+
+    def __init__(
+        self,
+        root_dir: Union[str, Path],
+        dim: int = 256,
+        ivf_min_vectors: int = 50000,
+        nprobe: int = 8
+    ):
+        """
+        Args:
+            root_dir: Directory holding vectors.f32, assign.i32, centroids.npy, meta.jsonl
+            dim: Embedding dimension
+            ivf_min_vectors: Index size at which IVF search replaces brute force
+            nprobe: IVF lists scanned per query
+        """
+        self.root_dir = Path(root_dir)
+        self.dim = dim
+        self.ivf_min_vectors = ivf_min_vectors
+        self.nprobe = nprobe
+
+        self.vectors_path = self.root_dir / "vectors.f32"
+        self.assign_path = self.root_dir / "assign.i32"
+        self.centroids_path = self.root_dir / "centroids.npy"
+        self.meta_path = self.root_dir / "meta.jsonl"
+        self.lock_path = self.root_dir / ".lock"
+        self.train_lock_path = self.root_dir / ".train.lock"
+
+        self._lock = threading.Lock()
+        self._training = False
+        self._vectors: Optional[np.memmap] = None
+        self._assign: Optional[np.memmap] = None
+        self._capacity = 0
+
+        self._metadata: List[Dict] = []
+        self._ids: Dict[str, int] = {}
+        self._class_ids: Optional[np.ndarray] = None  # Cached filter column
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []  # Rows per IVF list at training time
+        self._list_tail: List[List[int]] = []  # Rows added since training
+        self._trained_count = 0
+        self._meta_offset = 0  # Bytes of meta.jsonl already read
+        self._centroids_mtime: Optional[float] = None
+
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @property
+    def count(self) -> int:
+        return len(self._metadata)
+
+    @property
+    def search_mode(self) -> str:
+        return "ivf" if self._centroids is not None else "brute_force"
+
+    def _open_maps(self, capacity: int):
+        """(Re)map vector and assignment files with room for capacity rows"""
+        for path, itemsize in ((self.vectors_path, 4 * self.dim), (self.assign_path, 4)):
+            with open(path, "ab") as f:
+                if f.tell() < capacity * itemsize:
+                    f.truncate(capacity * itemsize)
+
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._assign.flush()
+
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._assign = np.memmap(self.assign_path, dtype=np.int32, mode="r+", shape=(capacity,))
+        self._capacity = capacity
+
+    def _read_metadata(self) -> int:
+        """Append complete meta.jsonl records written since the last read; returns how many"""
+        if not self.meta_path.exists():
+            return 0
+
+        with open(self.meta_path, "rb") as f:
+            f.seek(self._meta_offset)
+            data = f.read()
+
+        added = 0
+        offset = self._meta_offset
+        for line in data.split(b"\n")[:-1]:  # Last piece is empty or a torn write
+            if line.strip():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Acoustic index: unreadable metadata record at byte {offset}, ignoring the rest")
+                    break
+                self._ids[entry["clip_id"]] = len(self._metadata)
+                self._metadata.append(entry)
+                added += 1
+            offset += len(line) + 1
+
+        self._meta_offset = offset
+        if added:
+            self._class_ids = None
+        return added
+
+    def _load(self):
+        self._read_metadata()
+
+        if self.vectors_path.exists():
+            rows = self.vectors_path.stat().st_size // (4 * self.dim)
+            if rows < self.count:
+                logger.warning(f"Acoustic index: {self.count - rows} metadata rows without vectors dropped")
+                for entry in self._metadata[rows:]:
+                    self._ids.pop(entry["clip_id"], None)
+                del self._metadata[rows:]
+            self._open_maps(max(rows, INITIAL_CAPACITY))
+
+        if self.centroids_path.exists() and self.count:
+            self._load_centroids()
+
+        logger.info(f"Acoustic index: {self.count} embeddings ({self.search_mode})")
+
+    def _load_centroids(self):
+        """Centroids saved by the last training (every stored row is assigned to them)"""
+        self._centroids_mtime = self.centroids_path.stat().st_mtime
+        self._centroids = np.load(self.centroids_path)
+        self._build_lists(self.count)
+
+    def _sync(self):
+        """Catch up with rows and IVF retraining from other processes (caller holds the file lock)"""
+        first_new = self.count
+        if self._read_metadata() and self.count > self._capacity:
+            self._open_maps(self.vectors_path.stat().st_size // (4 * self.dim))
+
+        if self.count and self.centroids_path.exists() and self.centroids_path.stat().st_mtime != self._centroids_mtime:
+            self._load_centroids()  # Retrained elsewhere: lists rebuilt over every row
+        elif self._centroids is not None:
+            for row in range(first_new, self.count):
+                self._list_tail[int(self._assign[row])].append(row)
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access across threads and processes, caught up with the files"""
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._sync()
+            yield
+
+    def _build_lists(self, trained_count: int):
+        assignments = np.asarray(self._assign[:trained_count])
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+        self._list_tail = [[] for _ in range(len(self._centroids))]
+        self._trained_count = trained_count
+
+    @property
+    def needs_training(self) -> bool:
+        """Large enough for IVF and not trained yet, or doubled since the last training"""
+        return self.count >= self.ivf_min_vectors and self.count >= 2 * max(self._trained_count, self.ivf_min_vectors // 2)
+
+    def train_ivf(self):
+        """
+        Train (or retrain) the IVF quantizer if needed - blocking, call from a worker thread
+
+        One process trains at a time; the others load its centroids on their next sync.
+        """
+        with self._lock:
+            if self._training or not self.needs_training:
+                return
+            self._training = True
+
+        try:
+            with open(self.train_lock_path, "a") as train_lock:
+                try:
+                    fcntl.flock(train_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return  # Another worker is training
+                with self._locked():
+                    if not self.needs_training:
+                        return
+                self._train_ivf()
+        except Exception as e:
+            logger.error(f"Acoustic index: IVF training failed: {e}")
+        finally:
+            self._training = False
+
+    def _train_ivf(self):
+        """k-means coarse quantizer over (a sample of) the stored embeddings"""
+        start = time.time()
+        count = self.count  # Rows below count never change, so no lock is needed here
+        nlist = int(np.clip(np.sqrt(count), 16, 4096))
+
+        rng = np.random.default_rng(0)
+        sample_size = min(count, nlist * KMEANS_SAMPLES_PER_LIST)
+        sample = np.asarray(self._vectors[np.sort(rng.choice(count, sample_size, replace=False))])
+
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            labels = (sample @ centroids.T).argmax(axis=1)
+            for list_id in range(nlist):
+                members = sample[labels == list_id]
+                if len(members):
+                    centroids[list_id] = members.mean(axis=0)
+            centroids /= np.linalg.norm(centroids, axis=1, keepdims=True) + 1e-12
+
+        assignments = self._assign_rows(centroids, 0, count)
+
+        # Swap in: rows added meanwhile are assigned too, so every stored row
+        # matches the centroids on disk
+        with self._locked():
+            self._assign[:count] = assignments
+            self._assign[count:self.count] = self._assign_rows(centroids, count, self.count)
+            self._assign.flush()
+
+            tmp_path = self.centroids_path.with_suffix(f".tmp{os.getpid()}.npy")
+            np.save(tmp_path, centroids)
+            os.replace(tmp_path, self.centroids_path)
+
+            self._centroids = centroids
+            self._centroids_mtime = self.centroids_path.stat().st_mtime
+            self._build_lists(self.count)
+
+        logger.info(f"Acoustic index: trained IVF with {nlist} lists over {count} embeddings in {time.time() - start:.1f}s")
+
+    def _assign_rows(self, centroids: np.ndarray, begin: int, end: int) -> np.ndarray:
+        """Closest centroid of each stored vector in [begin, end), in blocks (bounded memory)"""
+        assignments = np.empty(end - begin, dtype=np.int32)
+        for block_begin in range(begin, end, 65536):
+            block = np.asarray(self._vectors[block_begin:min(end, block_begin + 65536)])
+            assignments[block_begin - begin:block_begin - begin + len(block)] = (block @ centroids.T).argmax(axis=1)
+        return assignments
+
+    def contains(self, clip_id: str) -> bool:
+        return clip_id in self._ids
+
+    def add(self, clip_id: str, embedding: np.ndarray, metadata: Dict) -> int:
+        """
+        Add a clip embedding (no-op if clip_id is already indexed)
+
+        Blocking (file lock, disk writes, IVF training when due) - call from a
+        worker thread, not the event loop.
+
+        Args:
+            clip_id: Stable clip identifier (content hash)
+            embedding: (dim,) embedding
+            metadata: JSON-serializable clip metadata
+
+        Returns:
+            Row of the clip in the index
+        """
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Embedding has {vector.shape[0]} dims, index expects {self.dim}")
+        vector = vector / (np.linalg.norm(vector) + 1e-12)
+
+        with self._locked():
+            if clip_id in self._ids:
+                return self._ids[clip_id]
+
+            # Next row = records in meta.jsonl (just synced); drop a torn record
+            # left by a crashed writer so the new one starts on a fresh line
+            if self.meta_path.exists() and self.meta_path.stat().st_size > self._meta_offset:
+                os.truncate(self.meta_path, self._meta_offset)
+
+            row = self.count
+            if row >= self._capacity:
+                self._open_maps(max(INITIAL_CAPACITY, self._capacity * 2))
+
+            # Vector first, then metadata: a crash leaves at most an orphan vector
+            self._vectors[row] = vector
+            if self._centroids is not None:
+                list_id = int((self._centroids @ vector).argmax())
+                self._assign[row] = list_id
+                self._list_tail[list_id].append(row)
+            self._vectors.flush()
+
+            entry = {"clip_id": clip_id, **metadata}
+            record = (json.dumps(entry) + "\n").encode()
+            with open(self.meta_path, "ab") as f:
+                f.write(record)
+
+            self._metadata.append(entry)
+            self._ids[clip_id] = row
+            self._class_ids = None
+            self._meta_offset += len(record)
+
+        # Train once the index is large enough, retrain when it has doubled
+        # (outside the lock: searches keep running on the old lists)
+        if self.needs_training:
+            self.train_ivf()
+
+        return row
+
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows in the nprobe closest IVF lists (None = scan everything)"""
+        if self._centroids is None:
+            return None
+
+        probes = np.argsort(self._centroids @ query)[::-1][:self.nprobe]
+        parts = [self._lists[p] for p in probes] + [np.asarray(self._list_tail[p], dtype=np.int64) for p in probes]
+        return np.sort(np.concatenate(parts))
+
+    def search(
+        self,
+        embedding: np.ndarray,
+        k: int = 10,
+        class_id: Optional[int] = None,
+        device_id: Optional[str] = None,
+        exclude_clip_id: Optional[str] = None,
+        min_similarity: float = 0.0
+    ) -> List[Dict]:
+        """
+        Most similar indexed clips
+
+        Args:
+            embedding: (dim,) query embedding
+            k: Number of results
+            class_id: Only clips whose cloud class is class_id
+            device_id: Only clips from this device
+            exclude_clip_id: Skip this clip (query by an indexed clip)
+            min_similarity: Minimum cosine similarity
+
+        Returns:
+            Metadata dicts with 'similarity', best first
+        """
+        query = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        query = query / (np.linalg.norm(query) + 1e-12)
+
+        with self._locked():
+            count = self.count
+            if not count:
+                return []
+            rows = self._candidate_rows(query)
+            if rows is None:
+                scores = np.asarray(self._vectors[:count]) @ query
+                rows = np.arange(count)
+            else:
+                scores = np.asarray(self._vectors[rows]) @ query
+
+            mask = scores >= min_similarity
+            if class_id is not None:
+                if self._class_ids is None:
+                    self._class_ids = np.array([m.get("class_id", -1) for m in self._metadata], dtype=np.int32)
+                mask &= self._class_ids[rows] == class_id
+            if device_id is not None:
+                mask &= np.array([self._metadata[r].get("device_id") == device_id for r in rows], dtype=bool)
+            if exclude_clip_id is not None and exclude_clip_id in self._ids:
+                mask &= rows != self._ids[exclude_clip_id]
+
+            rows, scores = rows[mask], scores[mask]
+            if len(rows) > k:
+                top = np.argpartition(-scores, k)[:k]
+                rows, scores = rows[top], scores[top]
+            order = np.argsort(-scores)
+
+            return [
+                {**self._metadata[int(rows[i])], "similarity": float(scores[i])}
+                for i in order
+            ]
+
+    def get_embedding(self, clip_id: str) -> Optional[np.ndarray]:
+        """Stored (normalized) embedding of an indexed clip"""
+        with self._locked():
+            row = self._ids.get(clip_id)
+            return None if row is None else np.array(self._vectors[row])
+
+    def get_stats(self) -> Dict:
+        return {
+            "embeddings": self.count,
+            "dim": self.dim,
+            "search_mode": self.search_mode,
+            "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+            "nprobe": self.nprobe
+        }
+
+
+# Singleton instance
+_acoustic_index: Optional[AcousticVectorIndex] = None
+
+
+def get_acoustic_index() -> AcousticVectorIndex:
+    """Get or create acoustic vector index singleton"""
+    global _acoustic_index
+
+    if _acoustic_index is None:
+        _acoustic_index = AcousticVectorIndex(
+            settings.ACOUSTIC_INDEX_DIR,
+            ivf_min_vectors=settings.ACOUSTIC_INDEX_IVF_MIN_VECTORS,
+            nprobe=settings.ACOUSTIC_INDEX_NPROBE
+        )
+
+    return _acoustic_index
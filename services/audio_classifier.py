@@ -20,12 +20,32 @@ import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 import asyncio
 
+from services.audio_features import (
+    MelFeatureExtractor,
+    StreamingMelExtractor,
+    get_mel_extractor,
+    resample_blocks,
+)
+from services.audio_gate import GATE_CONFIDENCE, GateDecision, get_audio_gate
+from services.audio_model_compiler import compile_audio_model, weights_hash
+from services.edge_package import EDGE_FORMATS, build_edge_package
+from services.feature_pool import get_feature_pool
+from services.ota_store import OTAArtifact, get_ota_store
+from services.result_cache import file_fingerprint
+from config.settings import settings
+
 logger = logging.getLogger(__name__)
 
+# Formats served to SAIT devices ('pytorch' is for testing only)
+OTA_FORMATS = ('pytorch',) + EDGE_FORMATS
+
+# Release line of the model architecture; OTA versions append the weights hash
+MODEL_BASE_VERSION = '1.0.0'
+
 # Try to import audio processing libraries
 try:
     import librosa
@@ -144,9 +164,16 @@ class AudioClassifier:
         29: 'aerial_background',
     }
 
+    # Edge detections above this confidence are trusted without cloud re-analysis
+    EDGE_TRUST_THRESHOLD = 0.85
+
     def __init__(self, model_path: Optional[str] = None):
         self.model_path = model_path
         self.model: Optional[AudioClassifierModel] = None
+        self.inference_model: Optional[torch.jit.ScriptModule] = None  # Compiled CPU build
+        self.weights_id: Optional[str] = None  # Hash of the loaded weights (OTA version identity)
+        self._untrained_fingerprint: Optional[str] = None  # Set when no weights file was loaded
+        self._edge_packages: Dict[Tuple[str, str, str], Path] = {}  # (format, weights, features fingerprints) -> INT8 package
         self.device = self._get_device()
         self.loaded = False
 
@@ -224,24 +251,53 @@ class AudioClassifier:
             ),
         }
 
+    def _load_weights(self) -> AudioClassifierModel:
+        """Eager model with the pretrained weights (untrained if none are available)"""
+        model = AudioClassifierModel(num_classes=30, input_dim=128)
+
+        # Try to load pretrained weights if available
+        if self.model_path and Path(self.model_path).exists():
+            logger.info(f"Loading audio model from {self.model_path}")
+            # On CPU the weights stay memory-mapped from the file: worker
+            # processes share the page cache instead of private copies
+            state_dict = torch.load(
+                self.model_path,
+                map_location=self.device,
+                mmap=self.device == "cpu",
+                weights_only=True
+            )
+            model.load_state_dict(state_dict, assign=self.device == "cpu")
+            logger.info("✅ Pretrained audio model loaded")
+        else:
+            logger.warning("⚠️ No pretrained model found, using untrained model")
+            logger.warning("   For production, train model from SAIT_01 codebase")
+
+        model = model.to(self.device)
+        model.eval()
+        return model
+
     async def load_model(self):
         """Load the audio classification model"""
         try:
-            # Initialize model
-            self.model = AudioClassifierModel(num_classes=30, input_dim=128)
-
-            # Try to load pretrained weights if available
-            if self.model_path and Path(self.model_path).exists():
-                logger.info(f"Loading audio model from {self.model_path}")
-                state_dict = torch.load(self.model_path, map_location=self.device)
-                self.model.load_state_dict(state_dict)
-                logger.info("✅ Pretrained audio model loaded")
-            else:
-                logger.warning("⚠️ No pretrained model found, using untrained model")
-                logger.warning("   For production, train model from SAIT_01 codebase")
+            self.model = self._load_weights()
+
+            # Untrained weights are random per process: key cached results by their
+            # hash so workers never share results under one constant version
+            has_weights = bool(self.model_path) and Path(self.model_path).exists()
+            self.weights_id = weights_hash(self.model)[:16]
+            self._untrained_fingerprint = None if has_weights else f"untrained-{self.weights_id}"
+
+            # Fused INT8 TorchScript build for CPU serving (cached by weights hash;
+            # untrained weights differ on every start, so they are not cached)
+            self.inference_model = None
+            if settings.AUDIO_MODEL_COMPILE and self.device == "cpu":
+                self.inference_model = compile_audio_model(
+                    self.model,
+                    cache_dir=Path(settings.COMPILED_MODEL_CACHE_DIR) if has_weights else None,
+                    input_dim=128,
+                    keep=settings.COMPILED_MODEL_CACHE_KEEP
+                )
 
-            self.model = self.model.to(self.device)
-            self.model.eval()
             self.loaded = True
 
             logger.info(f"✅ Audio classifier ready on {self.device}")
@@ -250,6 +306,29 @@ class AudioClassifier:
             logger.error(f"Failed to load audio model: {e}")
             self.loaded = False
 
+    def warm_up(self, iterations: int = 3):
+        """Run dummy batches so the first real request doesn't pay for lazy init/JIT profiling"""
+        if not self.loaded:
+            return
+        features = np.zeros((2, self.n_mels), dtype=np.float32)
+        for _ in range(iterations):
+            self._predict(features)
+
+    @property
+    def feature_extractor(self) -> MelFeatureExtractor:
+        """Shared vectorized extractor (mel filterbank + window built once per process)"""
+        return get_mel_extractor(self.sample_rate, self.n_fft, self.hop_length, self.n_mels)
+
+    def _resample(self, audio_data: np.ndarray, sr: Optional[int]) -> np.ndarray:
+        """Resample to 16kHz if needed"""
+        if sr and sr != self.sample_rate:
+            return librosa.resample(
+                audio_data,
+                orig_sr=sr,
+                target_sr=self.sample_rate
+            )
+        return audio_data
+
     def extract_features(self, audio_data: np.ndarray, sr: int = None) -> np.ndarray:
         """
         Extract mel-spectrogram features from audio
@@ -267,38 +346,56 @@ class AudioClassifier:
             return np.random.randn(128).astype(np.float32)
 
         try:
-            # Resample if needed
-            if sr and sr != self.sample_rate:
-                audio_data = librosa.resample(
-                    audio_data,
-                    orig_sr=sr,
-                    target_sr=self.sample_rate
-                )
+            audio_data = self._resample(audio_data, sr)
 
-            # Compute mel-spectrogram
-            mel_spec = librosa.feature.melspectrogram(
-                y=audio_data,
-                sr=self.sample_rate,
-                n_mels=self.n_mels,
-                hop_length=self.hop_length,
-                n_fft=self.n_fft
-            )
+            # Log-mel, mean-pooled over time and normalized
+            return self.feature_extractor.extract(audio_data[np.newaxis, :])[0]
+
+        except Exception as e:
+            logger.error(f"Feature extraction failed: {e}")
+            # Return mock features as fallback
+            return np.random.randn(128).astype(np.float32)
 
-            # Convert to log scale
-            log_mel_spec = librosa.power_to_db(mel_spec, ref=np.max)
+    def extract_features_batch(self, audio_clips: List[np.ndarray], sr: int = None) -> np.ndarray:
+        """
+        Extract features for many clips (one vectorized STFT per clip length)
 
-            # Aggregate across time (mean pooling)
-            features = np.mean(log_mel_spec, axis=1)
+        Args:
+            audio_clips: Raw audio sample arrays
+            sr: Sample rate shared by all clips
 
-            # Normalize
-            features = (features - features.mean()) / (features.std() + 1e-8)
+        Returns:
+            (N, 128) feature matrix in input order
+        """
+        if not AUDIO_LIBS_AVAILABLE:
+            return np.stack([self.extract_features(clip, sr) for clip in audio_clips])
 
-            return features.astype(np.float32)
+        try:
+            clips = [self._resample(clip, sr) for clip in audio_clips]
+            return self.feature_extractor.extract_many(clips)
 
         except Exception as e:
-            logger.error(f"Feature extraction failed: {e}")
-            # Return mock features as fallback
-            return np.random.randn(128).astype(np.float32)
+            logger.error(f"Batched feature extraction failed, falling back per clip: {e}")
+            return np.stack([self.extract_features(clip, sr) for clip in audio_clips])
+
+    async def extract_features_batch_async(self, audio_clips: List[np.ndarray], sr: int = None) -> np.ndarray:
+        """
+        extract_features_batch() off the event loop
+
+        Runs in the feature extraction process pool when enabled (PCM passed
+        through shared memory), otherwise inline.
+        """
+        pool = get_feature_pool()
+        if pool is not None and AUDIO_LIBS_AVAILABLE:
+            try:
+                return await pool.extract(
+                    [np.asarray(clip, dtype=np.float32) for clip in audio_clips],
+                    sr or self.sample_rate
+                )
+            except Exception as e:
+                logger.error(f"Feature extraction pool failed, extracting inline: {e}")
+
+        return self.extract_features_batch(audio_clips, sr)
 
     async def classify_audio(
         self,
@@ -317,62 +414,407 @@ class AudioClassifier:
         Returns:
             Classification result with threat category and confidence
         """
+        results = await self.classify_audio_batch([audio_data], sample_rate, context)
+        return results[0]
+
+    async def classify_audio_batch(
+        self,
+        audio_clips: List[np.ndarray],
+        sample_rate: int = 16000,
+        context: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Classify several audio clips with a single stacked forward pass
+
+        Features are extracted for every clip, stacked into one (N, 128) tensor
+        and run through the model once, instead of N batch-size-1 calls.
+        Invalid clips get an error result in their slot; the rest are classified.
+
+        Args:
+            audio_clips: Raw audio sample arrays (any lengths)
+            sample_rate: Sample rate shared by all clips
+            context: Additional context (location, time, etc.)
+
+        Returns:
+            Classification results in the same order as audio_clips
+        """
+        if not audio_clips:
+            return []
+
         if not self.loaded:
             await self.load_model()
 
+        # Each clip is validated and gated on its own: a bad clip gets an error
+        # result and never fails the rest of the batch
+        gate = get_audio_gate()
+        results: List[Optional[Dict]] = [None] * len(audio_clips)
+        decisions: List[Optional[GateDecision]] = [None] * len(audio_clips)
+        clips: Dict[int, np.ndarray] = {}
+
+        for i, audio_data in enumerate(audio_clips):
+            try:
+                clip = self._as_clip(audio_data)
+                decision = gate.evaluate(clip, sample_rate)
+            except Exception as e:
+                logger.warning(f"Audio clip {i} rejected: {e}")
+                results[i] = self._error_result(e)
+                continue
+
+            decisions[i] = decision
+            if decision.gated:
+                # Silent/wind clips are answered by the gate (no STFT, no model)
+                results[i] = self._build_result(
+                    decision.class_id,
+                    GATE_CONFIDENCE,
+                    duration_seconds=len(clip) / sample_rate,
+                    sample_rate=sample_rate,
+                    feature_dim=0
+                )
+            else:
+                clips[i] = clip
+
+        if clips:
+            features = await self._extract_rows(clips, sample_rate, results)
+            if features:
+                rows = list(features)
+                try:
+                    # One forward pass for the clips that made it this far
+                    probs = await self._predict_async(np.stack([features[i] for i in rows]))
+                except Exception as e:
+                    logger.error(f"Audio classification failed: {e}")
+                    for i in rows:
+                        results[i] = self._error_result(e)
+                else:
+                    top_classes = probs.argmax(axis=1)
+                    for row, i in enumerate(rows):
+                        top_class = int(top_classes[row])
+                        results[i] = self._build_result(
+                            top_class,
+                            float(probs[row, top_class]),
+                            duration_seconds=len(clips[i]) / sample_rate,
+                            sample_rate=sample_rate,
+                            feature_dim=features[i].shape[0]
+                        )
+
+        for result, decision in zip(results, decisions):
+            if decision is not None:
+                result['gate'] = decision.to_dict()
+
+        return results
+
+    async def _extract_rows(
+        self,
+        clips: Dict[int, np.ndarray],
+        sample_rate: int,
+        results: List[Optional[Dict]]
+    ) -> Dict[int, np.ndarray]:
+        """Features per clip index; clips that fail get an error in results instead"""
+        indices = list(clips)
         try:
-            # Extract features
-            features = self.extract_features(audio_data, sample_rate)
+            batch = await self.extract_features_batch_async([clips[i] for i in indices], sample_rate)
+            extracted = {i: batch[row] for row, i in enumerate(indices)}
+        except Exception as e:
+            logger.error(f"Batched feature extraction failed, extracting per clip: {e}")
+            extracted = {}
+            for i in indices:
+                try:
+                    extracted[i] = (await self.extract_features_batch_async([clips[i]], sample_rate))[0]
+                except Exception as clip_error:
+                    results[i] = self._error_result(clip_error)
+
+        features = {}
+        for i, row in extracted.items():
+            if np.isfinite(row).all():
+                features[i] = row
+            else:
+                results[i] = self._error_result(ValueError("feature extraction produced non-finite values"))
+        return features
+
+    @staticmethod
+    def _as_clip(audio_data) -> np.ndarray:
+        """Validate one clip as a non-empty, finite, 1-D float32 sample array"""
+        clip = np.asarray(audio_data, dtype=np.float32)
+        if clip.ndim != 1 or clip.size == 0:
+            raise ValueError(f"expected a non-empty 1-D sample array, got shape {clip.shape}")
+        if not np.isfinite(clip).all():
+            raise ValueError("audio contains NaN or infinite samples")
+        return clip
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict:
+        return {
+            'success': False,
+            'error': str(error),
+            'threat_category': 'unknown',
+            'confidence': 0.0
+        }
 
-            # Run inference
-            with torch.no_grad():
-                features_tensor = torch.FloatTensor(features).unsqueeze(0).to(self.device)
+    def _predict(self, features: np.ndarray) -> np.ndarray:
+        """Run a batch of (N, 128) feature vectors through the model, returning class probabilities"""
+        with torch.no_grad():
+            features_tensor = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32)).to(self.device)
+            if self.inference_model is not None:
+                logits, _ = self.inference_model(features_tensor)
+            else:
                 logits = self.model(features_tensor)
-                probs = F.softmax(logits, dim=1)
-
-                # Get top predictions
-                top_prob, top_class = torch.max(probs, dim=1)
-                top_prob = top_prob.item()
-                top_class = top_class.item()
-
-            # Map SAIT class to Atlas threat category
-            sait_threat = self.SAIT_CLASSES.get(top_class, 'unknown')
-            atlas_category = self._map_sait_to_atlas(top_class)
-
-            # Get category info
-            category_info = self.threat_categories.get(atlas_category, {})
-
-            result = {
-                'success': True,
-                'beta': True,  # Mark audio classifier as beta
-                'threat_category': atlas_category,
-                'severity': category_info.severity if category_info else 1,
-                'confidence': float(top_prob),
-                'sait_classification': {
-                    'class_id': int(top_class),
-                    'class_name': sait_threat,
-                    'priority': category_info.priority if category_info else 'UNKNOWN'
-                },
-                'audio_metadata': {
-                    'sample_rate': sample_rate,
-                    'duration_seconds': len(audio_data) / sample_rate,
-                    'feature_dim': features.shape[0]
-                },
-                'recommendations': self._generate_recommendations(atlas_category, top_prob)
+            probs = F.softmax(logits, dim=1)
+        return probs.cpu().numpy()
+
+    def _embed(self, features: np.ndarray) -> np.ndarray:
+        """Run a batch of (N, 128) feature vectors through the model, returning (N, 256) embeddings"""
+        with torch.no_grad():
+            features_tensor = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32)).to(self.device)
+            if self.inference_model is not None:
+                _, embeddings = self.inference_model(features_tensor)
+            else:
+                _, embeddings = self.model(features_tensor, return_features=True)
+        return embeddings.float().cpu().numpy()
+
+    async def _predict_async(self, features: np.ndarray) -> np.ndarray:
+        """_predict from the event loop (remote models override this to await the inference server)"""
+        return self._predict(features)
+
+    async def _embed_async(self, features: np.ndarray) -> np.ndarray:
+        """_embed from the event loop (remote models override this to await the inference server)"""
+        return self._embed(features)
+
+    async def embed_audio_batch(self, audio_clips: List[np.ndarray], sample_rate: int = 16000) -> np.ndarray:
+        """
+        Penultimate-layer embeddings for similarity search
+
+        Args:
+            audio_clips: Raw audio sample arrays (any lengths)
+            sample_rate: Sample rate shared by all clips
+
+        Returns:
+            (len(audio_clips), 256) float32 embeddings
+        """
+        if not self.loaded:
+            await self.load_model()
+
+        return await self._embed_async(await self.extract_features_batch_async(audio_clips, sample_rate))
+
+    def _build_result(
+        self,
+        top_class: int,
+        top_prob: float,
+        duration_seconds: float,
+        sample_rate: int,
+        feature_dim: int
+    ) -> Dict:
+        """Build classification result for the top predicted SAIT class"""
+        # Map SAIT class to Atlas threat category
+        sait_threat = self.SAIT_CLASSES.get(top_class, 'unknown')
+        atlas_category = self._map_sait_to_atlas(top_class)
+
+        # Get category info
+        category_info = self.threat_categories.get(atlas_category, {})
+
+        result = {
+            'success': True,
+            'beta': True,  # Mark audio classifier as beta
+            'threat_category': atlas_category,
+            'severity': category_info.severity if category_info else 1,
+            'confidence': float(top_prob),
+            'sait_classification': {
+                'class_id': int(top_class),
+                'class_name': sait_threat,
+                'priority': category_info.priority if category_info else 'UNKNOWN'
+            },
+            'audio_metadata': {
+                'sample_rate': sample_rate,
+                'duration_seconds': duration_seconds,
+                'feature_dim': feature_dim
+            },
+            'recommendations': self._generate_recommendations(atlas_category, top_prob)
+        }
+
+        logger.info(f"Audio classified: {atlas_category} (confidence: {top_prob:.2f})")
+        return result
+
+    async def classify_audio_timeline(
+        self,
+        audio_blocks: Iterable[np.ndarray],
+        sample_rate: int = 16000,
+        window_seconds: float = 2.0,
+        hop_seconds: float = 1.0,
+        batch_size: int = 32,
+        min_confidence: float = 0.5
+    ) -> Dict:
+        """
+        Classify a long recording as a timeline of threat sounds
+
+        Audio is consumed block by block through an incremental STFT; overlapping
+        fixed-size windows are classified in batches. Memory stays constant
+        regardless of recording length.
+
+        Args:
+            audio_blocks: Iterable of sample blocks (any block size)
+            sample_rate: Sample rate of the blocks (resampled to 16kHz if different)
+            window_seconds: Analysis window length
+            hop_seconds: Step between window starts
+            batch_size: Windows per forward pass
+            min_confidence: Minimum confidence for a window to enter the timeline
+
+        Returns:
+            Timeline result with threat segments (start/end seconds)
+        """
+        if not self.loaded:
+            await self.load_model()
+
+        if not AUDIO_LIBS_AVAILABLE:
+            return {
+                'success': False,
+                'error': 'Audio processing libraries not installed (librosa required)',
+                'timeline': []
             }
 
-            logger.info(f"Audio classified: {atlas_category} (confidence: {top_prob:.2f})")
-            return result
+        try:
+            # CPU-bound streaming loop runs off the event loop
+            return await asyncio.to_thread(
+                self._classify_timeline_sync,
+                audio_blocks,
+                sample_rate,
+                window_seconds,
+                hop_seconds,
+                batch_size,
+                min_confidence
+            )
 
         except Exception as e:
-            logger.error(f"Audio classification failed: {e}")
+            logger.error(f"Audio timeline classification failed: {e}")
             return {
                 'success': False,
                 'error': str(e),
-                'threat_category': 'unknown',
-                'confidence': 0.0
+                'timeline': []
             }
 
+    def _classify_timeline_sync(
+        self,
+        audio_blocks: Iterable[np.ndarray],
+        sample_rate: int,
+        window_seconds: float,
+        hop_seconds: float,
+        batch_size: int,
+        min_confidence: float
+    ) -> Dict:
+        """Streaming window classification (runs in a worker thread)"""
+        streamer = StreamingMelExtractor(self.feature_extractor, window_seconds, hop_seconds)
+        blocks = resample_blocks(audio_blocks, sample_rate, self.sample_rate)
+
+        gate = get_audio_gate()
+
+        timeline: List[Dict] = []
+        pending_bounds: List[Tuple[float, float]] = []
+        pending_features: List[np.ndarray] = []
+        windows_analyzed = 0
+        gated_samples = 0
+
+        def classify_pending():
+            probs = self._predict(np.stack(pending_features))
+            for (start, end), window_probs in zip(pending_bounds, probs):
+                top_class = int(window_probs.argmax())
+                self._add_to_timeline(timeline, start, end, top_class, float(window_probs[top_class]), min_confidence)
+            pending_bounds.clear()
+            pending_features.clear()
+
+        def windows():
+            # Gated blocks (silence/wind) advance the clock without an STFT
+            nonlocal gated_samples
+            for block in blocks:
+                if gate.evaluate(block, self.sample_rate).gated:
+                    gated_samples += len(block)
+                    yield from streamer.skip(len(block))
+                else:
+                    yield from streamer.push(block)
+            yield from streamer.flush()
+
+        for start, end, features in windows():
+            pending_bounds.append((start, end))
+            pending_features.append(features)
+            windows_analyzed += 1
+            if len(pending_features) >= batch_size:
+                classify_pending()
+
+        if pending_features:
+            classify_pending()
+
+        top_detection = max(
+            timeline,
+            key=lambda segment: (segment['severity'], segment['confidence']),
+            default=None
+        )
+
+        logger.info(
+            f"Audio timeline: {len(timeline)} threat segments in "
+            f"{streamer.duration_seconds:.1f}s ({windows_analyzed} windows, "
+            f"{gated_samples / self.sample_rate:.1f}s gated)"
+        )
+
+        return {
+            'success': True,
+            'beta': True,
+            'timeline': timeline,
+            'top_detection': top_detection,
+            'windows_analyzed': windows_analyzed,
+            'window_seconds': window_seconds,
+            'hop_seconds': hop_seconds,
+            'duration_seconds': streamer.duration_seconds,
+            'gated_seconds': gated_samples / self.sample_rate,
+            'sample_rate': self.sample_rate
+        }
+
+    def window_detection(
+        self,
+        start: float,
+        end: float,
+        class_id: int,
+        confidence: float,
+        min_confidence: float
+    ) -> Optional[Dict]:
+        """Detection for a classified window (None for low-confidence or non-threat sounds)"""
+        atlas_category = self._map_sait_to_atlas(class_id)
+        category_info = self.threat_categories.get(atlas_category)
+
+        # Only threat sounds are reported
+        if confidence < min_confidence or (category_info and category_info.priority == 'NON_THREAT'):
+            return None
+
+        return {
+            'start_seconds': round(start, 3),
+            'end_seconds': round(end, 3),
+            'class_id': class_id,
+            'class_name': self.SAIT_CLASSES.get(class_id, 'unknown'),
+            'threat_category': atlas_category,
+            'priority': category_info.priority if category_info else 'UNKNOWN',
+            'severity': category_info.severity if category_info else 1,
+            'confidence': confidence
+        }
+
+    def _add_to_timeline(
+        self,
+        timeline: List[Dict],
+        start: float,
+        end: float,
+        class_id: int,
+        confidence: float,
+        min_confidence: float
+    ):
+        """Append a window to the timeline, merging it into the previous segment when contiguous"""
+        detection = self.window_detection(start, end, class_id, confidence, min_confidence)
+        if detection is None:
+            return
+
+        if timeline:
+            last = timeline[-1]
+            if last['class_id'] == class_id and start <= last['end_seconds']:
+                last['end_seconds'] = round(max(last['end_seconds'], end), 3)
+                last['confidence'] = max(last['confidence'], confidence)
+                last['windows'] += 1
+                return
+
+        timeline.append({**detection, 'windows': 1})
+
     def _map_sait_to_atlas(self, sait_class: int) -> str:
         """Map SAIT class ID to Atlas threat category"""
         for category_name, category_info in self.threat_categories.items():
@@ -403,7 +845,8 @@ class AudioClassifier:
     async def verify_edge_detection(
         self,
         sait_detection: Dict,
-        audio_data: Optional[np.ndarray] = None
+        audio_data: Optional[np.ndarray] = None,
+        cloud_result: Optional[Dict] = None
     ) -> Dict:
         """
         Verify edge detection from SAIT device with cloud model
@@ -411,6 +854,7 @@ class AudioClassifier:
         Args:
             sait_detection: Detection from edge device with confidence
             audio_data: Optional raw audio for re-analysis
+            cloud_result: Optional precomputed classify_audio() result (e.g. from the analysis cache)
 
         Returns:
             Verification result with cloud confidence
@@ -419,19 +863,24 @@ class AudioClassifier:
         edge_confidence = sait_detection.get('confidence', 0.0)
 
         # If edge confidence is high, trust it
-        if edge_confidence > 0.85:
+        if edge_confidence > self.EDGE_TRUST_THRESHOLD:
             return {
                 'verified': True,
                 'edge_confidence': edge_confidence,
                 'cloud_confidence': edge_confidence,  # Trust edge
+                'edge_class': edge_class,
+                'cloud_class': edge_class,
                 'action': 'edge_detection_trusted',
+                'final_category': self._map_sait_to_atlas(edge_class),
+                'recommendations': ['High edge confidence - no cloud verification needed'],
                 'message': 'High edge confidence - no cloud verification needed'
             }
 
         # Low confidence - re-analyze with cloud model
-        if audio_data is not None and self.loaded:
+        if cloud_result is None and audio_data is not None and self.loaded:
             cloud_result = await self.classify_audio(audio_data)
 
+        if cloud_result is not None and cloud_result.get('success'):
             agreement = (
                 cloud_result['sait_classification']['class_id'] == edge_class
             )
@@ -451,33 +900,58 @@ class AudioClassifier:
         return {
             'verified': False,
             'edge_confidence': edge_confidence,
+            'cloud_confidence': 0.0,
+            'edge_class': edge_class,
+            'cloud_class': -1,
             'action': 'flagged_for_review',
+            'final_category': 'unknown',
+            'recommendations': ['Low edge confidence, no audio for cloud verification'],
             'message': 'Low edge confidence, no audio for cloud verification'
         }
 
+    @property
+    def cache_version(self) -> str:
+        """Version string keying cached results (model version + weights fingerprint)"""
+        fingerprint = self._untrained_fingerprint or file_fingerprint(self.model_path)
+        return f"{self.get_model_version()['model_version']}:{fingerprint}"
+
+    @property
+    def model_version(self) -> str:
+        """OTA version: base version + weights hash, so it changes whenever the weights do (URL/query safe)"""
+        return f"{MODEL_BASE_VERSION}.{self.weights_id[:12]}" if self.weights_id else MODEL_BASE_VERSION
+
     def get_model_version(self) -> Dict:
         """Get current model version for OTA updates"""
         return {
-            'model_version': '1.0.0',
+            'model_version': self.model_version,
             'model_type': 'audio_classifier',
             'architecture': 'MultiScaleAudioModel',
             'num_classes': 30,
             'input_dim': 128,
-            'format': 'pytorch',
+            'format': 'int8',
             'deployed_at': '2025-10-07',
             'compatible_devices': ['nRF5340', 'SAIT_01']
         }
 
-    async def get_ota_model_package(self, target_format: str = 'tflite') -> Optional[bytes]:
+    async def get_ota_model_package(self, target_format: str = 'int8') -> Optional[OTAArtifact]:
         """
         Get model package for OTA update to SAIT devices
 
+        The package is published to the OTA artifact store once per version
+        (checksum and size computed then); later calls are memory lookups.
+        Edge formats are INT8 builds (see services.edge_package), built once
+        per weights and format.
+
         Args:
-            target_format: 'tflite', 'cmsis-nn', or 'pytorch'
+            target_format: 'int8' (device runtime), 'cmsis-nn' (firmware builds),
+                or 'pytorch' (testing only)
 
         Returns:
-            Model bytes for OTA distribution
+            Published OTA artifact (path, checksum, size, ETag)
         """
+        if target_format not in OTA_FORMATS:
+            raise ValueError(f"Unsupported OTA format: {target_format}")
+
         if not self.loaded or not self.model_path:
             logger.warning("No model available for OTA distribution")
             return None
@@ -487,13 +961,31 @@ class AudioClassifier:
             if not model_file.exists():
                 return None
 
-            # For now, return raw PyTorch model
-            # TODO: Convert to TFLite/CMSIS-NN for edge deployment
-            with open(model_file, 'rb') as f:
-                model_bytes = f.read()
-
-            logger.info(f"OTA package prepared: {len(model_bytes)} bytes")
-            return model_bytes
+            if target_format == 'pytorch':
+                package_path = model_file
+            else:
+                features_path = settings.EDGE_CALIBRATION_FEATURES_PATH or None
+                build_key = (target_format, file_fingerprint(model_file), file_fingerprint(features_path))
+                package_path = self._edge_packages.get(build_key)
+                if package_path is None or not package_path.exists():
+                    package_path = await asyncio.to_thread(
+                        build_edge_package,
+                        self.model,
+                        target_format,
+                        Path(settings.COMPILED_MODEL_CACHE_DIR),
+                        features_path=features_path,
+                        require_features=settings.ATLAS_ENV == "production",
+                        keep=settings.COMPILED_MODEL_CACHE_KEEP
+                    )
+                    if package_path is None:
+                        return None
+                    self._edge_packages[build_key] = package_path
+
+            return await get_ota_store().publish(
+                self.get_model_version()['model_version'],
+                target_format,
+                package_path
+            )
 
         except Exception as e:
             logger.error(f"OTA package preparation failed: {e}")
@@ -504,24 +996,59 @@ class AudioClassifier:
 _audio_classifier: Optional[AudioClassifier] = None
 
 
+def _find_model_path() -> Optional[str]:
+    """Locally available SAIT model weights"""
+    sait_models = [
+        Path("models/sait_audio_classifier.pth"),
+        Path("models/production_model_best.pth"),
+        Path("/Users/timothyaikenhead/Desktop/SAIT_01 Firmware:Software/production_model_best.pth"),
+    ]
+    for model in sait_models:
+        if model.exists():
+            return str(model)
+    return None
+
+
+async def _resolve_model_path(version: str = "latest", force_download: bool = False) -> Optional[str]:
+    """Weights for a model storage version (S3 when configured), else locally available weights"""
+    from services.model_storage import get_model_storage
+
+    storage = get_model_storage()
+    if version != "latest" or force_download or storage.storage_type == "s3":
+        downloaded = await storage.get_model(
+            "sait_audio_classifier.pth", version=version, force_download=force_download
+        )
+        if downloaded:
+            return str(downloaded)
+    return _find_model_path()
+
+
+async def create_audio_classifier(version: str = "latest", force_download: bool = False) -> AudioClassifier:
+    """
+    Build and load a new (unshared) audio classifier instance
+
+    Args:
+        version: Model storage version ('latest' is resolved in S3 when configured,
+            otherwise uses locally available weights)
+        force_download: Re-download the weights from model storage
+    """
+    classifier = AudioClassifier(model_path=await _resolve_model_path(version, force_download))
+    await classifier.load_model()
+    return classifier
+
+
 async def get_audio_classifier(model_path: Optional[str] = None) -> AudioClassifier:
     """Get or create audio classifier singleton"""
     global _audio_classifier
 
     if _audio_classifier is None:
-        if model_path is None:
-            # Try to find SAIT model
-            sait_models = [
-                Path("models/sait_audio_classifier.pth"),
-                Path("models/production_model_best.pth"),
-                Path("/Users/timothyaikenhead/Desktop/SAIT_01 Firmware:Software/production_model_best.pth"),
-            ]
-            for model in sait_models:
-                if model.exists():
-                    model_path = str(model)
-                    break
-
-        _audio_classifier = AudioClassifier(model_path=model_path)
+        _audio_classifier = AudioClassifier(model_path=model_path or await _resolve_model_path())
         await _audio_classifier.load_model()
 
     return _audio_classifier
+
+
+def set_audio_classifier(classifier: Optional[AudioClassifier]):
+    """Replace the singleton (model manager swap, or None on eviction so weights can be freed)"""
+    global _audio_classifier
+    _audio_classifier = classifier
@@ -0,0 +1,352 @@
+"""
+Audio Feature Extraction
+Vectorized log-mel features for the SAIT audio classifier
+
+Produces the same 128-dim pooled features as the original per-clip librosa
+pipeline (melspectrogram -> power_to_db(ref=max) -> mean over time -> z-score),
+but:
+- The mel filterbank and Hann window are computed once per configuration
+- The STFT runs as one NumPy FFT over a batch of equal-length clips
+"""
+
+import io
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# power_to_db defaults used by the original pipeline
+AMIN = 1e-10
+TOP_DB = 80.0
+
+# Clips per FFT call (bounds peak memory of the framed batch)
+MAX_CLIPS_PER_CHUNK = 32
+
+
+class MelFeatureExtractor:
+    """Batched log-mel feature extractor with cached filterbank and window"""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        n_fft: int = 2048,
+        hop_length: int = 512,
+        n_mels: int = 128
+    ):
+        import librosa
+
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+
+        # Same filterbank librosa.feature.melspectrogram builds on every call
+        # (Slaney mel scale, Slaney normalization), transposed for (frames, freq) @ (freq, mels)
+        mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=n_mels)
+        self.mel_basis_t = np.ascontiguousarray(mel_basis.T, dtype=np.float32)
+
+        # Periodic Hann window (scipy.signal.get_window('hann', n_fft, fftbins=True))
+        n = np.arange(n_fft, dtype=np.float64)
+        self.window = (0.5 - 0.5 * np.cos(2.0 * np.pi * n / n_fft)).astype(np.float32)
+
+    def mel_power(self, clips: np.ndarray) -> np.ndarray:
+        """
+        Mel power spectrogram for a batch of equal-length clips
+
+        Args:
+            clips: (batch, samples) float array
+
+        Returns:
+            (batch, frames, n_mels) mel power
+        """
+        clips = np.asarray(clips, dtype=np.float32)
+
+        # center=True with zero padding (librosa>=0.10 default pad_mode='constant')
+        pad = self.n_fft // 2
+        padded = np.pad(clips, ((0, 0), (pad, pad)))
+
+        return self.frames_mel_power(padded)
+
+    def frames_mel_power(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Mel power of every complete n_fft frame (hop_length apart) in a padded signal
+
+        Args:
+            signal: (..., samples) float32 signal, already padded
+
+        Returns:
+            (..., frames, n_mels) mel power
+        """
+        frames = np.lib.stride_tricks.sliding_window_view(signal, self.n_fft, axis=-1)
+        frames = frames[..., ::self.hop_length, :] * self.window
+
+        spectrum = np.fft.rfft(frames, n=self.n_fft, axis=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+
+        return power.astype(np.float32, copy=False) @ self.mel_basis_t
+
+    def pooled_from_mel(self, mel_power: np.ndarray) -> np.ndarray:
+        """
+        Log-scale (per-clip ref=max, top_db=80), mean-pool over time and z-score
+
+        Args:
+            mel_power: (batch, frames, n_mels) mel power
+
+        Returns:
+            (batch, n_mels) float32 features
+        """
+        log_mel = 10.0 * np.log10(np.maximum(AMIN, mel_power))
+        ref = np.maximum(AMIN, mel_power.max(axis=(1, 2), keepdims=True))
+        log_mel -= 10.0 * np.log10(ref)
+        log_mel = np.maximum(log_mel, log_mel.max(axis=(1, 2), keepdims=True) - TOP_DB)
+
+        features = log_mel.mean(axis=1)
+        features = (features - features.mean(axis=1, keepdims=True)) / (features.std(axis=1, keepdims=True) + 1e-8)
+        return features.astype(np.float32)
+
+    def extract(self, clips: np.ndarray) -> np.ndarray:
+        """
+        Pooled features for a batch of equal-length clips
+
+        Args:
+            clips: (batch, samples) float array at self.sample_rate
+
+        Returns:
+            (batch, n_mels) float32 features
+        """
+        clips = np.atleast_2d(clips)
+        outputs = [
+            self.pooled_from_mel(self.mel_power(clips[i:i + MAX_CLIPS_PER_CHUNK]))
+            for i in range(0, len(clips), MAX_CLIPS_PER_CHUNK)
+        ]
+        return np.concatenate(outputs, axis=0)
+
+    def extract_many(self, clips: List[np.ndarray]) -> np.ndarray:
+        """
+        Pooled features for clips of arbitrary lengths
+
+        Clips are grouped by length so each group is one vectorized STFT.
+
+        Returns:
+            (len(clips), n_mels) float32 features in input order
+        """
+        features = np.empty((len(clips), self.n_mels), dtype=np.float32)
+
+        groups: Dict[int, List[int]] = {}
+        for index, clip in enumerate(clips):
+            groups.setdefault(len(clip), []).append(index)
+
+        for indices in groups.values():
+            batch = np.stack([clips[i] for i in indices])
+            features[indices] = self.extract(batch)
+
+        return features
+
+
+class StreamingMelExtractor:
+    """
+    Incremental STFT producing pooled features for overlapping fixed-size windows
+
+    Audio is pushed in blocks of any size. Only the last n_fft samples and the
+    last window's mel frames (a fixed-size ring buffer) are kept, so memory is
+    constant regardless of recording length.
+
+    Each emitted window is (start_seconds, end_seconds, features) where
+    features are pooled exactly like MelFeatureExtractor.extract() pools a clip.
+    """
+
+    def __init__(
+        self,
+        extractor: MelFeatureExtractor,
+        window_seconds: float = 2.0,
+        hop_seconds: float = 1.0
+    ):
+        self.extractor = extractor
+        frames_per_second = extractor.sample_rate / extractor.hop_length
+        self.window_frames = max(1, int(round(window_seconds * frames_per_second)))
+        self.hop_frames = max(1, int(round(hop_seconds * frames_per_second)))
+
+        # Ring buffer of the most recent window_frames mel frames
+        self._ring = np.zeros((self.window_frames, extractor.n_mels), dtype=np.float32)
+        self._segment_offset = 0  # Samples before the current segment (skipped stretches included)
+        self._flushed = False
+        self._start_segment()
+
+    def _start_segment(self):
+        # Sample tail: starts with center padding, never grows beyond n_fft + block
+        self._tail = np.zeros(self.extractor.n_fft // 2, dtype=np.float32)
+        self._frames_total = 0
+        self._last_emit_end = 0  # Frame index (exclusive) covered by the last window
+        self._samples_total = 0  # Samples pushed into the current segment
+
+    @property
+    def duration_seconds(self) -> float:
+        return (self._segment_offset + self._samples_total) / self.extractor.sample_rate
+
+    def _frame_to_seconds(self, frame_index: int) -> float:
+        return (self._segment_offset + frame_index * self.extractor.hop_length) / self.extractor.sample_rate
+
+    def _window(self, end_frame: int) -> Tuple[float, float, np.ndarray]:
+        """Pool the window_frames (or fewer, at stream start) frames ending at end_frame"""
+        count = min(self.window_frames, end_frame)
+        positions = np.arange(end_frame - count, end_frame) % self.window_frames
+        mel = self._ring[positions][np.newaxis, :, :]
+        features = self.extractor.pooled_from_mel(mel)[0]
+        self._last_emit_end = end_frame
+        return (
+            self._frame_to_seconds(end_frame - count),
+            min(self._frame_to_seconds(end_frame), self.duration_seconds),
+            features
+        )
+
+    def _add_frames(self, mel_frames: np.ndarray) -> List[Tuple[float, float, np.ndarray]]:
+        windows = []
+        for mel_frame in mel_frames:
+            self._ring[self._frames_total % self.window_frames] = mel_frame
+            self._frames_total += 1
+
+            since_last = self._frames_total - self._last_emit_end
+            first_window = self._last_emit_end == 0 and self._frames_total == self.window_frames
+            if first_window or (self._last_emit_end > 0 and since_last == self.hop_frames):
+                windows.append(self._window(self._frames_total))
+        return windows
+
+    def push(self, samples: np.ndarray) -> List[Tuple[float, float, np.ndarray]]:
+        """
+        Feed a block of samples (at the extractor's sample rate)
+
+        Returns:
+            Windows completed by this block
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        self._samples_total += len(samples)
+
+        signal = np.concatenate([self._tail, samples])
+        n_fft, hop = self.extractor.n_fft, self.extractor.hop_length
+        if len(signal) < n_fft:
+            self._tail = signal
+            return []
+
+        n_frames = 1 + (len(signal) - n_fft) // hop
+        mel_frames = self.extractor.frames_mel_power(signal[:(n_frames - 1) * hop + n_fft])
+        self._tail = signal[n_frames * hop:].copy()
+
+        return self._add_frames(mel_frames)
+
+    def flush(self) -> List[Tuple[float, float, np.ndarray]]:
+        """
+        Finish the stream (end-of-stream center padding) and emit the last partial window
+
+        Returns:
+            Remaining windows
+        """
+        if self._flushed:
+            return []
+        self._flushed = True
+        return self._end_segment()
+
+    def _end_segment(self) -> List[Tuple[float, float, np.ndarray]]:
+        """End-of-segment center padding and the last partial window"""
+        if not self._samples_total:
+            return []
+
+        samples_total = self._samples_total
+        windows = self.push(np.zeros(self.extractor.n_fft // 2, dtype=np.float32))
+        self._samples_total = samples_total
+
+        # Frames after the last emitted window (or a segment shorter than one window)
+        if self._frames_total > self._last_emit_end:
+            windows.append(self._window(self._frames_total))
+        return windows
+
+    def skip(self, num_samples: int) -> List[Tuple[float, float, np.ndarray]]:
+        """
+        Advance the stream clock without analysing num_samples (e.g. gated silence)
+
+        The current segment is finished (its last windows are returned) and the
+        next pushed block starts a new segment after the gap.
+        """
+        windows = self._end_segment()
+        self._segment_offset += self._samples_total + num_samples
+        self._start_segment()
+        return windows
+
+    def iter_windows(self, blocks: Iterable[np.ndarray]) -> Iterator[Tuple[float, float, np.ndarray]]:
+        """Push every block and yield windows as they complete, then flush"""
+        for block in blocks:
+            yield from self.push(block)
+        yield from self.flush()
+
+
+def iter_array_blocks(audio_data: np.ndarray, block_size: int) -> Iterator[np.ndarray]:
+    """Split an in-memory signal into views of block_size samples"""
+    for start in range(0, len(audio_data), block_size):
+        yield audio_data[start:start + block_size]
+
+
+def resample_blocks(blocks: Iterable[np.ndarray], orig_sr: int, target_sr: int) -> Iterator[np.ndarray]:
+    """Resample a block stream with a stateful soxr resampler (no block-edge artifacts)"""
+    if orig_sr == target_sr:
+        yield from blocks
+        return
+
+    import soxr
+    resampler = soxr.ResampleStream(orig_sr, target_sr, 1, dtype="float32")
+    for block in blocks:
+        resampled = resampler.resample_chunk(np.asarray(block, dtype=np.float32))
+        if len(resampled):
+            yield resampled
+
+    tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+    if len(tail):
+        yield tail
+
+
+def iter_audio_blocks(
+    source: Union[str, io.BytesIO],
+    target_sr: int = 16000,
+    block_seconds: float = 1.0
+) -> Iterator[np.ndarray]:
+    """
+    Read an audio file block by block as mono float32 at target_sr
+
+    Uses soundfile for incremental reads and a streaming resampler, so only
+    one block is held in memory at a time.
+    """
+    import soundfile as sf
+
+    with sf.SoundFile(source) as audio_file:
+        block_size = max(1, int(audio_file.samplerate * block_seconds))
+
+        def native_blocks() -> Iterator[np.ndarray]:
+            for block in audio_file.blocks(blocksize=block_size, dtype="float32", always_2d=True):
+                yield block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+
+        yield from resample_blocks(native_blocks(), audio_file.samplerate, target_sr)
+
+
+def probe_duration(source: Union[str, io.BytesIO]) -> Optional[float]:
+    """Duration in seconds from the file header, or None if soundfile can't read it"""
+    try:
+        import soundfile as sf
+        return sf.info(source).duration
+    except Exception:
+        return None
+    finally:
+        if hasattr(source, "seek"):
+            source.seek(0)
+
+
+@lru_cache(maxsize=8)
+def get_mel_extractor(
+    sample_rate: int = 16000,
+    n_fft: int = 2048,
+    hop_length: int = 512,
+    n_mels: int = 128
+) -> MelFeatureExtractor:
+    """Get shared extractor for a configuration (filterbank built once per process)"""
+    logger.info(f"Building mel filterbank: sr={sample_rate}, n_fft={n_fft}, n_mels={n_mels}")
+    return MelFeatureExtractor(sample_rate, n_fft, hop_length, n_mels)
@@ -0,0 +1,173 @@
+"""
+Audio Gate
+Pre-inference energy/noise gate for the SAIT audio classifier
+
+Cheap time-domain statistics on the raw samples decide whether a clip (or a
+block of a long recording) is clearly background before any STFT or model run:
+- RMS level below the silence floor            -> ambient_quiet (SAIT class 25)
+- Low zero-crossing rate + broadband low band  -> wind_noise (SAIT class 26),
+  only up to a maximum level: loud low-frequency rumble (vehicles, engines,
+  explosions) always reaches the model
+- High crest factor (impulsive: shots, impacts) -> never gated
+
+Every decision is counted in Prometheus (atlas_audio_gate_decisions_total)
+and returned with the classification so thresholds can be tuned.
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from prometheus_client import Counter
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+AMBIENT_QUIET_CLASS = 25
+WIND_NOISE_CLASS = 26
+
+# Confidence reported for gated clips
+GATE_CONFIDENCE = 0.9
+
+# Low-band spectral flatness: FFT size, frames averaged, band edge
+FLATNESS_FFT_SIZE = 1024
+FLATNESS_MAX_FRAMES = 8
+FLATNESS_MAX_HZ = 1000.0
+
+GATE_DECISIONS = Counter(
+    "atlas_audio_gate_decisions_total",
+    "Audio gate decisions before inference",
+    ["decision"]
+)
+
+
+@dataclass
+class GateDecision:
+    """Gate outcome and the statistics it was based on"""
+    decision: str  # 'pass', 'ambient_quiet', 'wind_noise'
+    rms_dbfs: float
+    zero_cross_hz: float
+    crest_factor: float
+    low_band_flatness: Optional[float] = None
+
+    @property
+    def gated(self) -> bool:
+        return self.decision != "pass"
+
+    @property
+    def class_id(self) -> Optional[int]:
+        return {"ambient_quiet": AMBIENT_QUIET_CLASS, "wind_noise": WIND_NOISE_CLASS}.get(self.decision)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class AudioGate:
+    """Rule-based silence/wind gate (microseconds per clip)"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        silence_dbfs: float = -55.0,
+        wind_max_zero_cross_hz: float = 240.0,
+        wind_min_flatness: float = 0.03,
+        wind_max_dbfs: float = -30.0,
+        max_crest_factor: float = 12.0
+    ):
+        """
+        Args:
+            enabled: When False every clip passes
+            silence_dbfs: RMS level (dBFS) below which a clip is ambient_quiet
+            wind_max_zero_cross_hz: Zero crossings per second below which wind is considered
+            wind_min_flatness: Minimum 0-1kHz spectral flatness for wind (tonal engines stay below)
+            wind_max_dbfs: RMS level (dBFS) above which a clip is never gated as wind
+            max_crest_factor: Peak/RMS ratio above which a clip is never gated
+        """
+        self.enabled = enabled
+        self.silence_dbfs = silence_dbfs
+        self.wind_max_zero_cross_hz = wind_max_zero_cross_hz
+        self.wind_min_flatness = wind_min_flatness
+        self.wind_max_dbfs = wind_max_dbfs
+        self.max_crest_factor = max_crest_factor
+
+        self.stats = {"pass": 0, "ambient_quiet": 0, "wind_noise": 0}
+
+    def _low_band_flatness(self, samples: np.ndarray, sample_rate: int) -> float:
+        """Spectral flatness (geometric / arithmetic mean power) of the 0-1kHz band"""
+        n_frames = min(FLATNESS_MAX_FRAMES, len(samples) // FLATNESS_FFT_SIZE)
+        if n_frames == 0:
+            return 0.0
+
+        frames = samples[:n_frames * FLATNESS_FFT_SIZE].reshape(n_frames, FLATNESS_FFT_SIZE)
+        power = np.abs(np.fft.rfft(frames * np.hanning(FLATNESS_FFT_SIZE), axis=1)) ** 2
+        band_bins = max(2, int(FLATNESS_MAX_HZ * FLATNESS_FFT_SIZE / sample_rate))
+        band = power.mean(axis=0)[1:band_bins] + 1e-20
+        return float(np.exp(np.log(band).mean()) / band.mean())
+
+    def evaluate(self, samples: np.ndarray, sample_rate: int) -> GateDecision:
+        """
+        Decide whether a clip is clearly background
+
+        Args:
+            samples: Mono float samples in [-1, 1]
+            sample_rate: Sample rate of samples
+
+        Returns:
+            GateDecision (decision == 'pass' means run the model)
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if len(samples) < 2:
+            return GateDecision("pass", -120.0, 0.0, 0.0)
+
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+        peak = float(np.abs(samples).max())
+        rms_dbfs = float(20.0 * np.log10(max(rms, 1e-6)))
+        crest_factor = peak / max(rms, 1e-9)
+        crossings = np.count_nonzero(np.signbit(samples[1:]) != np.signbit(samples[:-1]))
+        zero_cross_hz = float(crossings * sample_rate / (2.0 * (len(samples) - 1)))
+
+        decision = GateDecision("pass", round(rms_dbfs, 2), round(zero_cross_hz, 1), round(crest_factor, 2))
+
+        if self.enabled and crest_factor <= self.max_crest_factor:
+            if rms_dbfs < self.silence_dbfs:
+                decision.decision = "ambient_quiet"
+            elif zero_cross_hz < self.wind_max_zero_cross_hz and rms_dbfs <= self.wind_max_dbfs:
+                flatness = self._low_band_flatness(samples, sample_rate)
+                decision.low_band_flatness = round(flatness, 4)
+                if flatness >= self.wind_min_flatness:
+                    decision.decision = "wind_noise"
+
+        self.stats[decision.decision] += 1
+        GATE_DECISIONS.labels(decision=decision.decision).inc()
+        return decision
+
+    def get_stats(self) -> Dict:
+        total = sum(self.stats.values())
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "gated_ratio": (total - self.stats["pass"]) / total if total else 0.0
+        }
+
+
+# Singleton instance
+_audio_gate: Optional[AudioGate] = None
+
+
+def get_audio_gate() -> AudioGate:
+    """Get or create audio gate singleton"""
+    global _audio_gate
+
+    if _audio_gate is None:
+        _audio_gate = AudioGate(
+            enabled=settings.AUDIO_GATE_ENABLED,
+            silence_dbfs=settings.AUDIO_GATE_SILENCE_DBFS,
+            wind_max_zero_cross_hz=settings.AUDIO_GATE_WIND_MAX_ZERO_CROSS_HZ,
+            wind_min_flatness=settings.AUDIO_GATE_WIND_MIN_FLATNESS,
+            wind_max_dbfs=settings.AUDIO_GATE_WIND_MAX_DBFS,
+            max_crest_factor=settings.AUDIO_GATE_MAX_CREST_FACTOR
+        )
+
+    return _audio_gate
@@ -0,0 +1,199 @@
+"""
+Audio Model Compiler
+Fused, INT8-quantized TorchScript build of AudioClassifierModel for CPU serving
+
+Build steps (once per weights hash, cached on disk):
+1. Fold each BatchNorm1d into the preceding Linear layer (eval-mode statistics)
+2. Dynamic INT8 quantization of the Linear layers
+3. TorchScript trace
+4. Parity check against the eager model before the artifact is used
+
+Later startups with the same weights load the cached artifact directly. Only
+the most recently used artifacts are kept, and untrained weights (no weights
+file) are compiled in memory without caching.
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+logger = logging.getLogger(__name__)
+
+# Maximum allowed absolute difference in class probabilities vs the eager model
+PARITY_MAX_PROB_DIFF = 0.05
+
+ARTIFACT_PREFIX = "audio_classifier-"
+
+
+def fold_batchnorm(linear: nn.Linear, bn: nn.BatchNorm1d) -> nn.Linear:
+    """Return a Linear equivalent to bn(linear(x)) in eval mode"""
+    scale = bn.weight.detach() / torch.sqrt(bn.running_var.detach() + bn.eps)
+
+    fused = nn.Linear(linear.in_features, linear.out_features)
+    with torch.no_grad():
+        fused.weight.copy_(linear.weight.detach() * scale.unsqueeze(1))
+        fused.bias.copy_((linear.bias.detach() - bn.running_mean.detach()) * scale + bn.bias.detach())
+    return fused
+
+
+class FusedAudioClassifierModel(nn.Module):
+    """AudioClassifierModel with BatchNorm folded in and dropout removed (inference only)"""
+
+    def __init__(self, fc1: nn.Linear, fc2: nn.Linear, fc3: nn.Linear, fc4: nn.Linear):
+        super().__init__()
+        self.fc1 = fc1
+        self.fc2 = fc2
+        self.fc3 = fc3
+        self.fc4 = fc4
+
+    def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Returns (logits, 256-dim features)"""
+        x = F.relu(self.fc1(x))
+        x = F.relu(self.fc2(x))
+        features = F.relu(self.fc3(x))
+        return self.fc4(features), features
+
+
+def fuse_audio_model(model: nn.Module) -> FusedAudioClassifierModel:
+    """Fold BatchNorm layers of an AudioClassifierModel into its Linear layers"""
+    model = model.eval().cpu()
+    fc4 = nn.Linear(model.fc4.in_features, model.fc4.out_features)
+    fc4.load_state_dict(model.fc4.state_dict())
+
+    return FusedAudioClassifierModel(
+        fold_batchnorm(model.fc1, model.bn1),
+        fold_batchnorm(model.fc2, model.bn2),
+        fold_batchnorm(model.fc3, model.bn3),
+        fc4
+    ).eval()
+
+
+def weights_hash(model: nn.Module) -> str:
+    """SHA-256 over the model's state dict (names, shapes and values)"""
+    sha256 = hashlib.sha256()
+    for name, tensor in sorted(model.state_dict().items()):
+        tensor = tensor.detach().cpu().contiguous()
+        sha256.update(name.encode())
+        sha256.update(str(tuple(tensor.shape)).encode())
+        sha256.update(tensor.numpy().tobytes())
+    return sha256.hexdigest()
+
+
+def check_parity(
+    eager_model: nn.Module,
+    compiled_model: torch.jit.ScriptModule,
+    input_dim: int,
+    num_samples: int = 256
+) -> Dict:
+    """
+    Compare compiled vs eager outputs on standardized random features
+
+    Returns:
+        Parity report (max probability difference, top-1 agreement, passed flag)
+    """
+    generator = torch.Generator().manual_seed(0)
+    inputs = torch.randn(num_samples, input_dim, generator=generator)
+
+    with torch.no_grad():
+        eager_probs = F.softmax(eager_model.eval().cpu()(inputs), dim=1)
+        compiled_logits, _ = compiled_model(inputs)
+        compiled_probs = F.softmax(compiled_logits, dim=1)
+
+    max_diff = (eager_probs - compiled_probs).abs().max().item()
+    agreement = (eager_probs.argmax(dim=1) == compiled_probs.argmax(dim=1)).float().mean().item()
+
+    return {
+        "max_prob_diff": max_diff,
+        "top1_agreement": agreement,
+        "passed": max_diff <= PARITY_MAX_PROB_DIFF
+    }
+
+
+def prune_compiled_artifacts(cache_dir: Path, keep: int, pattern: str = f"{ARTIFACT_PREFIX}*.ts"):
+    """Delete all but the keep most recently used compiled artifacts matching pattern"""
+    artifacts = []
+    for path in Path(cache_dir).glob(pattern):
+        try:
+            artifacts.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue  # Pruned by another worker
+
+    for _, path in sorted(artifacts, reverse=True)[keep:]:
+        path.unlink(missing_ok=True)
+        logger.info(f"♻️ Removed old compiled artifact: {path.name}")
+
+
+def compile_audio_model(
+    model: nn.Module,
+    cache_dir: Optional[Path],
+    input_dim: int = 128,
+    keep: int = 3
+) -> Optional[torch.jit.ScriptModule]:
+    """
+    Get the fused INT8 TorchScript build of an AudioClassifierModel
+
+    Args:
+        model: Eager AudioClassifierModel (weights loaded)
+        cache_dir: Directory holding compiled artifacts (None = compile without caching)
+        input_dim: Feature dimension
+        keep: Compiled artifacts kept in cache_dir (most recently used first)
+
+    Returns:
+        Compiled module returning (logits, features), or None if compilation
+        is unavailable or fails the parity check (caller keeps the eager model)
+    """
+    engine = torch.backends.quantized.engine
+    if engine == "none":
+        logger.warning("No quantized engine available - serving eager audio model")
+        return None
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        cache_path = cache_dir / f"{ARTIFACT_PREFIX}{weights_hash(model)[:16]}-torch{torch.__version__}-{engine}.ts"
+
+    if cache_path is not None and cache_path.exists():
+        try:
+            compiled = torch.jit.load(str(cache_path), map_location="cpu")
+            os.utime(cache_path)  # Mark used so pruning keeps it
+            logger.info(f"✅ Loaded compiled audio model: {cache_path.name}")
+            return compiled
+        except Exception as e:
+            logger.warning(f"Compiled audio model cache unreadable, rebuilding: {e}")
+
+    try:
+        fused = fuse_audio_model(model)
+        quantized = torch.ao.quantization.quantize_dynamic(fused, {nn.Linear}, dtype=torch.qint8)
+
+        with torch.no_grad():
+            compiled = torch.jit.trace(quantized, torch.randn(8, input_dim))
+        compiled = torch.jit.freeze(compiled.eval()) if hasattr(torch.jit, "freeze") else compiled
+
+        parity = check_parity(model, compiled, input_dim)
+        if not parity["passed"]:
+            logger.warning(f"Compiled audio model failed parity check, serving eager model: {parity}")
+            return None
+
+        if cache_path is not None:
+            # Atomic write so concurrent workers never load a partial artifact
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".tmp{os.getpid()}")
+            torch.jit.save(compiled, str(tmp_path))
+            os.replace(tmp_path, cache_path)
+            prune_compiled_artifacts(cache_dir, keep)
+
+        logger.info(
+            f"✅ Compiled audio model (BN-folded, INT8 dynamic, TorchScript): "
+            f"max prob diff {parity['max_prob_diff']:.4f}, top-1 agreement {parity['top1_agreement']:.3f}"
+        )
+        return compiled
+
+    except Exception as e:
+        logger.warning(f"Audio model compilation failed, serving eager model: {e}")
+        return None
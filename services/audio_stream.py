@@ -0,0 +1,310 @@
+"""
+Live Audio Streams
+Incremental classification of continuous SAIT gateway audio (WebSocket /sait/stream)
+
+- Each stream keeps its own StreamingMelExtractor, so only the new samples of
+  a frame are transformed and a window is pooled every hop
+- Completed windows from all streams are coalesced by one WindowBatcher into
+  shared forward passes (many concurrent streams, one model run per batch)
+- Hop-sized blocks go through the audio gate first; silent or wind-only
+  stretches advance the stream clock without an STFT or model run
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from prometheus_client import Gauge, Histogram
+
+from config.settings import settings
+from services.audio_features import StreamingMelExtractor
+from services.audio_gate import get_audio_gate
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STREAMS = Gauge("atlas_sait_streams_active", "Open SAIT audio streams")
+STREAM_BATCH_SIZE = Histogram(
+    "atlas_sait_stream_batch_windows",
+    "Windows per shared stream forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+STREAM_WINDOW_LATENCY = Histogram(
+    "atlas_sait_stream_window_latency_seconds",
+    "Time from a window completing to its class probabilities",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+
+class WindowBatcher:
+    """Micro-batches windows (or other items) from concurrent callers into one model call"""
+
+    def __init__(
+        self,
+        predict: Callable[[Any], Any],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        collate: Callable[[List[Any]], Any] = np.stack
+    ):
+        """
+        Args:
+            predict: Collated batch -> per-item results, e.g. (N, n_mels) features ->
+                (N, num_classes) probabilities (blocking)
+            max_batch_size: Items per forward pass
+            max_wait_ms: How long the first queued item waits for others
+            collate: Builds the predict input from the queued items
+        """
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.collate = collate
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def submit(self, item) -> asyncio.Future:
+        """Queue one item for the next batch (future resolves to its result)"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future, time.perf_counter()))
+        return future
+
+    async def classify(self, features: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a stack of windows from one stream
+
+        Args:
+            features: (N, n_mels) window features
+
+        Returns:
+            (N, num_classes) probabilities
+        """
+        return np.stack(await asyncio.gather(*[self.submit(window) for window in features]))
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0 and self._queue.empty():
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), max(timeout, 0)))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [item for item in batch if not item[1].done()]  # Drop windows of closed streams
+            if not batch:
+                continue
+
+            STREAM_BATCH_SIZE.observe(len(batch))
+            try:
+                probs = await asyncio.to_thread(self.predict, self.collate([item[0] for item in batch]))
+            except Exception as e:
+                logger.error(f"Stream batch inference failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            finished = time.perf_counter()
+            for (_, future, queued), window_probs in zip(batch, probs):
+                STREAM_WINDOW_LATENCY.observe(finished - queued)
+                if not future.done():
+                    future.set_result(window_probs)
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+
+class AudioStream:
+    """Per-connection incremental classification state"""
+
+    def __init__(
+        self,
+        audio_classifier,
+        batcher: WindowBatcher,
+        device_id: str,
+        window_seconds: float = 2.0,
+        hop_seconds: float = 0.5,
+        min_confidence: float = 0.5
+    ):
+        """
+        Args:
+            audio_classifier: Loaded AudioClassifier
+            batcher: Shared window batcher
+            device_id: SAIT device/gateway streaming the audio
+            window_seconds: Analysis window length
+            hop_seconds: Step between windows (detection granularity)
+            min_confidence: Minimum confidence for a window to be reported
+        """
+        self.audio_classifier = audio_classifier
+        self.batcher = batcher
+        self.device_id = device_id
+        self.min_confidence = min_confidence
+
+        self.sample_rate = audio_classifier.sample_rate
+        self.streamer = StreamingMelExtractor(audio_classifier.feature_extractor, window_seconds, hop_seconds)
+        self.gate = get_audio_gate()
+        self.gate_block = max(1, int(hop_seconds * self.sample_rate))
+
+        self._pending = np.zeros(0, dtype=np.float32)  # Samples waiting for a full gate block
+        self._odd_byte = b""  # Half of an int16 sample split across frames
+
+        self.bytes_received = 0
+        self.windows_analyzed = 0
+        self.detections_sent = 0
+        self.gated_samples = 0
+
+    def _decode(self, data: bytes) -> np.ndarray:
+        """Little-endian int16 PCM -> float32 (frames may split a sample)"""
+        data = self._odd_byte + data
+        usable = len(data) - (len(data) % 2)
+        self._odd_byte = data[usable:]
+        return np.frombuffer(data[:usable], dtype='<i2').astype(np.float32) / 32768.0
+
+    def _analyse(self, block: np.ndarray) -> List[Tuple[float, float, np.ndarray]]:
+        if self.gate.evaluate(block, self.sample_rate).gated:
+            self.gated_samples += len(block)
+            return self.streamer.skip(len(block))
+        return self.streamer.push(block)
+
+    async def _classify(self, windows: List[Tuple[float, float, np.ndarray]]) -> List[Dict]:
+        if not windows:
+            return []
+
+        probs = await self.batcher.classify(np.stack([features for _, _, features in windows]))
+        self.windows_analyzed += len(windows)
+
+        detections = []
+        for (start, end, _), window_probs in zip(windows, probs):
+            top_class = int(window_probs.argmax())
+            detection = self.audio_classifier.window_detection(
+                start, end, top_class, float(window_probs[top_class]), self.min_confidence
+            )
+            if detection is not None:
+                detections.append(detection)
+
+        self.detections_sent += len(detections)
+        return detections
+
+    async def push(self, data: bytes) -> List[Dict]:
+        """
+        Feed a PCM frame and classify every window it completes
+
+        Args:
+            data: 16-bit little-endian mono PCM at the classifier sample rate
+
+        Returns:
+            Threat detections for completed windows (stream-relative seconds)
+        """
+        self.bytes_received += len(data)
+        samples = np.concatenate([self._pending, self._decode(data)])
+
+        windows = []
+        full = len(samples) - len(samples) % self.gate_block
+        for start in range(0, full, self.gate_block):
+            windows.extend(self._analyse(samples[start:start + self.gate_block]))
+        self._pending = samples[full:]
+
+        return await self._classify(windows)
+
+    async def finish(self) -> List[Dict]:
+        """End of stream: analyse the buffered tail and the last partial window"""
+        windows = self._analyse(self._pending) if len(self._pending) else []
+        self._pending = np.zeros(0, dtype=np.float32)
+        windows.extend(self.streamer.flush())
+        return await self._classify(windows)
+
+    def get_stats(self) -> Dict:
+        return {
+            'device_id': self.device_id,
+            'duration_seconds': round(self.streamer.duration_seconds, 3),
+            'bytes_received': self.bytes_received,
+            'windows_analyzed': self.windows_analyzed,
+            'detections': self.detections_sent,
+            'gated_seconds': round(self.gated_samples / self.sample_rate, 3)
+        }
+
+
+class AudioStreamHub:
+    """Admits streams up to a limit and shares one batcher per classifier version"""
+
+    def __init__(self, max_streams: int = 256):
+        self.max_streams = max_streams
+        self.active = 0
+        # id(classifier) -> (batcher, open streams); a reloaded classifier gets its own
+        # batcher while streams opened on the previous version drain
+        self._batchers: Dict[int, Tuple[WindowBatcher, int]] = {}
+
+    def _acquire_batcher(self, audio_classifier) -> WindowBatcher:
+        key = id(audio_classifier)
+        batcher, streams = self._batchers.get(key, (None, 0))
+        if batcher is None:
+            batcher = WindowBatcher(
+                audio_classifier._predict,
+                max_batch_size=settings.SAIT_STREAM_BATCH_SIZE,
+                max_wait_ms=settings.SAIT_STREAM_BATCH_WAIT_MS
+            )
+        self._batchers[key] = (batcher, streams + 1)
+        return batcher
+
+    def _release_batcher(self, audio_classifier):
+        key = id(audio_classifier)
+        batcher, streams = self._batchers[key]
+        if streams > 1:
+            self._batchers[key] = (batcher, streams - 1)
+        else:
+            # Last stream on this classifier: drop the reference so it can be freed
+            batcher.close()
+            del self._batchers[key]
+
+    def open(
+        self,
+        audio_classifier,
+        device_id: str,
+        window_seconds: Optional[float] = None,
+        hop_seconds: Optional[float] = None,
+        min_confidence: Optional[float] = None
+    ) -> Optional[AudioStream]:
+        """New stream, or None when the stream limit is reached"""
+        if self.active >= self.max_streams:
+            return None
+
+        self.active += 1
+        ACTIVE_STREAMS.set(self.active)
+        return AudioStream(
+            audio_classifier,
+            self._acquire_batcher(audio_classifier),
+            device_id,
+            window_seconds=window_seconds or settings.SAIT_STREAM_WINDOW_SEC,
+            hop_seconds=hop_seconds or settings.SAIT_STREAM_HOP_SEC,
+            min_confidence=settings.SAIT_STREAM_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        )
+
+    def close(self, stream: AudioStream):
+        self.active = max(0, self.active - 1)
+        ACTIVE_STREAMS.set(self.active)
+        self._release_batcher(stream.audio_classifier)
+        logger.info(f"SAIT stream closed: {stream.get_stats()}")
+
+
+# Singleton instance
+_stream_hub: Optional[AudioStreamHub] = None
+
+
+def get_stream_hub() -> AudioStreamHub:
+    """Get or create audio stream hub singleton"""
+    global _stream_hub
+
+    if _stream_hub is None:
+        _stream_hub = AudioStreamHub(max_streams=settings.SAIT_STREAM_MAX_CONNECTIONS)
+
+    return _stream_hub
@@ -0,0 +1,418 @@
+"""
+Edge Package Builder
+INT8 export of AudioClassifierModel for SAIT (nRF5340 / Cortex-M33) devices
+
+Quantization follows the TFLite/CMSIS-NN int8 scheme so the package runs on
+arm_fully_connected_s8 without conversion:
+- Activations: per-tensor asymmetric int8 (scale, zero point from calibration ranges)
+- Weights: per-output-channel symmetric int8 (zero point 0)
+- Bias: int32 at scale input_scale * weight_scale
+- Requantization: fixed-point multiplier + shift per output channel, ReLU fused
+  into the output clamp
+
+Formats:
+- int8:     flat little-endian binary (loaded from external flash at runtime; OTA default)
+- cmsis-nn: C header with const arrays (compiled into firmware images)
+
+Before a package is written, the integer pipeline is run bit-exactly in NumPy
+and must agree with the float model (EDGE_MIN_TOP1_AGREEMENT).
+
+Activation ranges and the agreement check use real SAIT features: a .npy of
+(N, 128) classifier inputs (AudioClassifier.extract_features_batch output for
+recorded clips), split into disjoint calibration and validation sets.
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from services.audio_model_compiler import fuse_audio_model, prune_compiled_artifacts, weights_hash
+
+logger = logging.getLogger(__name__)
+
+EDGE_FORMATS = ("int8", "cmsis-nn")
+
+# Minimum top-1 agreement between the int8 pipeline and the float model
+EDGE_MIN_TOP1_AGREEMENT = 0.95
+
+# Calibration / validation set sizes (standardized 128-dim features)
+CALIBRATION_SAMPLES = 512
+VALIDATION_SAMPLES = 1024
+MIN_FEATURE_SAMPLES = 128
+
+FLAT_MAGIC = b"SAITQ8\x00\x01"
+
+
+@dataclass
+class QuantizedLinear:
+    """One fully connected layer in CMSIS-NN int8 form"""
+    weights: np.ndarray  # int8 (out, in)
+    bias: np.ndarray  # int32 (out,)
+    output_multiplier: np.ndarray  # int32 (out,)
+    output_shift: np.ndarray  # int32 (out,)
+    input_scale: float
+    input_zero_point: int
+    output_scale: float
+    output_zero_point: int
+    relu: bool
+
+    @property
+    def in_features(self) -> int:
+        return self.weights.shape[1]
+
+    @property
+    def out_features(self) -> int:
+        return self.weights.shape[0]
+
+
+def quantize_multiplier(real_multiplier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split positive real multipliers into Q31 int32 multipliers and power-of-two shifts (TFLite QuantizeMultiplier)"""
+    mantissa, exponent = np.frexp(real_multiplier.astype(np.float64))
+    multiplier = np.round(mantissa * (1 << 31)).astype(np.int64)
+
+    overflow = multiplier == (1 << 31)
+    multiplier[overflow] //= 2
+    exponent[overflow] += 1
+
+    zero = real_multiplier == 0
+    multiplier[zero] = 0
+    exponent[zero] = 0
+    return multiplier.astype(np.int32), exponent.astype(np.int32)
+
+
+def _multiply_by_quantized_multiplier(acc: np.ndarray, multiplier: np.ndarray, shift: np.ndarray) -> np.ndarray:
+    """Bit-exact arm_nn_requantize / TFLite MultiplyByQuantizedMultiplier on int64 arrays"""
+    left_shift = np.maximum(shift, 0).astype(np.int64)
+    right_shift = np.maximum(-shift, 0).astype(np.int64)
+
+    value = acc.astype(np.int64) * (np.int64(1) << left_shift)
+
+    # SaturatingRoundingDoublingHighMul
+    product = value * multiplier.astype(np.int64)
+    nudge = np.where(product >= 0, np.int64(1 << 30), np.int64(1 - (1 << 30)))
+    total = product + nudge
+    high = np.where(total >= 0, total >> 31, -((-total) >> 31))
+
+    # RoundingDivideByPOT
+    mask = (np.int64(1) << right_shift) - 1
+    remainder = high & mask
+    threshold = (mask >> 1) + (high < 0)
+    return (high >> right_shift) + (remainder > threshold)
+
+
+def _activation_qparams(min_value: float, max_value: float) -> Tuple[float, int]:
+    """Asymmetric int8 scale/zero point covering [min, max] (and 0)"""
+    min_value, max_value = min(min_value, 0.0), max(max_value, 0.0)
+    scale = max((max_value - min_value) / 255.0, 1e-8)
+    zero_point = int(np.clip(np.round(-128 - min_value / scale), -128, 127))
+    return float(scale), zero_point
+
+
+def quantize_input(features: np.ndarray, layer: QuantizedLinear) -> np.ndarray:
+    """Float features -> int8 model input"""
+    q = np.round(features / layer.input_scale) + layer.input_zero_point
+    return np.clip(q, -128, 127).astype(np.int8)
+
+
+def run_int8(layers: List[QuantizedLinear], x_q: np.ndarray) -> np.ndarray:
+    """Integer inference exactly as arm_fully_connected_s8 computes it; returns int8 logits"""
+    activations = x_q.astype(np.int64)
+    for layer in layers:
+        acc = (activations - layer.input_zero_point) @ layer.weights.T.astype(np.int64) + layer.bias
+        out = _multiply_by_quantized_multiplier(acc, layer.output_multiplier, layer.output_shift)
+        out += layer.output_zero_point
+        low = layer.output_zero_point if layer.relu else -128
+        activations = np.clip(out, low, 127)
+    return activations.astype(np.int8)
+
+
+def default_calibration_features(num_samples: int, input_dim: int, seed: int) -> np.ndarray:
+    """Synthetic standardized features (the classifier input is z-scored per clip) - dev fallback only"""
+    rng = np.random.default_rng(seed)
+    features = rng.standard_normal((num_samples, input_dim)).astype(np.float32)
+    return (features - features.mean(axis=1, keepdims=True)) / (features.std(axis=1, keepdims=True) + 1e-8)
+
+
+def load_sait_features(path: Path, input_dim: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Disjoint (calibration, validation) sets from stored SAIT features
+
+    Args:
+        path: .npy of (N, input_dim) classifier input features
+        input_dim: Feature dimension the model expects
+
+    Returns:
+        (calibration, validation) float32 arrays, or None if the file is missing or unusable
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        features = np.load(path, mmap_mode="r")
+    except Exception as e:
+        logger.error(f"❌ SAIT calibration features unreadable ({path}): {e}")
+        return None
+
+    if features.ndim != 2 or features.shape[1] != input_dim or len(features) < MIN_FEATURE_SAMPLES:
+        logger.error(
+            f"❌ SAIT calibration features {path} have shape {features.shape}, "
+            f"expected (N >= {MIN_FEATURE_SAMPLES}, {input_dim})"
+        )
+        return None
+
+    order = np.random.default_rng(0).permutation(len(features))
+    num_calibration = min(CALIBRATION_SAMPLES, len(features) // 2)
+    num_validation = min(VALIDATION_SAMPLES, len(features) - num_calibration)
+    calibration = np.asarray(features[np.sort(order[:num_calibration])], dtype=np.float32)
+    validation = np.asarray(features[np.sort(order[num_calibration:num_calibration + num_validation])], dtype=np.float32)
+
+    if not (np.isfinite(calibration).all() and np.isfinite(validation).all()):
+        logger.error(f"❌ SAIT calibration features {path} contain NaN/inf")
+        return None
+    return calibration, validation
+
+
+def quantize_audio_model(model: nn.Module, calibration_features: np.ndarray) -> List[QuantizedLinear]:
+    """
+    Post-training int8 quantization of AudioClassifierModel
+
+    Args:
+        model: Eager AudioClassifierModel (weights loaded)
+        calibration_features: (N, input_dim) float features used for activation ranges
+
+    Returns:
+        fc1..fc4 as CMSIS-NN int8 layers (BatchNorm folded)
+    """
+    fused = fuse_audio_model(copy.deepcopy(model))
+    linears = [fused.fc1, fused.fc2, fused.fc3, fused.fc4]
+
+    # Activation ranges from the float (BN-folded) network
+    ranges = []
+    with torch.no_grad():
+        x = torch.from_numpy(np.asarray(calibration_features, dtype=np.float32))
+        ranges.append((x.min().item(), x.max().item()))
+        for index, linear in enumerate(linears):
+            x = linear(x)
+            if index < len(linears) - 1:
+                x = torch.relu(x)
+            ranges.append((x.min().item(), x.max().item()))
+
+    qparams = [_activation_qparams(low, high) for low, high in ranges]
+
+    layers = []
+    for index, linear in enumerate(linears):
+        weight = linear.weight.detach().numpy().astype(np.float64)
+        bias = linear.bias.detach().numpy().astype(np.float64)
+        input_scale, input_zero_point = qparams[index]
+        output_scale, output_zero_point = qparams[index + 1]
+
+        weight_scale = np.maximum(np.abs(weight).max(axis=1), 1e-12) / 127.0
+        weights_q = np.clip(np.round(weight / weight_scale[:, None]), -127, 127).astype(np.int8)
+        bias_q = np.round(bias / (input_scale * weight_scale)).astype(np.int32)
+        multiplier, shift = quantize_multiplier(input_scale * weight_scale / output_scale)
+
+        layers.append(QuantizedLinear(
+            weights=weights_q,
+            bias=bias_q,
+            output_multiplier=multiplier,
+            output_shift=shift,
+            input_scale=input_scale,
+            input_zero_point=input_zero_point,
+            output_scale=output_scale,
+            output_zero_point=output_zero_point,
+            relu=index < len(linears) - 1
+        ))
+
+    return layers
+
+
+def check_agreement(model: nn.Module, layers: List[QuantizedLinear], features: np.ndarray) -> Dict:
+    """
+    Compare the int8 pipeline against the float model
+
+    Returns:
+        Agreement report (top-1 agreement, max logit error, passed flag)
+    """
+    with torch.no_grad():
+        float_logits = model.eval().cpu()(torch.from_numpy(features)).numpy()
+
+    logits_q = run_int8(layers, quantize_input(features, layers[0])).astype(np.float32)
+    int8_logits = (logits_q - layers[-1].output_zero_point) * layers[-1].output_scale
+
+    agreement = float((float_logits.argmax(axis=1) == int8_logits.argmax(axis=1)).mean())
+    return {
+        "top1_agreement": agreement,
+        "max_logit_error": float(np.abs(float_logits - int8_logits).max()),
+        "passed": agreement >= EDGE_MIN_TOP1_AGREEMENT
+    }
+
+
+def _c_array(ctype: str, name: str, values: np.ndarray, per_line: int = 16) -> str:
+    flat = values.reshape(-1).tolist()
+    lines = [
+        "    " + ", ".join(str(v) for v in flat[i:i + per_line]) + ","
+        for i in range(0, len(flat), per_line)
+    ]
+    return f"static const {ctype} {name}[{len(flat)}] = {{\n" + "\n".join(lines) + "\n};\n"
+
+
+def render_cmsis_header(layers: List[QuantizedLinear], model_id: str) -> str:
+    """C header with CMSIS-NN int8 weights, biases and requantization parameters"""
+    parts = [
+        "/*",
+        " * SAIT audio classifier - int8 CMSIS-NN package (generated, do not edit)",
+        f" * Model: {model_id}",
+        " * Layers run with arm_fully_connected_s8; input_offset = -input_zero_point,",
+        " * output_offset = output_zero_point, per-channel multiplier/shift.",
+        " */",
+        "#ifndef SAIT_MODEL_INT8_H",
+        "#define SAIT_MODEL_INT8_H",
+        "",
+        "#include <stdint.h>",
+        "",
+        f"#define SAIT_MODEL_ID \"{model_id}\"",
+        f"#define SAIT_NUM_LAYERS {len(layers)}",
+        f"#define SAIT_INPUT_DIM {layers[0].in_features}",
+        f"#define SAIT_NUM_CLASSES {layers[-1].out_features}",
+        f"#define SAIT_INPUT_SCALE {layers[0].input_scale:.9e}f",
+        f"#define SAIT_INPUT_ZERO_POINT ({layers[0].input_zero_point})",
+        f"#define SAIT_OUTPUT_SCALE {layers[-1].output_scale:.9e}f",
+        f"#define SAIT_OUTPUT_ZERO_POINT ({layers[-1].output_zero_point})",
+        ""
+    ]
+
+    for index, layer in enumerate(layers, start=1):
+        prefix = f"sait_fc{index}"
+        parts += [
+            f"#define SAIT_FC{index}_IN {layer.in_features}",
+            f"#define SAIT_FC{index}_OUT {layer.out_features}",
+            f"#define SAIT_FC{index}_INPUT_OFFSET ({-layer.input_zero_point})",
+            f"#define SAIT_FC{index}_OUTPUT_OFFSET ({layer.output_zero_point})",
+            f"#define SAIT_FC{index}_ACT_MIN ({layer.output_zero_point if layer.relu else -128})",
+            f"#define SAIT_FC{index}_ACT_MAX (127)",
+            "",
+            _c_array("int8_t", f"{prefix}_weights", layer.weights),
+            _c_array("int32_t", f"{prefix}_bias", layer.bias, per_line=8),
+            _c_array("int32_t", f"{prefix}_output_mult", layer.output_multiplier, per_line=8),
+            _c_array("int32_t", f"{prefix}_output_shift", layer.output_shift),
+        ]
+
+    parts += ["#endif /* SAIT_MODEL_INT8_H */", ""]
+    return "\n".join(parts)
+
+
+def render_flat_package(layers: List[QuantizedLinear]) -> bytes:
+    """
+    Flat little-endian binary package
+
+    Layout: magic (8) | u32 num_layers | per layer:
+        u32 in, u32 out, f32 input_scale, i32 input_zp, f32 output_scale,
+        i32 output_zp, u32 relu | int8 weights[out*in] | int32 bias[out]
+        | int32 mult[out] | int32 shift[out]
+    """
+    chunks = [FLAT_MAGIC, struct.pack("<I", len(layers))]
+    for layer in layers:
+        chunks.append(struct.pack(
+            "<IIfifiI",
+            layer.in_features,
+            layer.out_features,
+            layer.input_scale,
+            layer.input_zero_point,
+            layer.output_scale,
+            layer.output_zero_point,
+            int(layer.relu)
+        ))
+        chunks.append(layer.weights.astype("<i1").tobytes())
+        for array in (layer.bias, layer.output_multiplier, layer.output_shift):
+            chunks.append(array.astype("<i4").tobytes())
+    return b"".join(chunks)
+
+
+def build_edge_package(
+    model: nn.Module,
+    target_format: str,
+    cache_dir: Path,
+    features_path: Optional[Path] = None,
+    require_features: bool = False,
+    keep: int = 3
+) -> Optional[Path]:
+    """
+    Build (or reuse) the int8 edge package for a model
+
+    Args:
+        model: Eager AudioClassifierModel (weights loaded)
+        target_format: 'int8' or 'cmsis-nn'
+        cache_dir: Directory holding built packages (the keep most recently
+            used per format are kept)
+        features_path: .npy of real SAIT features for calibration and validation
+        require_features: Refuse to build without them (otherwise synthetic
+            features are used, with a warning)
+
+    Returns:
+        Path of the package, or None if the features are required but missing,
+        or quantization fails the agreement check
+    """
+    if target_format not in EDGE_FORMATS:
+        raise ValueError(f"Unsupported edge format: {target_format}")
+
+    input_dim = model.fc1.in_features
+    features = load_sait_features(features_path, input_dim) if features_path else None
+    if features is not None:
+        calibration_features, validation_features = features
+        features_id = hashlib.sha256(calibration_features.tobytes() + validation_features.tobytes()).hexdigest()[:8]
+    elif require_features:
+        logger.error(
+            f"❌ No usable SAIT calibration features ({features_path or 'EDGE_CALIBRATION_FEATURES_PATH unset'}) "
+            f"- not building the {target_format} edge package"
+        )
+        return None
+    else:
+        logger.warning(
+            f"⚠️ No SAIT calibration features ({features_path or 'EDGE_CALIBRATION_FEATURES_PATH unset'}): "
+            f"calibrating the {target_format} edge package on synthetic noise. Int8 ranges and the "
+            f"agreement check will not reflect real audio - do not ship this package to devices"
+        )
+        calibration_features = default_calibration_features(CALIBRATION_SAMPLES, input_dim, seed=0)
+        validation_features = default_calibration_features(VALIDATION_SAMPLES, input_dim, seed=1)
+        features_id = "synthetic"
+
+    model_id = weights_hash(model)[:16]
+    suffix = "h" if target_format == "cmsis-nn" else "bin"
+    cache_path = Path(cache_dir) / f"sait_edge-{model_id}-{features_id}-{target_format}.{suffix}"
+    if cache_path.exists():
+        os.utime(cache_path)  # Most recently used survives pruning
+        return cache_path
+
+    layers = quantize_audio_model(model, calibration_features)
+    report = check_agreement(model, layers, validation_features)
+    if not report["passed"]:
+        logger.warning(f"INT8 edge package failed agreement check, not publishing: {report}")
+        return None
+
+    if target_format == "cmsis-nn":
+        payload = render_cmsis_header(layers, model_id).encode()
+    else:
+        payload = render_flat_package(layers)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".tmp{os.getpid()}")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, cache_path)
+    prune_compiled_artifacts(cache_dir, keep, pattern=f"sait_edge-*-{target_format}.{suffix}")
+
+    flash_kb = sum(layer.weights.size + 12 * layer.out_features for layer in layers) / 1024
+    logger.info(
+        f"✅ Built {target_format} edge package: {flash_kb:.0f} KB weights, "
+        f"top-1 agreement {report['top1_agreement']:.3f}, max logit error {report['max_logit_error']:.3f}"
+    )
+    return cache_path
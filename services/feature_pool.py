@@ -0,0 +1,207 @@
+"""
+Feature Extraction Pool
+Process pool for CPU-bound audio feature extraction (resample + log-mel)
+
+Keeps the event loop responsive and spreads extraction across cores:
+- Workers are spawned processes (no forked torch/CUDA state) that build the
+  mel filterbank once in their initializer
+- PCM is passed through one SharedMemory block per request (clips in, features
+  out); only the block name and clip lengths are pickled
+- Pool size, in-flight tasks, queue wait and per-task timings are exported
+  as Prometheus metrics
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+import numpy as np
+from prometheus_client import Gauge, Histogram
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+POOL_WORKERS = Gauge("atlas_feature_pool_workers", "Feature extraction worker processes")
+POOL_INFLIGHT = Gauge("atlas_feature_pool_inflight_tasks", "Feature extraction tasks submitted and not finished")
+POOL_QUEUE_WAIT = Histogram(
+    "atlas_feature_pool_queue_wait_seconds",
+    "Time a feature extraction task waited for a worker",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+POOL_TASK_SECONDS = Histogram(
+    "atlas_feature_pool_task_seconds",
+    "Feature extraction time inside a worker",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+# Per-worker extractor (built by the pool initializer)
+_worker_extractor = None
+
+
+def _attach_shared_memory(name: str) -> SharedMemory:
+    """Attach to a parent-owned block (the parent unlinks it)"""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers share the parent's resource tracker,
+        # so the registration made by attaching is a duplicate of the parent's
+        return SharedMemory(name=name)
+
+
+def _init_worker(sample_rate: int, n_fft: int, hop_length: int, n_mels: int):
+    global _worker_extractor
+    from services.audio_features import get_mel_extractor
+    _worker_extractor = get_mel_extractor(sample_rate, n_fft, hop_length, n_mels)
+
+
+def _extract_worker(shm_name: str, lengths: List[int], orig_sr: int) -> Tuple[float, float]:
+    """
+    Extract features for clips packed in a shared memory block
+
+    Block layout: float32 clips back to back, then (len(lengths), n_mels) float32 features.
+
+    Returns:
+        (start wall time, extraction seconds)
+    """
+    started = time.time()
+    extractor = _worker_extractor
+
+    shm = _attach_shared_memory(shm_name)
+    try:
+        total = sum(lengths)
+        samples = np.ndarray((total,), dtype=np.float32, buffer=shm.buf)
+        output = np.ndarray((len(lengths), extractor.n_mels), dtype=np.float32, buffer=shm.buf, offset=total * 4)
+
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        clips = [samples[offsets[i]:offsets[i + 1]] for i in range(len(lengths))]
+        if orig_sr != extractor.sample_rate:
+            import librosa
+            clips = [librosa.resample(clip, orig_sr=orig_sr, target_sr=extractor.sample_rate) for clip in clips]
+
+        output[:] = extractor.extract_many(clips)
+
+        # Release buffer exports before closing the mapping
+        del samples, output, clips
+    finally:
+        shm.close()
+
+    return started, time.time() - started
+
+
+class FeatureExtractionPool:
+    """Process pool running MelFeatureExtractor on shared-memory PCM"""
+
+    def __init__(
+        self,
+        max_workers: int,
+        sample_rate: int = 16000,
+        n_fft: int = 2048,
+        hop_length: int = 512,
+        n_mels: int = 128
+    ):
+        self.max_workers = max_workers
+        self.sample_rate = sample_rate
+        self.n_mels = n_mels
+        self._extractor_args = (sample_rate, n_fft, hop_length, n_mels)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=self._extractor_args
+            )
+            POOL_WORKERS.set(self.max_workers)
+            logger.info(f"✅ Feature extraction pool started ({self.max_workers} workers)")
+        return self._executor
+
+    async def extract(self, audio_clips: List[np.ndarray], sample_rate: int) -> np.ndarray:
+        """
+        Features for clips of any lengths, computed in a worker process
+
+        Args:
+            audio_clips: Mono float samples
+            sample_rate: Sample rate shared by all clips (resampled in the worker)
+
+        Returns:
+            (len(audio_clips), n_mels) float32 features in input order
+        """
+        lengths = [len(clip) for clip in audio_clips]
+        total = sum(lengths)
+
+        shm = SharedMemory(create=True, size=max(1, (total + len(lengths) * self.n_mels) * 4))
+        try:
+            samples = np.ndarray((total,), dtype=np.float32, buffer=shm.buf)
+            offset = 0
+            for clip in audio_clips:
+                samples[offset:offset + len(clip)] = clip
+                offset += len(clip)
+            del samples
+
+            submitted = time.time()
+            POOL_INFLIGHT.inc()
+            try:
+                started, duration = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, _extract_worker, shm.name, lengths, sample_rate
+                )
+            except BrokenProcessPool:
+                self._executor = None  # Recreated on next use
+                raise
+            finally:
+                POOL_INFLIGHT.dec()
+
+            POOL_QUEUE_WAIT.observe(max(0.0, started - submitted))
+            POOL_TASK_SECONDS.observe(duration)
+
+            output = np.ndarray((len(lengths), self.n_mels), dtype=np.float32, buffer=shm.buf, offset=total * 4)
+            features = output.copy()
+            del output
+            return features
+
+        finally:
+            shm.close()
+            shm.unlink()
+
+    async def warm_up(self):
+        """Spawn every worker (interpreter start + filterbank) before the first request"""
+        silence = np.zeros(self.sample_rate, dtype=np.float32)
+        await asyncio.gather(*[self.extract([silence], self.sample_rate) for _ in range(self.max_workers)])
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            POOL_WORKERS.set(0)
+
+
+# Singleton instance
+_feature_pool: Optional[FeatureExtractionPool] = None
+
+
+def get_feature_pool() -> Optional[FeatureExtractionPool]:
+    """Get or create feature extraction pool singleton (None when disabled)"""
+    global _feature_pool
+
+    if _feature_pool is None and settings.FEATURE_POOL_ENABLED:
+        workers = settings.FEATURE_POOL_WORKERS or max(1, (os.cpu_count() or 2) - 1)
+        _feature_pool = FeatureExtractionPool(max_workers=workers)
+
+    return _feature_pool
+
+
+def shutdown_feature_pool():
+    """Stop worker processes (application shutdown)"""
+    global _feature_pool
+    if _feature_pool is not None:
+        _feature_pool.shutdown()
+        _feature_pool = None
@@ -0,0 +1,355 @@
+"""
+Inference Client
+API-worker side of the dedicated inference server (INFERENCE_SERVER_ENABLED)
+
+- InferenceClient: one Unix socket connection per API worker, multiplexed by
+  request id, with the worker's TensorRing for request/response tensors
+- RemoteAudioClassifier / RemoteVisualDetector: drop-in model services whose
+  forward passes (_predict, _embed, _detect) run in the inference server;
+  feature extraction, gating, image decoding and result building stay local
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import os
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from services.audio_classifier import AudioClassifier
+from services.inference_ipc import TensorRing, pack_tensor, recv_frame, send_frame, unpack_tensor
+from services.visual_detector import VisualDetector
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceServerError(Exception):
+    """The inference server is unreachable or rejected a request"""
+
+    def __init__(self, message: str, status: Optional[str] = None):
+        self.status = status
+        super().__init__(message)
+
+
+class InferenceClient:
+    """Thread-safe connection to the inference server (usable from threads and event loops)"""
+
+    def __init__(self, socket_path: str, ring_slots: int = 8, slot_bytes: int = 4 * 1024 * 1024, timeout: float = 30.0):
+        """
+        Args:
+            socket_path: Inference server Unix socket
+            ring_slots: Shared-memory tensor slots (concurrent requests without inline copies)
+            slot_bytes: Capacity of each slot
+            timeout: Seconds to wait for a response
+        """
+        self.socket_path = socket_path
+        self.ring_slots = ring_slots
+        self.slot_bytes = slot_bytes
+        self.timeout = timeout
+
+        self.models: Dict[str, Dict] = {}
+        self._sock: Optional[socket.socket] = None
+        self._ring: Optional[TensorRing] = None
+        self._pending: Dict[int, Tuple[concurrent.futures.Future, Optional[int]]] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def _connect(self):
+        with self._connect_lock:
+            if self._sock is not None:
+                return
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                ring = TensorRing(self.ring_slots, self.slot_bytes)
+            except OSError as e:
+                sock.close()
+                raise InferenceServerError(f"Inference server unavailable at {self.socket_path}: {e}")
+
+            try:
+                send_frame(sock, {
+                    "op": "hello",
+                    "id": 0,
+                    "pid": os.getpid(),
+                    "ring": ring.name,
+                    "slots": ring.slots,
+                    "slot_bytes": ring.slot_bytes
+                })
+                header, _ = recv_frame(sock)
+            except (OSError, ConnectionError) as e:
+                sock.close()
+                ring.close()
+                raise InferenceServerError(f"Inference server handshake failed: {e}")
+
+            sock.settimeout(None)
+            self.models = header.get("models", {})
+            self._sock, self._ring = sock, ring
+            threading.Thread(target=self._read_responses, args=(sock, ring), name="inference-client", daemon=True).start()
+            logger.info(f"✅ Connected to inference server ({self.socket_path})")
+
+    def _read_responses(self, sock: socket.socket, ring: TensorRing):
+        """Resolve pending requests as responses arrive (one thread per connection)"""
+        error = None
+        try:
+            while True:
+                header, payload = recv_frame(sock)
+                future, slot = self._pending.pop(header.get("id"), (None, None))
+                try:
+                    if not header.get("ok"):
+                        result = InferenceServerError(header.get("error", "Inference failed"), header.get("status"))
+                    elif "dtype" in header:
+                        result = (header, unpack_tensor(ring, header, payload, copy=True))
+                    else:
+                        result = (header, None)
+                finally:
+                    if slot is not None:
+                        ring.release(slot)
+
+                if future is not None and not future.done():
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        except (OSError, ConnectionError, ValueError) as e:
+            error = e
+        finally:
+            self._disconnect(sock, ring, error)
+
+    def _disconnect(self, sock: socket.socket, ring: TensorRing, error: Optional[Exception]):
+        with self._connect_lock:
+            if self._sock is sock:
+                self._sock, self._ring = None, None
+            pending, self._pending = self._pending, {}
+        sock.close()
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(InferenceServerError(f"Inference server connection lost: {error}"))
+        ring.close()
+        if error is not None:
+            logger.warning(f"⚠️ Inference server connection lost: {error}")
+
+    def submit(self, op: str, array: Optional[np.ndarray] = None, **fields) -> concurrent.futures.Future:
+        """Send a request; the future resolves to (response header, response tensor or None)"""
+        if self._sock is None:
+            self._connect()
+        sock, ring = self._sock, self._ring
+        if sock is None:
+            raise InferenceServerError("Inference server connection lost")
+
+        request_id = next(self._ids)
+        header = {"op": op, "id": request_id, **fields}
+        payload, slot = b"", None
+        if array is not None:
+            tensor_fields, payload = pack_tensor(ring, array)
+            header.update(tensor_fields)
+            slot = tensor_fields.get("slot")
+
+        future = concurrent.futures.Future()
+        self._pending[request_id] = (future, slot)
+        try:
+            with self._send_lock:
+                send_frame(sock, header, payload)
+        except OSError as e:
+            self._pending.pop(request_id, None)
+            if slot is not None:
+                ring.release(slot)
+            raise InferenceServerError(f"Inference request failed: {e}")
+        return future
+
+    def call(self, op: str, array: Optional[np.ndarray] = None, **fields):
+        """Blocking request (worker threads)"""
+        try:
+            return self.submit(op, array, **fields).result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            raise InferenceServerError(f"Inference server did not answer {op} within {self.timeout}s")
+
+    async def acall(self, op: str, array: Optional[np.ndarray] = None, **fields):
+        """Request from an event loop"""
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self.submit(op, array, **fields)), self.timeout)
+        except asyncio.TimeoutError:
+            raise InferenceServerError(f"Inference server did not answer {op} within {self.timeout}s")
+
+    async def model_info(self, name: str) -> Dict:
+        """Current state of a served model"""
+        header, _ = await self.acall("info")
+        self.models = header["models"]
+        return self.models.get(name, {"status": "unloaded"})
+
+    def close(self):
+        """Drop the connection and unlink the tensor ring"""
+        with self._connect_lock:
+            sock, ring = self._sock, self._ring
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._disconnect(sock, ring, None)
+
+
+class RemoteAudioClassifier(AudioClassifier):
+    """AudioClassifier whose forward passes run in the inference server"""
+
+    def __init__(self, client: InferenceClient):
+        super().__init__(model_path=None)
+        self.client = client
+        self._cache_version = "remote"
+
+    async def load_model(self):
+        """Mirror the served model (no local weights); raises if it isn't ready"""
+        try:
+            info = await self.client.model_info("audio_classifier")
+            if info["status"] != "ready" or not info.get("loaded"):
+                raise InferenceServerError(f"audio_classifier is {info['status']} in the inference server")
+            self.model_path = info.get("model_path")
+            self.weights_id = info.get("weights_id")
+            self._cache_version = info["cache_version"]
+            self.loaded = True
+            logger.info(f"✅ Audio classifier served by inference server ({self._cache_version})")
+        except InferenceServerError as e:
+            logger.error(f"Failed to attach remote audio classifier: {e}")
+            self.loaded = False
+            raise
+
+    # Blocking variants: worker threads only (warm-up, timeline mode)
+    def _predict(self, features: np.ndarray) -> np.ndarray:
+        _, probs = self.client.call("predict", np.asarray(features, dtype=np.float32))
+        return probs
+
+    def _embed(self, features: np.ndarray) -> np.ndarray:
+        _, embeddings = self.client.call("embed", np.asarray(features, dtype=np.float32))
+        return embeddings
+
+    # Event-loop variants: the worker keeps serving while the server batches
+    async def _predict_async(self, features: np.ndarray) -> np.ndarray:
+        _, probs = await self.client.acall("predict", np.asarray(features, dtype=np.float32))
+        return probs
+
+    async def _embed_async(self, features: np.ndarray) -> np.ndarray:
+        _, embeddings = await self.client.acall("embed", np.asarray(features, dtype=np.float32))
+        return embeddings
+
+    @property
+    def cache_version(self) -> str:
+        return self._cache_version
+
+    async def get_ota_model_package(self, target_format: str = 'int8'):
+        # Edge packages are built from the eager weights; load them here on demand
+        if self.model is None and self.model_path:
+            self.model = await asyncio.to_thread(self._load_weights)
+        return await super().get_ota_model_package(target_format)
+
+
+class RemoteVisualDetector(VisualDetector):
+    """VisualDetector whose YOLO runs in the inference server"""
+
+    def __init__(self, client: InferenceClient):
+        super().__init__()
+        self.client = client
+        self._cache_version = "mock-detector"
+
+    async def initialize(self, version: str = "latest", force_download: bool = False):
+        """Mirror the served model (no local weights); raises if it isn't ready"""
+        try:
+            info = await self.client.model_info("visual_detector")
+            if info["status"] != "ready" or not info.get("loaded"):
+                raise InferenceServerError(f"visual_detector is {info['status']} in the inference server")
+            self.model_path = info.get("model_path")
+            self.device = info.get("device", "cpu")
+            self._cache_version = info["cache_version"]
+            self.loaded = True
+            logger.info(f"✅ Visual detector served by inference server ({self._cache_version})")
+            return True
+        except InferenceServerError as e:
+            logger.error(f"Failed to attach remote visual detector: {e}")
+            self.loaded = False
+            raise
+
+    def warm_up(self):
+        """Warmed up in the inference server"""
+
+    def _detect_objects(self, images: List[np.ndarray]) -> List[List[Dict]]:
+        """Blocking (worker threads only); detect() goes through the async _detect"""
+        futures = [self.client.submit("detect", image) for image in images]
+        return [future.result(timeout=self.client.timeout)[0]["result"] for future in futures]
+
+    async def _detect(self, image: np.ndarray) -> List[Dict]:
+        header, _ = await self.client.acall("detect", image)
+        return header["result"]
+
+    @property
+    def cache_version(self) -> str:
+        return self._cache_version
+
+
+# Singleton instance
+_inference_client: Optional[InferenceClient] = None
+
+
+def get_inference_client() -> InferenceClient:
+    """Get or create inference client singleton"""
+    global _inference_client
+
+    if _inference_client is None:
+        _inference_client = InferenceClient(
+            settings.INFERENCE_SERVER_SOCKET,
+            ring_slots=settings.INFERENCE_RING_SLOTS,
+            slot_bytes=int(settings.INFERENCE_RING_SLOT_MB * 1024 * 1024),
+            timeout=settings.INFERENCE_TIMEOUT_SEC
+        )
+
+    return _inference_client
+
+
+def close_inference_client():
+    """Close the inference server connection (application shutdown)"""
+    global _inference_client
+    if _inference_client is not None:
+        _inference_client.close()
+        _inference_client = None
+
+
+async def _reload_remote(name: str, version: str, force_download: bool):
+    header, _ = await get_inference_client().acall(
+        "reload", model=name, version=version, force_download=force_download
+    )
+    get_inference_client().models = header["models"]
+
+
+async def connect_remote_audio_classifier() -> RemoteAudioClassifier:
+    """Audio classifier proxy for the served model"""
+    classifier = RemoteAudioClassifier(get_inference_client())
+    await classifier.load_model()
+    return classifier
+
+
+async def create_remote_audio_classifier(version: str = "latest", force_download: bool = False) -> RemoteAudioClassifier:
+    """Reload the served audio classifier, then attach a new proxy to it"""
+    await _reload_remote("audio_classifier", version, force_download)
+    return await connect_remote_audio_classifier()
+
+
+async def connect_remote_visual_detector() -> RemoteVisualDetector:
+    """Visual detector proxy for the served model"""
+    detector = RemoteVisualDetector(get_inference_client())
+    await detector.initialize()
+    return detector
+
+
+async def create_remote_visual_detector(version: str = "latest", force_download: bool = False) -> RemoteVisualDetector:
+    """Reload the served visual detector, then attach a new proxy to it"""
+    await _reload_remote("visual_detector", version, force_download)
+    return await connect_remote_visual_detector()
@@ -0,0 +1,168 @@
+"""
+Inference IPC
+Framing and shared-memory tensor transport between API workers and the inference server
+
+- Frames on the Unix socket: 4-byte big-endian header length, a JSON header,
+  then header["inline"] raw payload bytes
+- Each API worker owns a TensorRing (one SharedMemory block cut into fixed
+  slots, handed out round-robin); a tensor is written into a free slot and
+  only its slot index, shape and dtype travel in the header. The server writes
+  the output tensor back into the same slot.
+- A tensor larger than a slot, or sent while every slot is busy, goes inline
+  as raw bytes after the header - never pickled
+"""
+
+import asyncio
+import json
+import socket
+import struct
+import threading
+from collections import deque
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+FRAME_HEADER = struct.Struct("!I")
+
+# Tensor dtypes accepted on the wire (features, probabilities, images)
+TENSOR_DTYPES = {"float32", "uint8"}
+
+
+def send_frame(sock: socket.socket, header: Dict, payload: bytes = b""):
+    """Write one frame (caller serializes concurrent senders)"""
+    header["inline"] = len(payload)
+    encoded = json.dumps(header).encode()
+    sock.sendall(FRAME_HEADER.pack(len(encoded)) + encoded)
+    if payload:
+        sock.sendall(payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("Inference socket closed")
+        received += count
+    return bytes(buffer)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict, bytes]:
+    """Read one frame (blocking)"""
+    (length,) = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+    header = json.loads(_recv_exact(sock, length))
+    payload = _recv_exact(sock, header["inline"]) if header.get("inline") else b""
+    return header, payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[Dict, bytes]:
+    """Read one frame (asyncio server side)"""
+    (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    header = json.loads(await reader.readexactly(length))
+    payload = await reader.readexactly(header["inline"]) if header.get("inline") else b""
+    return header, payload
+
+
+def write_frame(writer: asyncio.StreamWriter, header: Dict, payload: bytes = b""):
+    """Queue one frame on an asyncio stream (caller drains)"""
+    header["inline"] = len(payload)
+    encoded = json.dumps(header).encode()
+    writer.write(FRAME_HEADER.pack(len(encoded)) + encoded)
+    if payload:
+        writer.write(payload)
+
+
+class TensorRing:
+    """Fixed-size tensor slots in one SharedMemory block"""
+
+    def __init__(self, slots: int, slot_bytes: int, name: Optional[str] = None):
+        """
+        Args:
+            slots: Number of slots
+            slot_bytes: Capacity of each slot
+            name: Attach to an existing ring (server side) instead of creating one
+        """
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = name is None
+
+        if self.owner:
+            self.shm = SharedMemory(create=True, size=slots * slot_bytes)
+        else:
+            self.shm = SharedMemory(name=name)
+            # The API worker owns and unlinks the block; don't let this process's
+            # resource tracker unlink it (or warn about a leak) on exit
+            try:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            except Exception:
+                pass
+
+        self.name = self.shm.name
+        self._free = deque(range(slots))
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Optional[int]:
+        """Free slot index, or None when every slot is in flight (never blocks)"""
+        with self._lock:
+            return self._free.popleft() if self._free else None
+
+    def release(self, slot: int):
+        with self._lock:
+            self._free.append(slot)
+
+    def fits(self, array: np.ndarray) -> bool:
+        return array.nbytes <= self.slot_bytes
+
+    def write(self, slot: int, array: np.ndarray):
+        target = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+        target[...] = array
+
+    def view(self, slot: int, shape, dtype: str) -> np.ndarray:
+        """Zero-copy view of a slot (valid until the slot is released)"""
+        return np.ndarray(tuple(shape), dtype=dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def close(self):
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
+
+
+def pack_tensor(ring: Optional[TensorRing], array: np.ndarray, slot: Optional[int] = None) -> Tuple[Dict, bytes]:
+    """
+    Header fields and inline payload for a tensor
+
+    Written to slot (or a newly acquired one) when it fits, otherwise inline.
+    """
+    array = np.ascontiguousarray(array)
+    if array.dtype.name not in TENSOR_DTYPES:
+        raise ValueError(f"Unsupported tensor dtype: {array.dtype}")
+
+    fields = {"shape": list(array.shape), "dtype": array.dtype.name}
+    if ring is not None and ring.fits(array):
+        if slot is None:
+            slot = ring.acquire()
+        if slot is not None:
+            ring.write(slot, array)
+            fields["slot"] = slot
+            return fields, b""
+    return fields, array.tobytes()
+
+
+def unpack_tensor(ring: Optional[TensorRing], header: Dict, payload: bytes, copy: bool = False) -> np.ndarray:
+    """Tensor described by a header (slot view, or the inline payload)"""
+    if header["dtype"] not in TENSOR_DTYPES:
+        raise ValueError(f"Unsupported tensor dtype: {header['dtype']}")
+
+    if header.get("slot") is not None:
+        if ring is None:
+            raise ValueError("Tensor slot referenced before the ring was attached")
+        array = ring.view(header["slot"], header["shape"], header["dtype"])
+        return array.copy() if copy else array
+    return np.frombuffer(payload, dtype=header["dtype"]).reshape(header["shape"])
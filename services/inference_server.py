@@ -0,0 +1,245 @@
+"""
+Inference Server
+Dedicated process owning the visual detector and audio classifier
+
+    python -m services.inference_server
+
+With INFERENCE_SERVER_ENABLED the API workers load no model weights; their
+model manager holds proxies (services.inference_client) that send tensors
+here over a Unix socket (INFERENCE_SERVER_SOCKET) and shared-memory rings
+(services.inference_ipc):
+- Audio feature windows from every API worker are coalesced into shared
+  forward passes (predict / embed)
+- Decoded images are batched into one YOLO call
+- Models stay loaded and warm while API workers restart; admin reloads are
+  forwarded here ('reload' op) and swapped in without downtime
+"""
+
+import asyncio
+import logging
+import os
+import signal
+from typing import Dict, Optional
+
+from config.settings import settings
+from services.audio_stream import WindowBatcher
+from services.inference_ipc import TensorRing, pack_tensor, read_frame, unpack_tensor, write_frame
+
+logger = logging.getLogger(__name__)
+
+# Models served to API workers
+SERVED_MODELS = ("visual_detector", "audio_classifier")
+
+
+class InferenceServer:
+    """Unix socket server running batched inference for all API workers"""
+
+    def __init__(
+        self,
+        manager,
+        socket_path: str,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0
+    ):
+        """
+        Args:
+            manager: Local ModelManager owning the models
+            socket_path: Unix socket path API workers connect to
+            max_batch_size: Items per forward pass
+            max_wait_ms: How long the first queued item waits for others
+        """
+        self.manager = manager
+        self.socket_path = socket_path
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+        self.batchers = {
+            "predict": WindowBatcher(
+                lambda features: self.manager.audio_classifier._predict(features),
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms
+            ),
+            "embed": WindowBatcher(
+                lambda features: self.manager.audio_classifier._embed(features),
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms
+            ),
+            "detect": WindowBatcher(
+                lambda images: self.manager.visual_detector._detect_objects(images),
+                max_batch_size=max(1, max_batch_size // 8),
+                max_wait_ms=max_wait_ms,
+                collate=list
+            )
+        }
+
+    def model_info(self) -> Dict:
+        """Per served model: load state and what proxies need to mirror it"""
+        info = {}
+        for name in SERVED_MODELS:
+            status = self.manager.get_model_status().get(name, "unloaded")
+            entry = {"status": status}
+            if status == "ready":
+                handle = self.manager.acquire(name)
+                try:
+                    model = handle.model
+                    entry.update({
+                        "version": handle.version,
+                        "generation": handle.generation,
+                        "loaded": getattr(model, "loaded", True),
+                        "cache_version": model.cache_version,
+                        "weights_id": getattr(model, "weights_id", None),
+                        "model_path": model.model_path,
+                        "device": model.device
+                    })
+                finally:
+                    self.manager.release(handle)
+            info[name] = entry
+        return info
+
+    async def _run_op(self, header: Dict, payload: bytes, ring: Optional[TensorRing]):
+        """Execute one request; returns (response fields, inline payload)"""
+        op = header["op"]
+
+        if op in ("predict", "embed"):
+            features = unpack_tensor(ring, header, payload)
+            output = await self.batchers[op].classify(features)
+            # Output goes back into the request's slot (the input is consumed)
+            slot = header.get("slot")
+            return pack_tensor(ring if slot is not None else None, output.astype("float32"), slot=slot)
+
+        if op == "detect":
+            image = unpack_tensor(ring, header, payload)
+            return {"result": await self.batchers["detect"].submit(image)}, b""
+
+        if op == "info":
+            return {"models": self.model_info()}, b""
+
+        if op == "reload":
+            if header.get("model") not in SERVED_MODELS:
+                raise ValueError(f"Unknown model: {header.get('model')}")
+            await self.manager.reload(
+                header["model"],
+                version=header.get("version") or "latest",
+                force_download=bool(header.get("force_download"))
+            )
+            return {"models": self.model_info()}, b""
+
+        raise ValueError(f"Unknown op: {op}")
+
+    async def _respond(self, header: Dict, payload: bytes, ring, writer: asyncio.StreamWriter, write_lock):
+        try:
+            fields, body = await self._run_op(header, payload, ring)
+            fields["ok"] = True
+        except Exception as e:
+            fields, body = {"ok": False, "error": str(e), "status": getattr(e, "status", None)}, b""
+        fields["id"] = header.get("id")
+
+        try:
+            async with write_lock:
+                write_frame(writer, fields, body)
+                await writer.drain()
+        except ConnectionError:
+            pass  # API worker went away; its handler cleans up
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One API worker connection: 'hello' attaches its ring, then requests run concurrently"""
+        ring: Optional[TensorRing] = None
+        write_lock = asyncio.Lock()
+        tasks = set()
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+
+        try:
+            while True:
+                header, payload = await read_frame(reader)
+                if header.get("op") == "hello":
+                    if ring is not None:
+                        ring.close()
+                    ring = TensorRing(header["slots"], header["slot_bytes"], name=header["ring"])
+                    logger.info(f"API worker {header.get('pid')} connected ({self.connections} connections)")
+                    async with write_lock:
+                        write_frame(writer, {"id": header.get("id"), "ok": True, "models": self.model_info()})
+                        await writer.drain()
+                    continue
+
+                task = asyncio.create_task(self._respond(header, payload, ring, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            self._handlers.pop(asyncio.current_task(), None)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            if ring is not None:
+                ring.close()
+            writer.close()
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        logger.info(f"✅ Inference server listening on {self.socket_path}")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Closing the connections ends their handlers (API workers reconnect to the next server)
+            handlers = list(self._handlers)
+            for writer in self._handlers.values():
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        for batcher in self.batchers.values():
+            batcher.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+async def run_inference_server():
+    """Load and warm up the models, then serve until SIGINT/SIGTERM"""
+    from services.model_manager import get_model_manager
+
+    manager = await get_model_manager()
+    ready = await manager.preload()
+    await asyncio.to_thread(manager.warm_up)
+    logger.info(f"🚀 Models {'ready' if ready else 'partially loaded'}: {manager.get_model_status()}")
+
+    server = InferenceServer(
+        manager,
+        settings.INFERENCE_SERVER_SOCKET,
+        max_batch_size=settings.INFERENCE_BATCH_SIZE,
+        max_wait_ms=settings.INFERENCE_BATCH_WAIT_MS
+    )
+    await server.start()
+
+    # This process owns the models, so it also prefetches their new versions
+    from services.model_storage import get_model_storage
+    storage = get_model_storage()
+    storage.start_prefetcher()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await stop.wait()
+    logger.info("🔄 Stopping inference server...")
+    await server.stop()
+    await storage.stop_prefetcher()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    # This process owns the models: its model manager must load them locally
+    settings.INFERENCE_SERVER_ENABLED = False
+    asyncio.run(run_inference_server())
@@ -3,31 +3,35 @@ Media Analysis Service
 Unified photo/video/audio analysis combining all product capabilities
 """
 
+import io
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from pathlib import Path
 import time
 
-from services.visual_detector import get_visual_detector
-from services.threat_classifier import get_threat_classifier
-from services.audio_classifier import get_audio_classifier
+from services.audio_classifier import AUDIO_LIBS_AVAILABLE
+from services.model_manager import get_model_manager
+from services.audio_features import iter_audio_blocks, probe_duration
+from services.result_cache import get_analysis_cache
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Heavy model behind each media type
+MEDIA_TYPE_MODELS = {"photo": "visual_detector", "audio": "audio_classifier"}
+
 
 class MediaAnalyzer:
     """Unified media analysis service"""
 
     def __init__(self):
-        self.visual_detector = None
-        self.threat_classifier = None
+        self._manager = None
         self.loaded = False
 
     async def initialize(self):
-        """Initialize all analysis components"""
+        """Attach to the shared model manager"""
         try:
-            self.visual_detector = await get_visual_detector()
-            self.threat_classifier = await get_threat_classifier()
+            self._manager = await get_model_manager()
             self.loaded = True
             logger.info("✅ MediaAnalyzer initialized")
             return True
@@ -35,6 +39,69 @@ class MediaAnalyzer:
             logger.error(f"❌ MediaAnalyzer initialization failed: {e}")
             return False
 
+    # Models are resolved per use: ModelNotReadyError while they load in the background
+    @property
+    def visual_detector(self):
+        return self._manager.visual_detector
+
+    @property
+    def threat_classifier(self):
+        return self._manager.threat_classifier
+
+    @property
+    def audio_classifier(self):
+        return self._manager.audio_classifier
+
+    def get_model_version(self, media_type: str) -> str:
+        """Version of the models producing results for a media type (cache key component)"""
+        if media_type == "photo":
+            return self.visual_detector.cache_version
+        if media_type == "audio":
+            return self.audio_classifier.cache_version
+        return "placeholder-v0.1"
+
+    async def analyze_cached(self, media_type: str, media_bytes: bytes, **options) -> Dict:
+        """
+        Analyze media through the content-addressed result cache
+
+        Identical bytes analyzed by the same model version are only inferred once.
+
+        Args:
+            media_type: 'photo', 'video' or 'audio'
+            media_bytes: Raw media bytes as uploaded
+            **options: Passed through to the analyze_* method (part of the cache key)
+
+        Returns:
+            Analysis result (same shape as the analyze_* methods)
+        """
+        if not self.loaded:
+            await self.initialize()
+
+        if media_type == "photo":
+            compute = lambda: self.analyze_photo(media_bytes, **options)
+        elif media_type == "video":
+            compute = lambda: self.analyze_video(media_bytes, **options)
+        elif media_type == "audio":
+            compute = lambda: self.analyze_audio(media_bytes, **options)
+        else:
+            raise ValueError(f"Unsupported media type: {media_type}")
+
+        namespace = ":".join([media_type] + [f"{k}={v}" for k, v in sorted(options.items())])
+        cache = get_analysis_cache()
+        model_name = MEDIA_TYPE_MODELS.get(media_type)
+        if model_name is None:
+            return await cache.get_or_compute(namespace, media_bytes, self.get_model_version(media_type), compute)
+
+        # Held for the whole analysis so the model manager cannot evict it mid-request;
+        # during a canary rollout this also picks the version the cache key reflects
+        async with self._manager.use(model_name):
+            return await cache.get_or_compute(
+                namespace,
+                media_bytes,
+                self.get_model_version(media_type),
+                compute
+            )
+
     async def analyze_photo(self, image_bytes: bytes, return_detailed: bool = True) -> Dict:
         """
         Analyze photo for threats
@@ -53,7 +120,7 @@ class MediaAnalyzer:
 
         try:
             # Visual detection (YOLOv8)
-            visual_results = await self.visual_detector.detect_from_bytes(image_bytes)
+            visual_results = await self._manager.infer("visual_detector", "detect_from_bytes", image_bytes)
 
             if not visual_results.get('success'):
                 return {
@@ -136,12 +203,12 @@ class MediaAnalyzer:
             "processing_time_ms": 0
         }
 
-    async def analyze_audio(self, audio_file_path: str, context: Optional[Dict] = None) -> Dict:
+    async def analyze_audio(self, audio_source: Union[str, bytes], context: Optional[Dict] = None) -> Dict:
         """
         Analyze audio for threats using SAIT classifier
 
         Args:
-            audio_file_path: Path to audio file
+            audio_source: Path to audio file, or raw encoded audio bytes
             context: Optional context (location, timestamp, etc.)
 
         Returns:
@@ -150,10 +217,19 @@ class MediaAnalyzer:
         start_time = time.time()
 
         try:
+            if isinstance(audio_source, (bytes, bytearray, memoryview)):
+                audio_source = io.BytesIO(audio_source)
+
+            # Long recordings: windowed, constant-memory timeline
+            if AUDIO_LIBS_AVAILABLE:
+                duration = probe_duration(audio_source)
+                if duration is not None and duration > settings.AUDIO_TIMELINE_MIN_DURATION_SEC:
+                    return await self._analyze_audio_timeline(audio_source, start_time)
+
             # Load audio file
             try:
                 import librosa
-                audio_data, sample_rate = librosa.load(audio_file_path, sr=16000)
+                audio_data, sample_rate = librosa.load(audio_source, sr=16000)
                 duration = len(audio_data) / sample_rate
             except ImportError:
                 logger.warning("Audio libraries not available")
@@ -163,11 +239,10 @@ class MediaAnalyzer:
                     "media_type": "audio"
                 }
 
-            # Get audio classifier
-            audio_classifier = await get_audio_classifier()
-
             # Classify audio
-            result = await audio_classifier.classify_audio(
+            result = await self._manager.infer(
+                "audio_classifier",
+                "classify_audio",
                 audio_data=audio_data,
                 sample_rate=sample_rate,
                 context=context
@@ -215,6 +290,72 @@ class MediaAnalyzer:
             }
 
 
+    async def _analyze_audio_timeline(self, audio_source, start_time: float) -> Dict:
+        """Stream a long recording through windowed classification and report a timeline"""
+        # Called on the held version directly: a one-shot block stream can't be
+        # mirrored to a rollout peer the way manager.infer() would
+        async with self._manager.use("audio_classifier") as audio_classifier:
+            result = await audio_classifier.classify_audio_timeline(
+                iter_audio_blocks(audio_source, target_sr=audio_classifier.sample_rate),
+                sample_rate=audio_classifier.sample_rate,
+                window_seconds=settings.AUDIO_TIMELINE_WINDOW_SEC,
+                hop_seconds=settings.AUDIO_TIMELINE_HOP_SEC,
+                batch_size=settings.AUDIO_TIMELINE_BATCH_SIZE
+            )
+
+        processing_time = int((time.time() - start_time) * 1000)
+
+        if not result['success']:
+            return {
+                "success": False,
+                "error": result.get('error', 'Audio timeline analysis failed'),
+                "media_type": "audio",
+                "processing_time_ms": processing_time
+            }
+
+        top = result['top_detection'] or {}
+        top_category = top.get('threat_category', 'background')
+        categories = {segment['threat_category'] for segment in result['timeline']}
+
+        return {
+            "success": True,
+            "media_type": "audio",
+            "audio_analysis": {
+                "duration_seconds": result['duration_seconds'],
+                "sample_rate": result['sample_rate'],
+                "threat_sounds": [
+                    {
+                        "type": segment['class_name'],
+                        "confidence": segment['confidence'],
+                        "priority": segment['priority'],
+                        "timestamp": segment['start_seconds'],
+                        "end_timestamp": segment['end_seconds']
+                    }
+                    for segment in result['timeline']
+                ],
+                "windows_analyzed": result['windows_analyzed'],
+                "speaker_count": 0,  # TODO: Implement speaker diarization
+                "aggression_score": max(
+                    (s['confidence'] for s in result['timeline'] if s['threat_category'] == 'violence'),
+                    default=0.0
+                ),
+                "distress_detected": bool(categories & {'weapons', 'violence'})
+            },
+            "threat_classification": {
+                "category": top_category,
+                "subcategory": top.get('class_name', 'ambient_quiet'),
+                "severity": top.get('severity', 1),
+                "confidence": top.get('confidence', 0.0)
+            },
+            "source_models": {
+                "audio_classifier": "sait-cloud-v1.0.0",
+                "threat_classifier": "atlas-threat-v1.0.0"
+            },
+            "recommendations": audio_classifier._generate_recommendations(top_category, top.get('confidence', 0.0)),
+            "processing_time_ms": processing_time
+        }
+
+
 # Singleton instance
 _media_analyzer: Optional[MediaAnalyzer] = None
 
@@ -224,5 +365,6 @@ async def get_media_analyzer() -> MediaAnalyzer:
     global _media_analyzer
     if _media_analyzer is None:
         _media_analyzer = MediaAnalyzer()
+    if not _media_analyzer.loaded:
         await _media_analyzer.initialize()
     return _media_analyzer
@@ -0,0 +1,302 @@
+"""
+Media Fetcher Service
+Pooled async downloader for URL-based media analysis (Halo CDN image/audio/video URLs)
+
+One long-lived httpx.AsyncClient is shared by all requests:
+- Connection pooling + keep-alive (TLS handshakes are paid once per host)
+- Per-host concurrency limits (one slow CDN can't starve the pool)
+- Size caps enforced while streaming (oversized media is aborted early)
+- Body is streamed into a single buffer that is handed straight to the decoders
+
+URLs come from API clients, so every hop (redirects are followed manually) is
+checked: http(s) only, host on the allow-list (required in production), and
+every address the host resolves to must be public. The connection goes to the
+checked address (Host header / SNI keep the name), so DNS can't be rebound
+to an internal address between the check and the request.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Redirect hops followed (each one re-validated)
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class MediaFetchError(Exception):
+    """Media could not be fetched (status_code maps to the HTTP error to return)"""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class FetchedMedia:
+    """Downloaded media body"""
+    url: str
+    content: bytearray  # Single buffer, accepted by hashlib/np.frombuffer/BytesIO
+    content_type: str
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.content)
+
+
+class MediaFetcher:
+    """Shared pooled HTTP client for fetching media by URL"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_limit: int = 8,
+        timeout_seconds: float = 10.0,
+        max_bytes: int = 50 * 1024 * 1024,
+        allowed_hosts: Optional[List[str]] = None,
+        require_allowed_hosts: bool = False,
+        allow_private_networks: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            max_connections: Total connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            per_host_limit: Concurrent downloads allowed per host
+            timeout_seconds: Connect/read timeout
+            max_bytes: Default size cap per download
+            allowed_hosts: Optional host allow-list (empty = any public host)
+            require_allowed_hosts: Refuse every URL while the allow-list is empty (production)
+            allow_private_networks: Accept hosts resolving to loopback/private/link-local
+                addresses (local development only)
+            transport: Custom transport (e.g. httpx.MockTransport or a local stand-in)
+        """
+        self.per_host_limit = per_host_limit
+        self.max_bytes = max_bytes
+        self.allowed_hosts = set(allowed_hosts or [])
+        self.require_allowed_hosts = require_allowed_hosts
+        self.allow_private_networks = allow_private_networks
+
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=30.0
+        )
+        self._timeout = httpx.Timeout(timeout_seconds)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # Per-host limiters of hosts with downloads in flight: host -> [semaphore, users]
+        self._host_slots: Dict[str, list] = {}
+
+        self.stats = {"fetches": 0, "bytes": 0, "errors": 0}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Long-lived pooled client (created on first use)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=self._limits,
+                timeout=self._timeout,
+                transport=self._transport,
+                follow_redirects=False,  # Followed in fetch(), validating every hop
+                headers={"User-Agent": "AtlasIntelligence-MediaFetcher/1.0"}
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str):
+        """Per-host concurrency limit (dropped once the host has nothing in flight)"""
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = [asyncio.Semaphore(self.per_host_limit), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                self._host_slots.pop(host, None)
+
+    def _validate_url(self, url) -> httpx.URL:
+        try:
+            parsed = httpx.URL(url)
+        except Exception:
+            raise MediaFetchError(f"Invalid media URL: {url}", status_code=400)
+
+        if parsed.scheme not in ("http", "https") or not parsed.host:
+            raise MediaFetchError(f"Unsupported media URL: {url}", status_code=400)
+        if not self.allowed_hosts and self.require_allowed_hosts:
+            raise MediaFetchError("Media URLs are disabled: MEDIA_FETCH_ALLOWED_HOSTS is not configured", status_code=400)
+        if self.allowed_hosts and parsed.host not in self.allowed_hosts:
+            raise MediaFetchError(f"Media host not allowed: {parsed.host}", status_code=400)
+
+        return parsed
+
+    async def _resolve(self, url: httpx.URL) -> str:
+        """Address to connect to for url's host; rejects hosts with any non-public address"""
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                url.host, url.port or (443 if url.scheme == "https" else 80), type=socket.SOCK_STREAM
+            )
+        except socket.gaierror:
+            raise MediaFetchError(f"Media host not found: {url.host}", status_code=400)
+
+        addresses = [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+        if not addresses:
+            raise MediaFetchError(f"Media host not found: {url.host}", status_code=400)
+        if not self.allow_private_networks and not all(address.is_global for address in addresses):
+            raise MediaFetchError(f"Media host not allowed: {url.host} (non-public address)", status_code=400)
+        return str(addresses[0])
+
+    async def _pinned_request(self, url: httpx.URL) -> httpx.Request:
+        """GET request for url connecting to the validated address of its host"""
+        address = await self._resolve(url)
+        return self.client.build_request(
+            "GET",
+            url.copy_with(host=address),
+            headers={"Host": url.netloc.decode("ascii")},
+            extensions={"sni_hostname": url.host}
+        )
+
+    async def fetch(self, url: str, max_bytes: Optional[int] = None) -> FetchedMedia:
+        """
+        Download media body, aborting as soon as it exceeds the size cap
+
+        Args:
+            url: http(s) URL of the media
+            max_bytes: Size cap (defaults to the fetcher's max_bytes)
+
+        Returns:
+            FetchedMedia with the body in a single buffer
+
+        Raises:
+            MediaFetchError: invalid URL, upstream error, or body too large
+        """
+        max_bytes = max_bytes or self.max_bytes
+        parsed = self._validate_url(url)
+
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                request = await self._pinned_request(parsed)
+                async with self._host_slot(parsed.host):
+                    response = await self.client.send(request, stream=True)
+                    try:
+                        if response.status_code in REDIRECT_STATUSES:
+                            location = response.headers.get("location")
+                            if not location:
+                                raise MediaFetchError(f"Media fetch failed: redirect without location from {parsed.host}")
+                            parsed = self._validate_url(parsed.join(location))
+                            continue
+                        buffer = await self._read_body(response, parsed, max_bytes)
+                    finally:
+                        await response.aclose()
+                break
+            else:
+                raise MediaFetchError(f"Media fetch failed: more than {MAX_REDIRECTS} redirects", status_code=502)
+
+            self.stats["fetches"] += 1
+            self.stats["bytes"] += len(buffer)
+
+            return FetchedMedia(
+                url=url,
+                content=buffer,
+                content_type=response.headers.get("content-type", "application/octet-stream")
+            )
+
+        except MediaFetchError:
+            self.stats["errors"] += 1
+            raise
+        except httpx.TimeoutException:
+            self.stats["errors"] += 1
+            raise MediaFetchError(f"Media fetch timed out: {parsed.host}", status_code=504)
+        except httpx.HTTPError as e:
+            self.stats["errors"] += 1
+            raise MediaFetchError(f"Media fetch failed: {e}", status_code=502)
+
+    @staticmethod
+    async def _read_body(response: httpx.Response, url: httpx.URL, max_bytes: int) -> bytearray:
+        """Stream the body into one buffer, aborting as soon as it exceeds max_bytes"""
+        if response.status_code >= 400:
+            raise MediaFetchError(
+                f"Media fetch failed: HTTP {response.status_code} from {url.host}",
+                status_code=502
+            )
+
+        declared = int(response.headers.get("content-length", 0) or 0)
+        if declared > max_bytes:
+            raise MediaFetchError(
+                f"Media too large: {declared} bytes (max {max_bytes})",
+                status_code=413
+            )
+
+        # Preallocate when the size is known and the body isn't re-encoded
+        preallocate = declared > 0 and "content-encoding" not in response.headers
+        buffer = bytearray(declared) if preallocate else bytearray()
+        received = 0
+
+        async for chunk in response.aiter_bytes():
+            end = received + len(chunk)
+            if end > max_bytes:
+                raise MediaFetchError(
+                    f"Media too large: exceeded {max_bytes} bytes while streaming",
+                    status_code=413
+                )
+            if preallocate and end <= declared:
+                buffer[received:end] = chunk
+            else:
+                del buffer[received:]
+                buffer += chunk
+            received = end
+
+        del buffer[received:]  # Trim if the server sent less than declared
+        return buffer
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance
+_media_fetcher: Optional[MediaFetcher] = None
+
+
+def get_media_fetcher() -> MediaFetcher:
+    """Get or create media fetcher singleton"""
+    global _media_fetcher
+
+    if _media_fetcher is None:
+        _media_fetcher = MediaFetcher(
+            max_connections=settings.MEDIA_FETCH_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.MEDIA_FETCH_MAX_KEEPALIVE,
+            per_host_limit=settings.MEDIA_FETCH_PER_HOST_LIMIT,
+            timeout_seconds=settings.MEDIA_FETCH_TIMEOUT_SEC,
+            max_bytes=settings.MAX_MEDIA_SIZE_MB * 1024 * 1024,
+            allowed_hosts=settings.MEDIA_FETCH_ALLOWED_HOSTS,
+            require_allowed_hosts=settings.ATLAS_ENV == "production",
+            allow_private_networks=settings.MEDIA_FETCH_ALLOW_PRIVATE_NETWORKS
+        )
+
+    return _media_fetcher
+
+
+async def close_media_fetcher():
+    """Close the shared client (application shutdown)"""
+    global _media_fetcher
+    if _media_fetcher is not None:
+        await _media_fetcher.close()
+        _media_fetcher = None
@@ -0,0 +1,328 @@
+"""
+Local Model Cache
+Version-aware, content-addressed on-disk cache for model weights from model storage
+
+- Weights are stored once per content hash as blobs/<sha256><suffix> (the
+  suffix is kept so loaders like YOLO recognise the format)
+- index.json maps model file/version -> sha256, size, source ETag and last use
+- Several versions stay cached side by side: switching back to one (rollback)
+  needs no download
+- Total blob size is bounded (MODEL_DISK_CACHE_SIZE_MB); least-recently-used
+  versions are evicted first, never the blobs of loaded models (pinned)
+
+Worker processes share the directory: index changes are made under a file
+lock and re-read the index first. Each process records the blobs it has loaded
+in pins.json (by PID), so one worker never evicts another's weights; pins of
+exited processes are dropped.
+
+Reads and changes take the file lock - call them from a worker thread, not
+the event loop.
+"""
+
+import fcntl
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import json
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedModel:
+    """One cached version of a model file"""
+    model_name: str
+    version: str
+    sha256: str
+    size_bytes: int
+    etag: Optional[str]
+    fetched_at: float
+    last_used: float
+    path: Path
+
+
+class LocalModelCache:
+    """Content-addressed model weight cache with an on-disk index and LRU size bound"""
+
+    def __init__(self, root_dir: Union[str, Path], max_size_mb: float):
+        """
+        Args:
+            root_dir: Cache directory (holds index.json, blobs/ and downloads/)
+            max_size_mb: Bound on the total size of cached blobs
+        """
+        self.root_dir = Path(root_dir)
+        self.blob_dir = self.root_dir / "blobs"
+        self.download_dir = self.root_dir / "downloads"
+        self.index_path = self.root_dir / "index.json"
+        self.lock_path = self.root_dir / ".lock"
+        self.pins_path = self.root_dir / "pins.json"
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+
+        # model file -> version -> entry
+        self._entries: Dict[str, Dict[str, CachedModel]] = {}
+        self._pins: Dict[str, List[str]] = {}  # PID -> resolved blob paths loaded by that process
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._load_index()
+
+    def _blob_path(self, sha256: str, suffix: str) -> Path:
+        return self.blob_dir / f"{sha256}{suffix}"
+
+    def _load_index(self):
+        self._entries = {}
+        if not self.index_path.exists():
+            return
+
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except Exception as e:
+            logger.warning(f"Model cache index unreadable, starting empty: {e}")
+            return
+
+        for model_name, versions in index.items():
+            for version, entry in versions.items():
+                path = self._blob_path(entry["sha256"], Path(model_name).suffix)
+                if path.exists():
+                    self._entries.setdefault(model_name, {})[version] = CachedModel(**entry, path=path)
+
+    def _save_index(self):
+        index = {
+            model_name: {
+                version: {k: v for k, v in asdict(entry).items() if k != "path"}
+                for version, entry in versions.items()
+            }
+            for model_name, versions in self._entries.items()
+        }
+        tmp_path = self.index_path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass  # Exists, owned by another user
+        return True
+
+    def _load_pins(self):
+        """Pins of live processes (those of exited processes are ignored)"""
+        self._pins = {}
+        if not self.pins_path.exists():
+            return
+
+        try:
+            with open(self.pins_path) as f:
+                pins = json.load(f)
+        except Exception as e:
+            logger.warning(f"Model cache pins unreadable, ignoring: {e}")
+            return
+
+        self._pins = {pid: paths for pid, paths in pins.items() if self._pid_alive(int(pid))}
+
+    def _save_pins(self):
+        tmp_path = self.pins_path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp_path, "w") as f:
+            json.dump(self._pins, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.pins_path)
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access across threads and processes, with the index and pins freshly read"""
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._load_index()
+            self._load_pins()
+            yield
+
+    def get(self, model_name: str, version: str) -> Optional[CachedModel]:
+        """Cached entry for model file/version (marks it used)"""
+        with self._locked():
+            entry = self._entries.get(model_name, {}).get(version)
+            if entry is None:
+                return None
+            entry.last_used = time.time()
+            self._save_index()
+            return entry
+
+    def contains(self, model_name: str, version: str) -> bool:
+        """Whether model file/version is cached (does not mark it used)"""
+        with self._locked():
+            return version in self._entries.get(model_name, {})
+
+    def find_blob(self, sha256: str, suffix: str) -> Optional[Path]:
+        """Cached blob with this content, if any"""
+        path = self._blob_path(sha256, suffix)
+        return path if path.exists() else None
+
+    def download_path(self, model_name: str, version: str) -> Path:
+        """Staging path for a download of model file/version (moved in by put)"""
+        model_path = Path(model_name)
+        return self.download_dir / f"{model_path.stem}@{version}{model_path.suffix}"
+
+    def put(
+        self,
+        model_name: str,
+        version: str,
+        source_path: Union[str, Path],
+        sha256: str,
+        etag: Optional[str] = None
+    ) -> CachedModel:
+        """
+        Add a verified file as model file/version
+
+        source_path is moved into the blob store (same filesystem) or dropped
+        when a blob with this content already exists. Evicts to the size bound.
+
+        Args:
+            model_name: Model file name, e.g. 'yolov8m.pt'
+            version: Storage version ('latest' or e.g. 'v2.1.0')
+            source_path: Verified file (usually download_path())
+            sha256: Content hash of source_path
+            etag: ETag of the storage object it came from
+        """
+        source_path = Path(source_path)
+        with self._locked():
+            blob_path = self._blob_path(sha256, Path(model_name).suffix)
+            if blob_path.exists():
+                source_path.unlink(missing_ok=True)
+            else:
+                os.replace(source_path, blob_path)
+            return self._add(model_name, version, blob_path, sha256, etag)
+
+    def link(self, model_name: str, version: str, sha256: str, etag: Optional[str] = None) -> Optional[CachedModel]:
+        """Record model file/version for content already cached (no copy); None if not cached"""
+        with self._locked():
+            blob_path = self._blob_path(sha256, Path(model_name).suffix)
+            if not blob_path.exists():
+                return None
+            return self._add(model_name, version, blob_path, sha256, etag)
+
+    def _add(self, model_name: str, version: str, blob_path: Path, sha256: str, etag: Optional[str]) -> CachedModel:
+        now = time.time()
+        previous = self._entries.get(model_name, {}).get(version)
+        entry = CachedModel(
+            model_name=model_name,
+            version=version,
+            sha256=sha256,
+            size_bytes=blob_path.stat().st_size,
+            etag=etag,
+            fetched_at=now,
+            last_used=now,
+            path=blob_path
+        )
+        self._entries.setdefault(model_name, {})[version] = entry
+        if previous is not None and previous.sha256 != sha256:
+            self._prune_blob(previous.path)
+        self._evict(keep=entry)
+        self._save_index()
+        logger.info(f"📦 Cached {model_name} {version} (sha256 {sha256[:12]}, {entry.size_bytes / (1024 * 1024):.1f}MB)")
+        return entry
+
+    def _all_entries(self) -> List[CachedModel]:
+        return [entry for versions in self._entries.values() for entry in versions.values()]
+
+    @property
+    def _pinned(self) -> set:
+        return {path for paths in self._pins.values() for path in paths}
+
+    def _is_pinned(self, path: Path) -> bool:
+        return str(path.resolve()) in self._pinned
+
+    def _prune_blob(self, path: Path):
+        """Delete a blob no longer referenced by any entry or loaded model"""
+        if self._is_pinned(path) or any(entry.path == path for entry in self._all_entries()):
+            return
+        path.unlink(missing_ok=True)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of indexed blobs (shared content counted once)"""
+        return sum({entry.path: entry.size_bytes for entry in self._all_entries()}.values())
+
+    def _evict(self, keep: Optional[CachedModel] = None):
+        """Drop least-recently-used versions until within the size bound"""
+        while self.size_bytes > self.max_bytes:
+            candidates = [
+                entry for entry in self._all_entries()
+                if entry.path != getattr(keep, "path", None) and not self._is_pinned(entry.path)
+            ]
+            if not candidates:
+                logger.warning(
+                    f"⚠️ Model cache holds {self.size_bytes / (1024 * 1024):.0f}MB "
+                    f"(bound {self.max_bytes / (1024 * 1024):.0f}MB), nothing evictable"
+                )
+                return
+            victim = min(candidates, key=lambda entry: entry.last_used)
+            del self._entries[victim.model_name][victim.version]
+            if not self._entries[victim.model_name]:
+                del self._entries[victim.model_name]
+            self._prune_blob(victim.path)
+            self._evictions += 1
+            logger.info(f"♻️ Evicted {victim.model_name} {victim.version} from model cache")
+
+    def set_pinned(self, paths: Iterable[Union[str, Path]]):
+        """Weight files of this process's loaded model versions (never evicted while it runs)"""
+        pinned = sorted({str(Path(path).resolve()) for path in paths})
+        with self._locked():
+            if pinned:
+                self._pins[str(os.getpid())] = pinned
+            else:
+                self._pins.pop(str(os.getpid()), None)
+            self._save_pins()
+
+    def clear(self) -> List[str]:
+        """Remove every unpinned version; returns '<model file>@<version>' for each"""
+        with self._locked():
+            removed = []
+            for entry in self._all_entries():
+                if self._is_pinned(entry.path):
+                    continue
+                del self._entries[entry.model_name][entry.version]
+                removed.append(f"{entry.model_name}@{entry.version}")
+            self._entries = {name: versions for name, versions in self._entries.items() if versions}
+            for path in self.blob_dir.iterdir():
+                self._prune_blob(path)
+            self._save_index()
+            return removed
+
+    def stats(self) -> Dict:
+        return {
+            "dir": str(self.root_dir),
+            "size_mb": round(self.size_bytes / (1024 * 1024), 1),
+            "max_size_mb": round(self.max_bytes / (1024 * 1024), 1),
+            "evictions": self._evictions,
+            "pinned": sorted(Path(path).name for path in self._pinned),
+            "models": {
+                model_name: sorted(versions)
+                for model_name, versions in self._entries.items()
+            }
+        }
+
+
+# Singleton instance
+_model_cache: Optional[LocalModelCache] = None
+
+
+def get_model_cache() -> LocalModelCache:
+    """Get or create local model cache singleton"""
+    global _model_cache
+
+    if _model_cache is None:
+        _model_cache = LocalModelCache(settings.MODEL_DISK_CACHE_DIR, settings.MODEL_DISK_CACHE_SIZE_MB)
+
+    return _model_cache
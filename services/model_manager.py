@@ -1,18 +1,130 @@
 """
 Unified Model Manager - Singleton pattern for shared ML models
 All products (Halo, SAIT, Frontline) share the same model instances
+
+Memory budget (MODEL_CACHE_SIZE_MB):
+- Pinned models (MODEL_PINNED) load in the background at startup and are never evicted
+- Other models load on first use (the triggering request gets a 503 + Retry-After)
+- Each model's resident weight memory is measured after loading; while the total
+  exceeds the budget the least-recently-used idle model is evicted
+
+Versioned handles (zero-downtime reload):
+- Requests hold a ModelHandle (manager.use / acquire) for their duration
+- reload() builds and warms up a new instance in a worker thread, then swaps the
+  current handle in one assignment; new requests see the new version, in-flight
+  ones finish on the old handle, which is released once drained
+
+Rollouts (start_rollout): a candidate version is loaded next to the incumbent and
+receives canary traffic (percent of requests, sticky per routing key) or shadow
+traffic (mirrored in the background, responses unaffected). Calls made through
+infer() record per-version latency and agreement with the incumbent.
 """
 
+import functools
 import logging
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import asyncio
 
+from prometheus_client import Gauge
+
+from config.settings import settings
 from services.threat_classifier import ThreatClassifier
 from services.visual_detector import VisualDetector
 from services.audio_classifier import AudioClassifier
+from services.model_cache import get_model_cache
+from services.model_rollout import INFERENCE_SECONDS, ROLLOUT_MODES, Rollout
 
 logger = logging.getLogger(__name__)
 
+# Models loaded in worker threads (the threat classifier is a taxonomy file, loaded inline)
+BACKGROUND_MODELS = ("visual_detector", "audio_classifier")
+
+MODEL_RESIDENT_MB = Gauge("atlas_model_resident_mb", "Resident weight memory per loaded model", ["model"])
+
+# Handles chosen by use() for the current request (model name -> handle)
+_routed_handles: ContextVar[Dict[str, 'ModelHandle']] = ContextVar("atlas_routed_handles", default={})
+
+
+class ModelNotReadyError(Exception):
+    """A shared model is still loading (or failed to load)"""
+
+    def __init__(self, model_name: str, status: str, retry_after: Optional[int] = None):
+        self.model_name = model_name
+        self.status = status
+        self.retry_after = retry_after
+        super().__init__(f"Model {model_name} is {status}")
+
+
+def _run_loader(loader):
+    """Run an async model loader to completion on a private event loop (worker thread)"""
+    return asyncio.run(loader())
+
+
+def _resident_mb(model) -> float:
+    """Weight memory of the torch modules held by a model service (shared tensors counted once)"""
+    try:
+        import torch.nn as nn
+    except ImportError:
+        return 0.0
+
+    seen = set()
+    total = 0
+    for value in vars(model).values():
+        if not isinstance(value, nn.Module):
+            # Wrappers such as ultralytics' YOLO hold the network in .model
+            value = getattr(value, "model", None)
+            if not isinstance(value, nn.Module):
+                continue
+        for tensor in list(value.parameters()) + list(value.buffers()):
+            if tensor.data_ptr() in seen:
+                continue
+            seen.add(tensor.data_ptr())
+            total += tensor.numel() * tensor.element_size()
+    return total / (1024 * 1024)
+
+
+def _model_factories() -> Dict[str, Tuple[Callable, Callable, Callable]]:
+    """Per model: shared singleton loader, new-instance factory, singleton setter"""
+    from services.threat_classifier import get_threat_classifier, create_threat_classifier, set_threat_classifier
+    from services.visual_detector import get_visual_detector, create_visual_detector, set_visual_detector
+    from services.audio_classifier import get_audio_classifier, create_audio_classifier, set_audio_classifier
+
+    if settings.INFERENCE_SERVER_ENABLED:
+        # Weights live in the inference server; these build proxies (and forward reloads)
+        from services.inference_client import (
+            connect_remote_visual_detector, create_remote_visual_detector,
+            connect_remote_audio_classifier, create_remote_audio_classifier
+        )
+        return {
+            "threat_classifier": (get_threat_classifier, create_threat_classifier, set_threat_classifier),
+            "visual_detector": (connect_remote_visual_detector, create_remote_visual_detector, set_visual_detector),
+            "audio_classifier": (connect_remote_audio_classifier, create_remote_audio_classifier, set_audio_classifier)
+        }
+
+    return {
+        "threat_classifier": (get_threat_classifier, create_threat_classifier, set_threat_classifier),
+        "visual_detector": (get_visual_detector, create_visual_detector, set_visual_detector),
+        "audio_classifier": (get_audio_classifier, create_audio_classifier, set_audio_classifier)
+    }
+
+
+@dataclass
+class ModelHandle:
+    """One loaded version of a model, reference counted by the requests using it"""
+    name: str
+    model: Any
+    version: str
+    generation: int
+    loaded_at: float
+    resident_mb: float = 0.0
+    refs: int = 0
+    retired: bool = False
+
 
 class ModelManager:
     """
@@ -31,9 +143,29 @@ class ModelManager:
 
     def __init__(self):
         """Private constructor - use get_instance() instead"""
-        self._threat_classifier: Optional[ThreatClassifier] = None
-        self._visual_detector: Optional[VisualDetector] = None
-        self._audio_classifier: Optional[AudioClassifier] = None
+        # Current handle per model; retired handles stay alive until drained
+        self._handles: Dict[str, ModelHandle] = {}
+        self._retired: List[ModelHandle] = []
+        self._generation = 0
+        self._reload_locks: Dict[str, asyncio.Lock] = {}
+
+        # Per-model load state: 'unloaded', 'loading', 'ready' or 'failed'
+        self._status: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_tasks: Dict[str, asyncio.Task] = {}
+
+        # Memory budget bookkeeping
+        self.budget_mb = settings.MODEL_CACHE_SIZE_MB
+        self.pinned = set(settings.MODEL_PINNED) | {"threat_classifier"}
+        self._last_used: Dict[str, float] = {}
+        self._evictions = 0
+
+        # Candidate versions receiving canary/shadow traffic
+        self._rollouts: Dict[str, Rollout] = {}
+
+        # Disk cache pins are written in order by one thread (file lock, off the event loop)
+        self._pin_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-cache-pins")
 
     @classmethod
     async def get_instance(cls) -> 'ModelManager':
@@ -46,7 +178,13 @@ class ModelManager:
         return cls._instance
 
     async def _initialize(self):
-        """Initialize all models (called once on first access)"""
+        """
+        Initialize models (called once on first access)
+
+        The threat classifier (taxonomy only) is loaded inline. Pinned heavy
+        models start loading concurrently in worker threads; the others wait for
+        their first request. The manager serves as soon as this returns.
+        """
         if self._initialized:
             return
 
@@ -56,48 +194,499 @@ class ModelManager:
             # Load threat classifier
             logger.info("Loading threat classifier...")
             from services.threat_classifier import get_threat_classifier
-            self._threat_classifier = await get_threat_classifier()
+            self._install("threat_classifier", await get_threat_classifier())
             logger.info("✅ Threat classifier loaded")
 
-            # Load visual detector
-            logger.info("Loading visual detector...")
-            from services.visual_detector import get_visual_detector
-            self._visual_detector = await get_visual_detector()
-            logger.info("✅ Visual detector loaded")
-
-            # Load audio classifier
-            logger.info("Loading audio classifier...")
-            from services.audio_classifier import get_audio_classifier
-            self._audio_classifier = await get_audio_classifier()
-            logger.info("✅ Audio classifier loaded")
+            for name in BACKGROUND_MODELS:
+                self._status[name] = "unloaded"
+                if name in self.pinned:
+                    self._start_load(name)
 
             self._initialized = True
-            logger.info("🎉 Model Manager initialized - all models ready and shared")
+            logger.info(
+                f"🎉 Model Manager serving (budget {self.budget_mb}MB) - "
+                f"preloading: {', '.join(sorted(self.pinned & set(BACKGROUND_MODELS))) or 'none'}"
+            )
 
         except Exception as e:
             logger.error(f"❌ Model Manager initialization failed: {e}")
             raise
 
+    def _start_load(self, name: str):
+        """Start loading a model in the background (no-op if already loading)"""
+        if self._status.get(name) == "loading":
+            return
+        self._status[name] = "loading"
+        self._errors.pop(name, None)
+        self._load_tasks[name] = asyncio.get_running_loop().create_task(self._load_in_background(name))
+
+    async def _load_in_background(self, name: str):
+        """Load one model in a worker thread, record its state and enforce the budget"""
+        loader, _, _ = _model_factories()[name]
+        start = time.time()
+        logger.info(f"Loading {name}...")
+        try:
+            handle = self._install(name, await asyncio.to_thread(_run_loader, loader))
+            logger.info(f"✅ {name} loaded in {time.time() - start:.1f}s ({handle.resident_mb}MB)")
+            self._enforce_budget(keep=name)
+        except Exception as e:
+            self._status[name] = "failed"
+            self._errors[name] = str(e)
+            logger.error(f"❌ {name} failed to load: {e}")
+        finally:
+            self._load_seconds[name] = round(time.time() - start, 2)
+
+    def _new_handle(self, name: str, model, version: Optional[str] = None) -> ModelHandle:
+        self._generation += 1
+        return ModelHandle(
+            name=name,
+            model=model,
+            version=version or getattr(model, "cache_version", "latest"),
+            generation=self._generation,
+            loaded_at=time.time(),
+            resident_mb=round(_resident_mb(model), 1)
+        )
+
+    def _install(self, name: str, model, version: Optional[str] = None) -> ModelHandle:
+        """Make model the current version of name"""
+        return self._install_handle(self._new_handle(name, model, version))
+
+    def _install_handle(self, handle: ModelHandle) -> ModelHandle:
+        """Make handle the current version (single assignment - atomic for requests)"""
+        name, model = handle.name, handle.model
+        previous = self._handles.get(name)
+        self._handles[name] = handle
+        self._status[name] = "ready"
+        self._last_used[name] = time.time()
+        _, _, set_singleton = _model_factories()[name]
+        set_singleton(model)
+        MODEL_RESIDENT_MB.labels(model=name).set(handle.resident_mb)
+
+        if previous is not None:
+            self._retire(previous)
+        self._pin_cached_weights()
+        return handle
+
+    def _retire(self, handle: ModelHandle):
+        """Stop handing out a handle; keep it until its in-flight requests finish"""
+        handle.retired = True
+        if handle.refs:
+            self._retired.append(handle)
+            logger.info(f"⏳ {handle.name} generation {handle.generation} draining ({handle.refs} in flight)")
+        else:
+            self._free(handle)
+
+    def _free(self, handle: ModelHandle):
+        # Weights are freed by refcounting; no gc.collect() here - a full collection
+        # stalls the event loop for ~200ms with torch loaded
+        handle.model = None
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        self._pin_cached_weights()
+        logger.info(f"♻️ Released {handle.name} generation {handle.generation} ({handle.resident_mb}MB)")
+
+    def _pin_cached_weights(self):
+        """Keep the weight files of every loaded version (current, candidate, draining) in the disk cache"""
+        handles = list(self._handles.values()) + [r.candidate for r in self._rollouts.values()] + self._retired
+        paths = {getattr(handle.model, "model_path", None) for handle in handles if handle.model is not None}
+        future = self._pin_writer.submit(get_model_cache().set_pinned, [path for path in paths if path])
+        future.add_done_callback(
+            lambda f: f.exception() and logger.warning(f"Could not pin cached model weights: {f.exception()}")
+        )
+
+    async def reload(self, name: str, version: str = "latest", force_download: bool = False) -> ModelHandle:
+        """
+        Load a new version next to the current one and swap it in without downtime
+
+        The new instance is loaded and warmed up in a worker thread; requests keep
+        using the current version until the swap and never see a half-initialized
+        model. If loading fails the current version stays.
+
+        Args:
+            name: 'threat_classifier', 'visual_detector' or 'audio_classifier'
+            version: Model storage version
+            force_download: Re-download weights from model storage
+
+        Returns:
+            The new current handle
+        """
+        if name not in _model_factories():
+            raise ValueError(f"Unknown model: {name}")
+
+        lock = self._reload_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            load_task = self._load_tasks.get(name)
+            if load_task is not None and not load_task.done():
+                await load_task
+
+            start = time.time()
+            logger.info(f"🔄 Shadow-loading {name} ({version})...")
+            model = await self._build(name, version, force_download)
+
+            handle = self._install(name, model, version if version != "latest" else None)
+            self._load_seconds[name] = round(time.time() - start, 2)
+            logger.info(
+                f"✅ {name} swapped to {handle.version} (generation {handle.generation}) "
+                f"in {time.time() - start:.1f}s"
+            )
+            self._enforce_budget(keep=name)
+            return handle
+
+    async def _build(self, name: str, version: str, force_download: bool):
+        """New warmed-up instance of a model, built in a worker thread"""
+        _, factory, _ = _model_factories()[name]
+        model = await asyncio.to_thread(_run_loader, functools.partial(factory, version, force_download))
+        if not getattr(model, "loaded", True):
+            raise RuntimeError(f"{name} {version} failed to load - keeping current version")
+        if hasattr(model, "warm_up"):
+            await asyncio.to_thread(model.warm_up)
+        return model
+
+    async def start_rollout(
+        self,
+        name: str,
+        version: str,
+        mode: str = "canary",
+        percent: float = 5.0,
+        force_download: bool = False
+    ) -> Rollout:
+        """
+        Load a candidate version next to the current one and start sending it traffic
+
+        Args:
+            name: 'visual_detector' or 'audio_classifier'
+            version: Model storage version of the candidate
+            mode: 'canary' (candidate serves percent of requests) or
+                'shadow' (candidate gets mirrored traffic only)
+            percent: Canary traffic share (0-100)
+            force_download: Re-download weights from model storage
+
+        Returns:
+            The new rollout (replaces any rollout already running for the model)
+        """
+        if name not in BACKGROUND_MODELS:
+            raise ValueError(f"Rollouts are not supported for model: {name}")
+        if settings.INFERENCE_SERVER_ENABLED:
+            raise ValueError("Rollouts are not available while models are served by the inference server")
+        self._validate_rollout(mode, percent)
+
+        lock = self._reload_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            load_task = self._load_tasks.get(name)
+            if load_task is not None and not load_task.done():
+                await load_task
+
+            start = time.time()
+            logger.info(f"🐤 Loading {name} {version} as {mode} candidate...")
+            model = await self._build(name, version, force_download)
+
+            if name in self._rollouts:
+                self.abort_rollout(name)
+            rollout = Rollout(
+                model_name=name,
+                candidate=self._new_handle(name, model, version if version != "latest" else None),
+                mode=mode,
+                percent=percent,
+                max_mirror_inflight=settings.MODEL_ROLLOUT_MAX_MIRRORS
+            )
+            self._rollouts[name] = rollout
+            self._pin_cached_weights()
+            logger.info(
+                f"✅ {name} candidate {rollout.candidate.version} in {mode} "
+                f"({percent}%) after {time.time() - start:.1f}s"
+            )
+            self._enforce_budget(keep=name)
+            return rollout
+
+    @staticmethod
+    def _validate_rollout(mode: str, percent: float):
+        if mode not in ROLLOUT_MODES:
+            raise ValueError(f"Unknown rollout mode: {mode}")
+        if not 0.0 <= percent <= 100.0:
+            raise ValueError("Rollout percent must be between 0 and 100")
+
+    def update_rollout(self, name: str, mode: Optional[str] = None, percent: Optional[float] = None) -> Rollout:
+        """Change the mode or canary share of a running rollout"""
+        rollout = self._rollouts.get(name)
+        if rollout is None:
+            raise KeyError(name)
+        mode = mode or rollout.mode
+        percent = rollout.percent if percent is None else percent
+        self._validate_rollout(mode, percent)
+        rollout.mode, rollout.percent = mode, percent
+        logger.info(f"🐤 {name} candidate {rollout.candidate.version} now {mode} ({percent}%)")
+        return rollout
+
+    def promote_rollout(self, name: str) -> ModelHandle:
+        """Make the candidate the current version (the incumbent drains)"""
+        rollout = self._rollouts.pop(name, None)
+        if rollout is None:
+            raise KeyError(name)
+        rollout.cancel_mirrors()
+        handle = self._install_handle(rollout.candidate)
+        logger.info(
+            f"✅ {name} candidate {handle.version} promoted "
+            f"(agreement {rollout.agreement_rate}, {rollout.stats['candidate'].count} requests)"
+        )
+        return handle
+
+    def abort_rollout(self, name: str):
+        """Stop a rollout and release the candidate"""
+        rollout = self._rollouts.pop(name, None)
+        if rollout is None:
+            raise KeyError(name)
+        rollout.cancel_mirrors()
+        self._retire(rollout.candidate)
+        logger.info(f"🛑 {name} rollout of {rollout.candidate.version} aborted")
+
+    def get_rollouts(self) -> Dict[str, Dict]:
+        """Summary of running rollouts per model"""
+        return {name: rollout.summary() for name, rollout in self._rollouts.items()}
+
+    @property
+    def resident_mb(self) -> float:
+        """Weights held by current, candidate and draining handles"""
+        return (
+            sum(h.resident_mb for h in self._handles.values())
+            + sum(r.candidate.resident_mb for r in self._rollouts.values())
+            + sum(h.resident_mb for h in self._retired)
+        )
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """Evict least-recently-used idle, unpinned models until within budget"""
+        while self.resident_mb > self.budget_mb:
+            candidates = [
+                name for name, handle in self._handles.items()
+                if name != keep and name not in self.pinned and name not in self._rollouts and not handle.refs
+            ]
+            if not candidates:
+                logger.warning(
+                    f"⚠️ Models use {self.resident_mb:.0f}MB (budget {self.budget_mb}MB), nothing evictable"
+                )
+                return
+            self.evict(min(candidates, key=lambda name: self._last_used.get(name, 0.0)))
+
+    def evict(self, name: str):
+        """Unload a model (it reloads on next use)"""
+        handle = self._handles.get(name)
+        if name in self.pinned or name in self._rollouts or handle is None or handle.refs:
+            return
+
+        del self._handles[name]
+        _, _, set_singleton = _model_factories()[name]
+        set_singleton(None)
+        self._status[name] = "unloaded"
+        self._evictions += 1
+        MODEL_RESIDENT_MB.labels(model=name).set(0)
+        self._free(handle)
+        logger.info(f"♻️ Evicted {name} - {self.resident_mb:.0f}/{self.budget_mb}MB resident")
+
+    async def preload(self, names: Tuple[str, ...] = BACKGROUND_MODELS) -> bool:
+        """
+        Load models now instead of on first use (serve.py before forking workers)
+
+        The memory budget still applies: models that do not fit are evicted
+        and load lazily in whichever worker needs them.
+        """
+        for name in names:
+            if self._status.get(name) in ("unloaded", "failed"):
+                self._start_load(name)
+        return await self.wait_until_ready()
+
+    def warm_up(self):
+        """Run each loaded model once in this process (blocking)"""
+        for name, handle in self._handles.items():
+            if handle.model is not None and hasattr(handle.model, "warm_up"):
+                handle.model.warm_up()
+
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background model loads in progress (True if every loaded model is ready)"""
+        tasks = [task for task in self._load_tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        return all(status in ("ready", "unloaded") for status in self._status.values())
+
+    def _current_handle(self, name: str) -> ModelHandle:
+        if not self._initialized:
+            raise RuntimeError("Model Manager not initialized - call get_instance() first")
+
+        status = self._status.get(name, "loading")
+        if status == "unloaded":
+            # Lazy load: this request gets a 503, the model loads in the background
+            self._start_load(name)
+            status = "loading"
+        if status != "ready":
+            retry_after = settings.MODEL_LOADING_RETRY_AFTER_SEC if status == "loading" else None
+            raise ModelNotReadyError(name, status, retry_after)
+
+        self._last_used[name] = time.time()
+        return self._handles[name]
+
+    def _select_handle(self, name: str, routing_key: Optional[str] = None) -> ModelHandle:
+        """Current handle, or the canary candidate for its share of traffic"""
+        handle = self._current_handle(name)
+        rollout = self._rollouts.get(name)
+        if rollout is not None and rollout.routes_to_candidate(routing_key):
+            return rollout.candidate
+        return handle
+
+    def _routed_handle(self, name: str) -> ModelHandle:
+        handle = _routed_handles.get().get(name)
+        if handle is None or handle.model is None:
+            handle = self._current_handle(name)
+        return handle
+
+    def _get_model(self, name: str):
+        return self._routed_handle(name).model
+
+    def acquire(self, name: str, routing_key: Optional[str] = None) -> ModelHandle:
+        """Take a reference on the routed version (pair with release())"""
+        handle = self._select_handle(name, routing_key)
+        handle.refs += 1
+        return handle
+
+    def release(self, handle: ModelHandle):
+        """Drop a reference; frees a retired handle once drained, re-checks the budget"""
+        handle.refs -= 1
+        self._last_used[handle.name] = time.time()
+        if handle.retired and not handle.refs and handle in self._retired:
+            self._retired.remove(handle)
+            self._free(handle)
+        if self.resident_mb > self.budget_mb:
+            self._enforce_budget()
+
+    @asynccontextmanager
+    async def use(self, name: str, routing_key: Optional[str] = None):
+        """
+        Hold the routed version of a model for the duration of a request
+
+        The held version is never evicted and, if a reload swaps in a new
+        version meanwhile, stays alive until released. Nested use() of the
+        same model holds the same version.
+
+        Usage:
+            async with manager.use("visual_detector") as detector:
+                result = await detector.detect_from_bytes(image_bytes)
+        """
+        handle = _routed_handles.get().get(name)
+        if handle is not None and handle.model is not None:
+            handle.refs += 1
+        else:
+            handle = self.acquire(name, routing_key)
+        token = _routed_handles.set({**_routed_handles.get(), name: handle})
+        try:
+            yield handle.model
+        finally:
+            _routed_handles.reset(token)
+            self.release(handle)
+
+    async def infer(self, name: str, method: str, *args, **kwargs):
+        """
+        Call an async inference method on the routed version of a model
+
+        The version is held for the duration of the call. Latency is recorded
+        per version. During a rollout the other version re-runs the call in the
+        background (candidate in shadow mode, incumbent for canary-served
+        requests) and the results are compared.
+
+        Usage:
+            result = await manager.infer("visual_detector", "detect_from_bytes", image_bytes)
+        """
+        handle = self._routed_handle(name)
+        rollout = self._rollouts.get(name)
+        role = "candidate" if rollout is not None and handle is rollout.candidate else "incumbent"
+
+        handle.refs += 1
+        try:
+            result = await self._timed_call(handle, role, rollout, method, args, kwargs)
+        finally:
+            self.release(handle)
+
+        if rollout is not None and self._rollouts.get(name) is rollout:
+            if role == "candidate":
+                peer, peer_role = self._handles.get(name), "incumbent"
+            else:
+                peer, peer_role = (rollout.candidate, "candidate") if rollout.mode == "shadow" else (None, None)
+
+            if peer is not None and peer.model is not None:
+                async def compare():
+                    if peer.model is None:
+                        return
+                    peer.refs += 1
+                    try:
+                        peer_result = await self._timed_call(peer, peer_role, rollout, method, args, kwargs)
+                    except Exception as e:
+                        logger.debug(f"{name} {peer_role} mirror call failed: {e}")
+                        return
+                    finally:
+                        self.release(peer)
+                    if role == "incumbent":
+                        rollout.record_agreement(result, peer_result)
+                    else:
+                        rollout.record_agreement(peer_result, result)
+
+                rollout.mirror(compare)
+
+        return result
+
+    async def _timed_call(self, handle: ModelHandle, role: str, rollout: Optional[Rollout], method: str, args, kwargs):
+        stats = rollout.stats[role] if rollout is not None else None
+        start = time.perf_counter()
+        try:
+            result = await getattr(handle.model, method)(*args, **kwargs)
+        except Exception:
+            if stats is not None:
+                stats.record(time.perf_counter() - start, ok=False)
+            raise
+
+        elapsed = time.perf_counter() - start
+        if stats is not None:
+            stats.record(elapsed)
+        INFERENCE_SECONDS.labels(model=handle.name, role=role, version=handle.version).observe(elapsed)
+        return result
+
+    def is_ready(self, name: str) -> bool:
+        return self._status.get(name) == "ready"
+
     @property
     def threat_classifier(self) -> ThreatClassifier:
         """Get shared threat classifier instance"""
-        if not self._initialized:
-            raise RuntimeError("Model Manager not initialized - call get_instance() first")
-        return self._threat_classifier
+        return self._get_model("threat_classifier")
 
     @property
     def visual_detector(self) -> VisualDetector:
-        """Get shared visual detector instance"""
-        if not self._initialized:
-            raise RuntimeError("Model Manager not initialized - call get_instance() first")
-        return self._visual_detector
+        """Get shared visual detector instance (ModelNotReadyError while loading)"""
+        return self._get_model("visual_detector")
 
     @property
     def audio_classifier(self) -> AudioClassifier:
-        """Get shared audio classifier instance"""
-        if not self._initialized:
-            raise RuntimeError("Model Manager not initialized - call get_instance() first")
-        return self._audio_classifier
+        """Get shared audio classifier instance (ModelNotReadyError while loading)"""
+        return self._get_model("audio_classifier")
+
+    def get_model_status(self) -> Dict[str, str]:
+        """Load state per model"""
+        return dict(self._status)
+
+    def _model_entry(self, name: str) -> Dict:
+        handle = self._handles.get(name)
+        return {
+            "loaded": self.is_ready(name),
+            "status": self._status.get(name, "unloaded"),
+            "version": handle.version if handle else None,
+            "generation": handle.generation if handle else None,
+            "load_seconds": self._load_seconds.get(name),
+            "error": self._errors.get(name),
+            "resident_mb": handle.resident_mb if handle else 0.0,
+            "pinned": name in self.pinned,
+            "in_use": handle.refs if handle else 0,
+            "draining": sum(1 for h in self._retired if h.name == name),
+            "last_used": self._last_used.get(name),
+            "rollout": self._rollouts[name].summary() if name in self._rollouts else None
+        }
 
     def get_model_info(self) -> dict:
         """Get information about loaded models"""
@@ -105,21 +694,26 @@ class ModelManager:
             "initialized": self._initialized,
             "models": {
                 "threat_classifier": {
-                    "loaded": self._threat_classifier is not None,
+                    **self._model_entry("threat_classifier"),
                     "type": "ThreatClassifier",
                     "shared_by": ["Halo", "SAIT", "Frontline"]
                 },
                 "visual_detector": {
-                    "loaded": self._visual_detector is not None,
+                    **self._model_entry("visual_detector"),
                     "type": "VisualDetector (YOLOv8)",
                     "shared_by": ["Halo", "Frontline"]
                 },
                 "audio_classifier": {
-                    "loaded": self._audio_classifier is not None,
+                    **self._model_entry("audio_classifier"),
                     "type": "AudioClassifier (30 SAIT classes)",
                     "shared_by": ["Halo", "SAIT", "Frontline"]
                 }
             },
+            "memory": {
+                "budget_mb": self.budget_mb,
+                "resident_mb": round(self.resident_mb, 1),
+                "evictions": self._evictions
+            },
             "architecture": "central_stack",
             "memory_efficiency": "3x better than separate instances"
         }
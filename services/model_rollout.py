@@ -0,0 +1,184 @@
+"""
+Model Rollouts
+Canary and shadow traffic between the incumbent version of a model and a candidate
+
+- canary: percent of requests (sticky per routing key, e.g. device_id) are served
+  by the candidate; the incumbent re-runs them in the background for comparison
+- shadow: every response comes from the incumbent; the candidate runs the same
+  call in the background and its result is only compared, never returned
+
+Per-version latency lands in atlas_model_inference_seconds{model, role, version};
+agreement with the incumbent in atlas_model_rollout_agreement_total.
+"""
+
+import asyncio
+import random
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+
+ROLLOUT_MODES = ("canary", "shadow")
+
+# Latency samples kept per version for the rollout summary
+LATENCY_RESERVOIR = 2000
+
+INFERENCE_SECONDS = Histogram(
+    "atlas_model_inference_seconds",
+    "Model inference latency per version",
+    ["model", "role", "version"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+ROLLOUT_AGREEMENT = Counter(
+    "atlas_model_rollout_agreement_total",
+    "Candidate results compared with the incumbent",
+    ["model", "version", "result"]
+)
+ROLLOUT_MIRRORS_DROPPED = Counter(
+    "atlas_model_rollout_mirrors_dropped_total",
+    "Comparison runs skipped because the mirror concurrency limit was reached",
+    ["model"]
+)
+
+
+def result_label(result: Any) -> Optional[Hashable]:
+    """
+    Comparable label of a model result (None = not comparable)
+
+    - Audio: SAIT class id
+    - Visual: sorted set of detected classes
+    - Threat classifier: threat category
+    """
+    if not isinstance(result, dict) or result.get("success") is False:
+        return None
+    if "sait_classification" in result:
+        return result["sait_classification"].get("class_id")
+    if "objects_detected" in result:
+        return tuple(sorted({obj.get("class") for obj in result["objects_detected"]}))
+    if "threat_category" in result:
+        return result["threat_category"]
+    return None
+
+
+class VersionStats:
+    """Request count, errors and a latency reservoir for one version"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=LATENCY_RESERVOIR)
+
+    def record(self, seconds: float, ok: bool = True):
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self._latencies.append(seconds)
+
+    def summary(self) -> Dict:
+        latencies = np.asarray(self._latencies) * 1000.0
+        return {
+            "requests": self.count,
+            "errors": self.errors,
+            "p50_ms": round(float(np.percentile(latencies, 50)), 2) if len(latencies) else None,
+            "p95_ms": round(float(np.percentile(latencies, 95)), 2) if len(latencies) else None,
+            "p99_ms": round(float(np.percentile(latencies, 99)), 2) if len(latencies) else None
+        }
+
+
+@dataclass
+class Rollout:
+    """Candidate version of a model receiving canary or shadow traffic"""
+    model_name: str
+    candidate: Any  # ModelHandle
+    mode: str
+    percent: float
+    max_mirror_inflight: int = 4
+    started_at: float = field(default_factory=time.time)
+    stats: Dict[str, VersionStats] = field(default_factory=lambda: {
+        "incumbent": VersionStats(),
+        "candidate": VersionStats()
+    })
+    agree: int = 0
+    disagree: int = 0
+    mirrors_dropped: int = 0
+
+    def __post_init__(self):
+        self._mirror_slots = asyncio.Semaphore(self.max_mirror_inflight)
+        self._tasks = set()
+
+    def routes_to_candidate(self, routing_key: Optional[str] = None) -> bool:
+        """Canary split (sticky when a routing key is given)"""
+        if self.mode != "canary" or self.percent <= 0:
+            return False
+        if routing_key is not None:
+            return zlib.crc32(routing_key.encode()) % 10000 < self.percent * 100
+        return random.random() * 100 < self.percent
+
+    def record_agreement(self, incumbent_result: Any, candidate_result: Any):
+        """Compare results (per item for batch results)"""
+        if isinstance(incumbent_result, list) and isinstance(candidate_result, list):
+            pairs = list(zip(incumbent_result, candidate_result))
+        else:
+            pairs = [(incumbent_result, candidate_result)]
+
+        for incumbent, candidate in pairs:
+            incumbent_label, candidate_label = result_label(incumbent), result_label(candidate)
+            if incumbent_label is None or candidate_label is None:
+                continue
+            agreed = incumbent_label == candidate_label
+            if agreed:
+                self.agree += 1
+            else:
+                self.disagree += 1
+            ROLLOUT_AGREEMENT.labels(
+                model=self.model_name,
+                version=self.candidate.version,
+                result="agree" if agreed else "disagree"
+            ).inc()
+
+    def mirror(self, coroutine_factory):
+        """
+        Run a comparison call in the background, bounded by max_mirror_inflight
+
+        Returns:
+            False if the call was dropped (limit reached)
+        """
+        if self._mirror_slots.locked():
+            self.mirrors_dropped += 1
+            ROLLOUT_MIRRORS_DROPPED.labels(model=self.model_name).inc()
+            return False
+
+        async def run():
+            async with self._mirror_slots:
+                await coroutine_factory()
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def cancel_mirrors(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    @property
+    def agreement_rate(self) -> Optional[float]:
+        compared = self.agree + self.disagree
+        return round(self.agree / compared, 4) if compared else None
+
+    def summary(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "percent": self.percent,
+            "candidate_version": self.candidate.version,
+            "candidate_generation": self.candidate.generation,
+            "started_at": self.started_at,
+            "latency": {role: stats.summary() for role, stats in self.stats.items()},
+            "compared": self.agree + self.disagree,
+            "agreement_rate": self.agreement_rate,
+            "mirrors_dropped": self.mirrors_dropped
+        }
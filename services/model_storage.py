@@ -8,28 +8,132 @@ This enables model updates WITHOUT code redeployment:
 3. Models auto-download on next startup or reload endpoint
 
 Railway-optimized: Minimal redeployments, maximum flexibility
+
+Downloads are parallel ranged GETs into `<model>.part` (progress kept in
+`<model>.part.json`, so an interrupted download resumes), verified against
+the SHA-256 in metadata.json and only then moved into the local model cache
+(services.model_cache) - a cached model file is always complete.
+
+Cached versions are immutable and served without touching S3; 'latest' is
+revalidated with a HEAD (ETag) on every get_model() call.
+
+metadata.json and version listings are cached for MODEL_METADATA_CACHE_TTL_SEC;
+stale metadata is revalidated with If-None-Match (a 304 costs no transfer), and
+concurrent callers of one key share a single S3 request.
+
+The prefetcher (start_prefetcher) polls each model's metadata.json the same way
+and downloads a newly announced version into the cache in the background, at
+most MODEL_PREFETCH_MAX_MBPS - a later reload of it is a local swap.
 """
 
 import logging
 import os
 import asyncio
+import fcntl
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Any, Callable, Optional, Dict, List, Set, Tuple
 import hashlib
 import json
 from datetime import datetime
 
+from config.settings import settings
+from services.model_cache import get_model_cache
+
 logger = logging.getLogger(__name__)
 
 # Try to import boto3, but make it optional for local dev
 try:
     import boto3
-    from botocore.exceptions import ClientError
+    from botocore.config import Config
+    from botocore.exceptions import BotoCoreError, ClientError
     S3_AVAILABLE = True
 except ImportError:
     S3_AVAILABLE = False
     logger.warning("boto3 not installed - S3 model storage disabled (local dev mode)")
 
+# Attempts per ranged GET before the download is abandoned (and left to resume)
+PART_RETRIES = 3
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+# v1, 1.2, v2.10.3, 2.0.0-rc.1 (build metadata ignored)
+SEMVER_PATTERN = re.compile(r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$")
+
+
+def version_sort_key(version: str) -> tuple:
+    """
+    Sort key ordering versions by semantic version (ascending)
+
+    Missing minor/patch count as 0, a pre-release sorts before its release
+    (numeric identifiers numerically). Versions that aren't semver sort
+    before all semver ones, lexicographically.
+    """
+    match = SEMVER_PATTERN.match(version)
+    if not match:
+        return (0, version)
+
+    major, minor, patch, prerelease = match.groups()
+    core = (int(major), int(minor or 0), int(patch or 0))
+    if prerelease is None:
+        return (1, core, (1,), version)
+    identifiers = tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in prerelease.split(".")
+    )
+    return (1, core, (0, identifiers), version)
+
+
+class BandwidthLimiter:
+    """Token bucket shared by the part downloads of one transfer (thread-safe)"""
+
+    def __init__(self, bytes_per_sec: float):
+        self.rate = bytes_per_sec
+        # One second of burst
+        self._tokens = bytes_per_sec
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size: int):
+        """Block until size bytes may be transferred"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate) - size
+            self._updated = now
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+class ModelIntegrityError(Exception):
+    """Downloaded model does not match its published SHA-256"""
+
+
+def _sha256_file(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _fsync_dir(path: Path):
+    """Persist a rename in the directory"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class ModelStorage:
     """
@@ -63,6 +167,17 @@ class ModelStorage:
         self.s3_secret_key = os.getenv("S3_SECRET_KEY")
 
         self.s3_client = None
+        self.cache = get_model_cache()
+
+        # Metadata / version listing cache: key -> {"value", "etag", "checked_at"}
+        self.metadata_ttl = settings.MODEL_METADATA_CACHE_TTL_SEC
+        self._metadata_cache: Dict[str, Dict[str, Any]] = {}
+        self._metadata_locks: Dict[str, threading.Lock] = {}
+        self._metadata_locks_guard = threading.Lock()
+
+        # Background prefetch of announced versions: model file -> last outcome
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._prefetch_status: Dict[str, Dict[str, Any]] = {}
 
         if self.storage_type == "s3":
             if not S3_AVAILABLE:
@@ -87,7 +202,9 @@ class ModelStorage:
                 endpoint_url=self.s3_endpoint,
                 aws_access_key_id=self.s3_access_key,
                 aws_secret_access_key=self.s3_secret_key,
-                region_name=self.s3_region
+                region_name=self.s3_region,
+                # One pooled connection per concurrent part download
+                config=Config(max_pool_connections=max(10, settings.MODEL_DOWNLOAD_CONCURRENCY))
             )
 
             # Test connection
@@ -119,64 +236,276 @@ class ModelStorage:
         """
         version = version or "latest"
 
-        # Local cache path
-        local_path = self.local_cache_dir / model_name
-
-        # Check local cache first (unless force_download)
-        if not force_download and local_path.exists():
-            logger.info(f"📂 Using cached model: {local_path}")
-            return local_path
-
-        # Download from S3 if configured
         if self.storage_type == "s3" and self.s3_client:
-            return await self._download_from_s3(model_name, version, local_path)
-
-        # Local storage mode - check if file exists
+            cached = await asyncio.to_thread(self.cache.get, model_name, version)
+            if cached is not None and not force_download:
+                if version != "latest":
+                    logger.info(f"📂 Using cached model: {model_name} {version}")
+                    return cached.path
+                # 'latest' moves: reuse the cached copy while the S3 object is unchanged
+                head = await self._head_model(model_name, version)
+                if head is None or head['ETag'] == cached.etag:
+                    logger.info(f"📂 Using cached model: {model_name} latest")
+                    return cached.path
+
+            downloaded = await self._download_from_s3(model_name, version)
+            if downloaded is None and cached is not None:
+                logger.warning(f"⚠️ Using cached {model_name} {version} after failed download")
+                return cached.path
+            return downloaded
+
+        # Local storage mode - files placed in the model directory
+        local_path = self.local_cache_dir / model_name
         if local_path.exists():
+            logger.info(f"📂 Using local model: {local_path}")
             return local_path
 
         logger.warning(f"⚠️ Model not found: {model_name}")
         return None
 
+    @staticmethod
+    def _s3_key(model_name: str, version: str) -> str:
+        # S3 key format: models/yolov8m/v1.0.0/yolov8m.pt
+        # Or for latest: models/yolov8m/latest/yolov8m.pt
+        return f"models/{model_name.split('.')[0]}/{version}/{model_name}"
+
+    async def _head_model(self, model_name: str, version: str) -> Optional[Dict]:
+        """HEAD of a model object, or None when S3 can't be reached"""
+        try:
+            return await asyncio.to_thread(
+                self.s3_client.head_object,
+                Bucket=self.s3_bucket,
+                Key=self._s3_key(model_name, version)
+            )
+        except Exception as e:
+            logger.warning(f"Could not revalidate {model_name} {version}: {e}")
+            return None
+
     async def _download_from_s3(
         self,
         model_name: str,
         version: str,
-        local_path: Path
+        limiter: Optional[BandwidthLimiter] = None
     ) -> Optional[Path]:
-        """Download model from S3"""
+        """Download model from S3 into the cache (parallel, resumable, verified first)"""
+        s3_key = self._s3_key(model_name, version)
         try:
-            # S3 key format: models/yolov8m/v1.0.0/yolov8m.pt
-            # Or for latest: models/yolov8m/latest/yolov8m.pt
-            s3_key = f"models/{model_name.split('.')[0]}/{version}/{model_name}"
+            expected_sha256 = await self._expected_sha256(model_name, version)
+
+            # Content already cached under another version (e.g. 'latest' == v2.1.0): no download
+            head = await self._head_model(model_name, version)
+            if head is not None:
+                known_sha256 = expected_sha256 or head.get('Metadata', {}).get('sha256')
+                cached = known_sha256 and await asyncio.to_thread(
+                    self.cache.link, model_name, version, known_sha256.lower(), head['ETag']
+                )
+                if cached:
+                    logger.info(f"📂 {model_name} {version} already cached as {known_sha256[:12]}")
+                    return cached.path
 
             logger.info(f"⬇️ Downloading {model_name} v{version} from S3...")
 
-            # Download to local cache
-            await asyncio.to_thread(
-                self.s3_client.download_file,
-                self.s3_bucket,
-                s3_key,
-                str(local_path)
+            staging_path = self.cache.download_path(model_name, version)
+            started = time.monotonic()
+            size, sha256, etag = await asyncio.to_thread(
+                self._fetch_object, s3_key, staging_path, expected_sha256, limiter
             )
+            cached = await asyncio.to_thread(self.cache.put, model_name, version, staging_path, sha256, etag)
 
-            logger.info(f"✅ Model downloaded: {local_path}")
-            return local_path
+            elapsed = time.monotonic() - started
+            logger.info(f"✅ Model downloaded: {model_name} {version} ({size / (1024 * 1024):.1f}MB in {elapsed:.1f}s)")
+            return cached.path
 
         except ClientError as e:
-            if e.response['Error']['Code'] == '404':
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
                 logger.error(f"❌ Model not found in S3: {s3_key}")
             else:
                 logger.error(f"❌ S3 download failed: {e}")
             return None
+        except ModelIntegrityError as e:
+            logger.error(f"❌ {e}")
+            return None
         except Exception as e:
             logger.error(f"❌ Download failed: {e}")
             return None
 
-    async def get_model_metadata(self, model_name: str) -> Optional[Dict]:
+    async def _expected_sha256(self, model_name: str, version: str) -> Optional[str]:
+        """Checksum published in metadata.json, when it describes the requested version"""
+        # Revalidated (not TTL-cached): a stale checksum would reject a fresh 'latest'
+        metadata = await self.get_model_metadata(model_name, max_age=0)
+        if metadata and metadata.get("sha256") and version in ("latest", metadata.get("version")):
+            return metadata["sha256"].lower()
+        return None
+
+    def _fetch_object(
+        self,
+        s3_key: str,
+        local_path: Path,
+        expected_sha256: Optional[str],
+        limiter: Optional[BandwidthLimiter] = None
+    ) -> Tuple[int, str, str]:
+        """
+        Download an S3 object to local_path (blocking; runs in a worker thread)
+
+        Ranged GETs run in parallel into local_path.part. Completed parts are
+        recorded in local_path.part.json so a crashed or failed download resumes
+        where it stopped. The file is verified, then atomically renamed.
+        limiter caps the transfer rate. Returns the object size, its SHA-256 and ETag.
+        """
+        lock_path = local_path.with_name(local_path.name + ".lock")
+        with open(lock_path, "a") as lock_file:
+            # One downloader per file, across threads and worker processes
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            try:
+                return self._fetch_object_locked(s3_key, local_path, expected_sha256, limiter)
+            except ClientError as e:
+                if e.response['Error']['Code'] not in ('412', 'PreconditionFailed'):
+                    raise
+                # The object was replaced mid-download (e.g. a new 'latest'): start over once
+                logger.warning(f"⚠️ {s3_key} changed during download, restarting")
+                self._discard_partial(local_path)
+                return self._fetch_object_locked(s3_key, local_path, expected_sha256, limiter)
+
+    def _fetch_object_locked(
+        self,
+        s3_key: str,
+        local_path: Path,
+        expected_sha256: Optional[str],
+        limiter: Optional[BandwidthLimiter]
+    ) -> Tuple[int, str, str]:
+        part_path = local_path.with_name(local_path.name + ".part")
+        state_path = local_path.with_name(local_path.name + ".part.json")
+
+        head = self.s3_client.head_object(Bucket=self.s3_bucket, Key=s3_key)
+        size, etag = head['ContentLength'], head['ETag']
+        # metadata.json only describes the current version; uploads also carry their own checksum
+        expected_sha256 = expected_sha256 or head.get('Metadata', {}).get('sha256')
+        if not expected_sha256:
+            logger.warning(f"⚠️ No published SHA-256 for {s3_key}, download is not verified")
+        elif self.cache.find_blob(expected_sha256.lower(), local_path.suffix):
+            # Fetched by another worker (or the prefetcher) while we waited for the lock
+            self._discard_partial(local_path)
+            return size, expected_sha256.lower(), etag
+
+        part_size = max(1, settings.MODEL_DOWNLOAD_PART_MB) * 1024 * 1024
+        parts = math.ceil(size / part_size)
+        state = {"etag": etag, "size": size, "part_size": part_size}
+
+        done = self._load_download_state(state_path, part_path, state)
+        if done is None:
+            done = set()
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+        elif done:
+            logger.info(f"↩️ Resuming {s3_key} ({len(done)}/{parts} parts already downloaded)")
+
+        pending = [index for index in range(parts) if index not in done]
+        fd = os.open(part_path, os.O_WRONLY)
+        try:
+            workers = max(1, min(settings.MODEL_DOWNLOAD_CONCURRENCY, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="model-download") as pool:
+                futures = [
+                    pool.submit(self._fetch_part, s3_key, etag, fd, index, part_size, size, limiter)
+                    for index in pending
+                ]
+                try:
+                    for future in as_completed(futures):
+                        done.add(future.result())
+                        self._save_download_state(state_path, {**state, "done": sorted(done)})
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        actual = _sha256_file(part_path)
+        if expected_sha256 and actual != expected_sha256.lower():
+            self._discard_partial(local_path)
+            raise ModelIntegrityError(
+                f"Checksum mismatch for {s3_key}: expected {expected_sha256}, got {actual}"
+            )
+
+        os.replace(part_path, local_path)
+        state_path.unlink(missing_ok=True)
+        _fsync_dir(local_path.parent)
+        return size, actual, etag
+
+    def _fetch_part(
+        self,
+        s3_key: str,
+        etag: str,
+        fd: int,
+        index: int,
+        part_size: int,
+        size: int,
+        limiter: Optional[BandwidthLimiter] = None
+    ) -> int:
+        """Download one byte range into the part file; returns the part index"""
+        start = index * part_size
+        end = min(size, start + part_size) - 1
+
+        for attempt in range(1, PART_RETRIES + 1):
+            try:
+                response = self.s3_client.get_object(
+                    Bucket=self.s3_bucket,
+                    Key=s3_key,
+                    Range=f"bytes={start}-{end}",
+                    IfMatch=etag
+                )
+                offset = start
+                for chunk in response['Body'].iter_chunks(READ_CHUNK_BYTES):
+                    if limiter is not None:
+                        limiter.consume(len(chunk))
+                    view = memoryview(chunk)
+                    while view:
+                        written = os.pwrite(fd, view, offset)
+                        view = view[written:]
+                        offset += written
+                if offset != end + 1:
+                    raise IOError(f"short read ({offset - start}/{end + 1 - start} bytes)")
+                return index
+            except ClientError:
+                raise
+            except (BotoCoreError, OSError) as e:
+                if attempt == PART_RETRIES:
+                    raise
+                logger.warning(f"⚠️ Part {index} of {s3_key} failed ({e}), retrying")
+                time.sleep(0.5 * attempt)
+
+    @staticmethod
+    def _load_download_state(state_path: Path, part_path: Path, state: Dict) -> Optional[Set[int]]:
+        """Completed parts of a previous attempt, or None when it can't be resumed"""
+        try:
+            saved = json.loads(state_path.read_text())
+            if any(saved.get(key) != value for key, value in state.items()):
+                return None
+            if part_path.stat().st_size != state["size"]:
+                return None
+            return set(saved.get("done", []))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _save_download_state(state_path: Path, state: Dict):
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, state_path)
+
+    @staticmethod
+    def _discard_partial(local_path: Path):
+        for suffix in (".part", ".part.json"):
+            local_path.with_name(local_path.name + suffix).unlink(missing_ok=True)
+
+    async def get_model_metadata(self, model_name: str, max_age: Optional[float] = None) -> Optional[Dict]:
         """
         Get model metadata from S3 (version, checksum, etc.)
 
+        Served from memory for max_age seconds (default MODEL_METADATA_CACHE_TTL_SEC),
+        then revalidated with the object's ETag. max_age=0 always revalidates.
+
         Metadata file format (JSON in S3):
         {
             "model_name": "yolov8m",
@@ -190,23 +519,71 @@ class ModelStorage:
         if self.storage_type != "s3" or not self.s3_client:
             return None
 
-        try:
-            # Metadata key: models/yolov8m/metadata.json
-            s3_key = f"models/{model_name.split('.')[0]}/metadata.json"
+        # Metadata key: models/yolov8m/metadata.json
+        s3_key = f"models/{model_name.split('.')[0]}/metadata.json"
 
-            response = await asyncio.to_thread(
-                self.s3_client.get_object,
-                Bucket=self.s3_bucket,
-                Key=s3_key
+        try:
+            return await asyncio.to_thread(
+                self._cached_fetch, s3_key, self._fetch_metadata,
+                self.metadata_ttl if max_age is None else max_age
             )
-
-            metadata = json.loads(response['Body'].read())
-            return metadata
-
         except Exception as e:
             logger.warning(f"Could not fetch metadata for {model_name}: {e}")
             return None
 
+    def _cached_fetch(self, key: str, fetch: Callable, max_age: float):
+        """
+        Cached value for key, refreshed by fetch(key, cached entry or None) once older than max_age
+
+        fetch returns (value, etag); it may return the cached entry's value when
+        S3 answered 304. Runs in a worker thread; one fetch per key at a time.
+        """
+        entry = self._metadata_cache.get(key)
+        if entry is not None and time.monotonic() - entry["checked_at"] < max_age:
+            return entry["value"]
+
+        with self._metadata_locks_guard:
+            lock = self._metadata_locks.setdefault(key, threading.Lock())
+        with lock:
+            # Another caller may have refreshed it while we waited
+            entry = self._metadata_cache.get(key)
+            if entry is not None and time.monotonic() - entry["checked_at"] < max_age:
+                return entry["value"]
+
+            try:
+                value, etag = fetch(key, entry)
+            except Exception as e:
+                if entry is None:
+                    raise
+                logger.warning(f"Serving stale {key} ({e})")
+                return entry["value"]
+            self._metadata_cache[key] = {"value": value, "etag": etag, "checked_at": time.monotonic()}
+            return value
+
+    def _fetch_metadata(self, s3_key: str, entry: Optional[Dict]) -> Tuple[Optional[Dict], Optional[str]]:
+        """GET metadata.json, conditional on the cached ETag"""
+        request = {"Bucket": self.s3_bucket, "Key": s3_key}
+        if entry is not None and entry["etag"]:
+            request["IfNoneMatch"] = entry["etag"]
+
+        try:
+            response = self.s3_client.get_object(**request)
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code in ('304', 'NotModified'):
+                return entry["value"], entry["etag"]
+            if code in ('404', 'NoSuchKey'):
+                return None, None
+            raise
+
+        return json.loads(response['Body'].read()), response.get('ETag')
+
+    def invalidate_metadata(self, model_name: str):
+        """Drop cached metadata and version listing of a model (after an upload)"""
+        stem = model_name.split('.')[0]
+        for key in (f"models/{stem}/metadata.json", f"models/{stem}/"):
+            self._metadata_cache.pop(key, None)
+
     async def upload_model(
         self,
         local_path: Path,
@@ -233,27 +610,24 @@ class ModelStorage:
         try:
             # Upload model file
             s3_key = f"models/{model_name}/{version}/{local_path.name}"
+            sha256 = await asyncio.to_thread(_sha256_file, local_path)
 
             logger.info(f"⬆️ Uploading {local_path.name} to S3...")
 
+            # The object carries its own checksum, so any version can be verified on download
             await asyncio.to_thread(
                 self.s3_client.upload_file,
                 str(local_path),
                 self.s3_bucket,
-                s3_key
+                s3_key,
+                ExtraArgs={'Metadata': {'sha256': sha256}}
             )
 
             # Upload metadata if provided
             if metadata:
                 metadata['uploaded_at'] = datetime.utcnow().isoformat()
                 metadata['version'] = version
-
-                # Calculate SHA256
-                sha256 = hashlib.sha256()
-                with open(local_path, 'rb') as f:
-                    for chunk in iter(lambda: f.read(8192), b''):
-                        sha256.update(chunk)
-                metadata['sha256'] = sha256.hexdigest()
+                metadata['sha256'] = sha256
                 metadata['file_size_mb'] = local_path.stat().st_size / (1024 * 1024)
 
                 # Upload metadata.json
@@ -275,6 +649,7 @@ class ModelStorage:
                     Key=latest_key
                 )
 
+            self.invalidate_metadata(model_name)
             logger.info(f"✅ Model uploaded: {s3_key}")
             return True
 
@@ -282,31 +657,115 @@ class ModelStorage:
             logger.error(f"❌ Upload failed: {e}")
             return False
 
-    async def list_model_versions(self, model_name: str) -> list:
-        """List all versions of a model in S3"""
+    async def list_model_versions(self, model_name: str, max_age: Optional[float] = None) -> List[str]:
+        """
+        List all versions of a model in S3, newest (highest semantic version) first
+
+        Every page of the listing is read; the result is cached like metadata.
+        """
         if self.storage_type != "s3" or not self.s3_client:
             return []
 
         try:
-            prefix = f"models/{model_name}/"
-            response = await asyncio.to_thread(
-                self.s3_client.list_objects_v2,
-                Bucket=self.s3_bucket,
-                Prefix=prefix,
-                Delimiter='/'
+            prefix = f"models/{model_name.split('.')[0]}/"
+            return await asyncio.to_thread(
+                self._cached_fetch, prefix, self._fetch_versions,
+                self.metadata_ttl if max_age is None else max_age
             )
 
-            versions = []
-            for prefix_info in response.get('CommonPrefixes', []):
+        except Exception as e:
+            logger.error(f"Failed to list versions: {e}")
+            return []
+
+    def _fetch_versions(self, prefix: str, entry: Optional[Dict]) -> Tuple[List[str], None]:
+        """Version prefixes under a model, across all list_objects_v2 pages"""
+        versions = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=prefix, Delimiter='/'):
+            for prefix_info in page.get('CommonPrefixes', []):
                 version = prefix_info['Prefix'].rstrip('/').split('/')[-1]
                 if version not in ['latest', 'metadata.json']:
                     versions.append(version)
 
-            return sorted(versions, reverse=True)
+        # Listings carry no validator: the TTL alone bounds their staleness
+        return sorted(versions, key=version_sort_key, reverse=True), None
 
-        except Exception as e:
-            logger.error(f"Failed to list versions: {e}")
-            return []
+
+    async def prefetch(self, model_name: str) -> Optional[Path]:
+        """
+        Download the version announced in metadata.json into the cache, if not cached yet
+
+        Args:
+            model_name: Model file, e.g. 'yolov8m.pt'
+
+        Returns:
+            Cached path of the new version, or None when there was nothing to fetch
+        """
+        metadata = await self.get_model_metadata(model_name, max_age=0)
+        version = (metadata or {}).get("version")
+        if not version:
+            return None
+
+        sha256 = (metadata.get("sha256") or "").lower()
+        if await asyncio.to_thread(self.cache.contains, model_name, version):
+            return None
+        if sha256 and self.cache.find_blob(sha256, Path(model_name).suffix):
+            # Same content as a cached version: index it, nothing to download
+            await asyncio.to_thread(self.cache.link, model_name, version, sha256)
+            return None
+
+        status = self._prefetch_status.setdefault(model_name, {})
+        logger.info(f"🔭 {model_name} {version} announced, prefetching into the model cache...")
+        cap_mbps = settings.MODEL_PREFETCH_MAX_MBPS
+        limiter = BandwidthLimiter(cap_mbps * 1024 * 1024) if cap_mbps > 0 else None
+        path = await self._download_from_s3(model_name, version, limiter=limiter)
+        status.update({
+            "version": version,
+            "status": "cached" if path else "failed",
+            "at": datetime.utcnow().isoformat()
+        })
+        return path
+
+    async def _prefetch_loop(self, model_names: List[str], interval: float):
+        while True:
+            for model_name in model_names:
+                try:
+                    await self.prefetch(model_name)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"⚠️ Prefetch of {model_name} failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start_prefetcher(self) -> bool:
+        """Start polling metadata.json of MODEL_PREFETCH_MODELS (S3 storage only)"""
+        if not settings.MODEL_PREFETCH_ENABLED or self.storage_type != "s3" or not self.s3_client:
+            return False
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            return True
+
+        interval = max(1.0, settings.MODEL_PREFETCH_INTERVAL_SEC)
+        self._prefetch_task = asyncio.get_running_loop().create_task(
+            self._prefetch_loop(list(settings.MODEL_PREFETCH_MODELS), interval)
+        )
+        logger.info(
+            f"🔭 Model prefetcher watching {', '.join(settings.MODEL_PREFETCH_MODELS)} every {interval:.0f}s"
+            + (f" (max {settings.MODEL_PREFETCH_MAX_MBPS}MB/s)" if settings.MODEL_PREFETCH_MAX_MBPS > 0 else "")
+        )
+        return True
+
+    async def stop_prefetcher(self):
+        """Cancel the prefetcher (an interrupted download resumes next time)"""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def prefetch_status(self) -> Dict[str, Any]:
+        return {
+            "running": self._prefetch_task is not None and not self._prefetch_task.done(),
+            "models": self._prefetch_status
+        }
 
 
 # Singleton instance
@@ -0,0 +1,178 @@
+"""
+OTA Delta Packages
+Block-level binary diffs between two OTA artifacts (rsync-style matching)
+
+Delta layout:
+    MAGIC (5 bytes) | base sha256 (32) | target sha256 (32) | target size (u64 LE)
+    | zlib(op stream)
+
+Op stream (little-endian):
+    b"C" offset:u64 length:u32   copy bytes from the base artifact
+    b"L" length:u32 data         literal bytes
+
+Devices apply the ops to the artifact they already hold and check the
+SHA-256 of the result against the target checksum before installing.
+"""
+
+import hashlib
+import struct
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+MAGIC = b"ATLD\x01"
+HEADER = struct.Struct("<5s32s32sQ")
+COPY_OP = struct.Struct("<QI")
+LITERAL_OP = struct.Struct("<I")
+
+# Match granularity (smaller finds more matches, larger builds faster)
+DEFAULT_BLOCK_SIZE = 1024
+
+# Weak rolling hash modulus (mixes the two checksum components)
+_WEAK_MASK = (1 << 62) - 1
+
+
+def _strong_hash(block) -> bytes:
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+def _weak_hashes(data: np.ndarray, block_size: int, positions: np.ndarray) -> np.ndarray:
+    """
+    Rolling checksums of data[p:p + block_size] for every p in positions
+
+    a = sum(x), b = sum((k - p) * x[k]); computed from prefix sums so every
+    window position costs O(1) in vectorized NumPy.
+    """
+    values = data.astype(np.int64)
+    index = np.arange(len(values), dtype=np.int64)
+    sums = np.concatenate([[0], np.cumsum(values)])
+    weighted = np.concatenate([[0], np.cumsum(index * values)])
+
+    a = sums[positions + block_size] - sums[positions]
+    b = weighted[positions + block_size] - weighted[positions] - positions * a
+    return (a ^ (b << 20)) & _WEAK_MASK
+
+
+def compute_delta(base: bytes, target: bytes, block_size: int = DEFAULT_BLOCK_SIZE) -> bytes:
+    """
+    Build a delta that turns base into target
+
+    Args:
+        base: Artifact the device already has
+        target: Artifact to deliver
+        block_size: Match granularity in bytes
+
+    Returns:
+        Delta package bytes
+    """
+    base_view = memoryview(base)
+    target_view = memoryview(target)
+    base_arr = np.frombuffer(base, dtype=np.uint8)
+    target_arr = np.frombuffer(target, dtype=np.uint8)
+
+    # Index aligned base blocks: weak hash -> {strong hash: offset}
+    block_index: Dict[int, Dict[bytes, int]] = {}
+    n_blocks = len(base) // block_size
+    if n_blocks:
+        offsets = np.arange(n_blocks, dtype=np.int64) * block_size
+        for offset, weak in zip(offsets.tolist(), _weak_hashes(base_arr, block_size, offsets).tolist()):
+            strong = _strong_hash(base_view[offset:offset + block_size])
+            block_index.setdefault(weak, {}).setdefault(strong, offset)
+
+    ops: List[bytes] = []
+
+    def emit_literal(start: int, end: int):
+        if end > start:
+            ops.append(b"L" + LITERAL_OP.pack(end - start))
+            ops.append(bytes(target_view[start:end]))
+
+    literal_start = 0
+    position = 0
+
+    if block_index and len(target) >= block_size:
+        positions = np.arange(len(target) - block_size + 1, dtype=np.int64)
+        weak_hashes = _weak_hashes(target_arr, block_size, positions)
+        candidates = np.nonzero(np.isin(weak_hashes, np.fromiter(block_index.keys(), dtype=np.int64)))[0]
+
+        for candidate in candidates.tolist():
+            if candidate < position:
+                continue
+
+            offset = block_index[int(weak_hashes[candidate])].get(
+                _strong_hash(target_view[candidate:candidate + block_size])
+            )
+            if offset is None:
+                continue
+
+            # Extend the match forward block by block, then byte by byte
+            length = block_size
+            while (
+                candidate + length + block_size <= len(target)
+                and offset + length + block_size <= len(base)
+                and target_view[candidate + length:candidate + length + block_size]
+                == base_view[offset + length:offset + length + block_size]
+            ):
+                length += block_size
+
+            tail = min(block_size, len(target) - candidate - length, len(base) - offset - length)
+            if tail > 0:
+                differs = np.nonzero(
+                    target_arr[candidate + length:candidate + length + tail]
+                    != base_arr[offset + length:offset + length + tail]
+                )[0]
+                length += int(differs[0]) if len(differs) else tail
+
+            emit_literal(literal_start, candidate)
+            ops.append(b"C" + COPY_OP.pack(offset, length))
+            position = literal_start = candidate + length
+
+    emit_literal(literal_start, len(target))
+
+    header = HEADER.pack(
+        MAGIC,
+        hashlib.sha256(base).digest(),
+        hashlib.sha256(target).digest(),
+        len(target)
+    )
+    return header + zlib.compress(b"".join(ops), 9)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Reconstruct the target artifact (reference implementation of the device side)
+
+    Raises:
+        ValueError: wrong base, corrupt delta, or checksum mismatch
+    """
+    if len(delta) < HEADER.size:
+        raise ValueError("Delta too short")
+
+    magic, base_sha, target_sha, target_size = HEADER.unpack_from(delta)
+    if magic != MAGIC:
+        raise ValueError("Not an OTA delta package")
+    if hashlib.sha256(base).digest() != base_sha:
+        raise ValueError("Delta was built for a different base artifact")
+
+    ops = zlib.decompress(delta[HEADER.size:])
+    output = bytearray()
+    cursor = 0
+    while cursor < len(ops):
+        tag = ops[cursor:cursor + 1]
+        cursor += 1
+        if tag == b"C":
+            offset, length = COPY_OP.unpack_from(ops, cursor)
+            cursor += COPY_OP.size
+            output += base[offset:offset + length]
+        elif tag == b"L":
+            (length,) = LITERAL_OP.unpack_from(ops, cursor)
+            cursor += LITERAL_OP.size
+            output += ops[cursor:cursor + length]
+            cursor += length
+        else:
+            raise ValueError(f"Unknown delta op: {tag!r}")
+
+    if len(output) != target_size or hashlib.sha256(output).digest() != target_sha:
+        raise ValueError("Reconstructed artifact failed checksum verification")
+
+    return bytes(output)
@@ -0,0 +1,366 @@
+"""
+OTA Artifact Store
+Content-addressed store for SAIT OTA model packages
+
+Each (model version, format) is published once:
+- The artifact is copied to blobs/<sha256> while its SHA-256 and size are computed
+- index.json maps version/format -> checksum, size and source fingerprint
+- Later requests read checksum/size/ETag from memory (no disk reads, no hashing)
+- The newest keep_versions versions stay published (delta bases for devices
+  that are behind); older ones are dropped with their blobs and deltas
+
+Fleet update polls revalidate with If-None-Match and mostly get 304s.
+
+Deltas between two published artifacts are built once per (base, target)
+content pair, stored under deltas/ and indexed in deltas.json.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from config.settings import settings
+from services.ota_delta import compute_delta
+from services.result_cache import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Read size used while hashing/copying artifacts
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Deltas larger than this fraction of the full artifact are not offered
+DELTA_MAX_RATIO = 0.8
+
+
+@dataclass
+class OTAArtifact:
+    """Published OTA package"""
+    version: str
+    format: str
+    sha256: str
+    size_bytes: int
+    source_fingerprint: str
+    published_at: float
+    path: Path
+
+    @property
+    def checksum(self) -> str:
+        return f"sha256:{self.sha256}"
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag (the content hash)"""
+        return f'"{self.sha256}"'
+
+    @property
+    def size_kb(self) -> int:
+        return (self.size_bytes + 1023) // 1024
+
+
+@dataclass
+class OTADelta:
+    """Binary delta between two published artifacts"""
+    base_version: str
+    target_version: str
+    base_sha256: str
+    target_sha256: str
+    sha256: str
+    size_bytes: int
+    path: Path
+
+    @property
+    def checksum(self) -> str:
+        return f"sha256:{self.sha256}"
+
+    @property
+    def result_checksum(self) -> str:
+        """Checksum of the artifact reconstructed from base + delta"""
+        return f"sha256:{self.target_sha256}"
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256}"'
+
+    @property
+    def size_kb(self) -> int:
+        return (self.size_bytes + 1023) // 1024
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+
+class OTAArtifactStore:
+    """Content-addressed OTA artifact store with an on-disk index"""
+
+    def __init__(self, root_dir: Union[str, Path], keep_versions: int = 5):
+        """
+        Args:
+            root_dir: Store directory (holds index.json and blobs/)
+            keep_versions: Model versions kept published (newest first)
+        """
+        self.root_dir = Path(root_dir)
+        self.keep_versions = max(1, keep_versions)
+        self.blob_dir = self.root_dir / "blobs"
+        self.index_path = self.root_dir / "index.json"
+        self.delta_dir = self.root_dir / "deltas"
+        self.delta_index_path = self.root_dir / "deltas.json"
+
+        self._artifacts: Dict[str, Dict[str, OTAArtifact]] = {}
+        # "<base sha>:<target sha>" -> {sha256, size_bytes} or None (delta not worthwhile)
+        self._deltas: Dict[str, Optional[Dict]] = {}
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+        self._load_index()
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except Exception as e:
+            logger.warning(f"OTA index unreadable, starting empty: {e}")
+            return
+
+        for version, formats in index.items():
+            for fmt, entry in formats.items():
+                path = self._blob_path(entry["sha256"])
+                if path.exists():
+                    self._artifacts.setdefault(version, {})[fmt] = OTAArtifact(**entry, path=path)
+
+        logger.info(f"OTA store: {sum(len(f) for f in self._artifacts.values())} artifacts indexed")
+
+        if self.delta_index_path.exists():
+            try:
+                with open(self.delta_index_path) as f:
+                    self._deltas = json.load(f)
+            except Exception as e:
+                logger.warning(f"OTA delta index unreadable, rebuilding deltas on demand: {e}")
+
+    def _write_json(self, path: Path, data: Dict):
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _save_index(self):
+        index = {
+            version: {
+                fmt: {k: v for k, v in asdict(artifact).items() if k != "path"}
+                for fmt, artifact in formats.items()
+            }
+            for version, formats in self._artifacts.items()
+        }
+        self._write_json(self.index_path, index)
+
+    def _ingest(self, source_path: Path) -> tuple:
+        """Copy source into the blob store, hashing in the same pass"""
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.blob_dir / f".ingest-{os.getpid()}-{id(source_path)}"
+
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            with open(source_path, "rb") as src, open(tmp_path, "wb") as dst:
+                while True:
+                    chunk = src.read(HASH_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+
+            digest = sha256.hexdigest()
+            blob_path = self._blob_path(digest)
+            if blob_path.exists():
+                tmp_path.unlink()
+            else:
+                os.replace(tmp_path, blob_path)
+            return digest, size, blob_path
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _prune_blob(self, sha256: str):
+        """Delete a blob no longer referenced by any artifact"""
+        referenced = any(
+            artifact.sha256 == sha256
+            for formats in self._artifacts.values()
+            for artifact in formats.values()
+        )
+        if not referenced:
+            self._blob_path(sha256).unlink(missing_ok=True)
+
+    def _prune_versions(self, current: str):
+        """Drop versions beyond keep_versions (oldest publish first; never current)"""
+        published = {
+            version: max(artifact.published_at for artifact in formats.values())
+            for version, formats in self._artifacts.items()
+        }
+        newest = sorted(published, key=published.get, reverse=True)
+        stale = [version for version in newest[self.keep_versions:] if version != current]
+        if not stale:
+            return
+
+        dropped = [artifact for version in stale for artifact in self._artifacts.pop(version).values()]
+        for artifact in dropped:
+            self._prune_blob(artifact.sha256)
+
+        # Deltas from or to content that is no longer published
+        live = {artifact.sha256 for formats in self._artifacts.values() for artifact in formats.values()}
+        for key in list(self._deltas):
+            base_sha256, target_sha256 = key.split(":")
+            if base_sha256 not in live or target_sha256 not in live:
+                del self._deltas[key]
+                self._delta_path(base_sha256, target_sha256).unlink(missing_ok=True)
+        self._write_json(self.delta_index_path, self._deltas)
+
+        logger.info(f"♻️ OTA versions unpublished: {', '.join(stale)}")
+
+    def get(self, version: str, format: str) -> Optional[OTAArtifact]:
+        """Published artifact for version/format (memory lookup only)"""
+        return self._artifacts.get(version, {}).get(format)
+
+    def versions(self) -> Iterable[str]:
+        return self._artifacts.keys()
+
+    async def publish(self, version: str, format: str, source_path: Union[str, Path]) -> OTAArtifact:
+        """
+        Get the artifact for version/format, ingesting source_path if needed
+
+        The source is only re-read when its fingerprint (size + mtime) differs
+        from the one recorded at publish time.
+
+        Args:
+            version: Model version
+            format: Package format ('int8', 'cmsis-nn', 'pytorch')
+            source_path: File holding the package
+
+        Returns:
+            Published artifact
+        """
+        fingerprint = file_fingerprint(source_path)
+        existing = self.get(version, format)
+        if existing is not None and existing.source_fingerprint == fingerprint:
+            return existing
+
+        lock = self._locks.setdefault((version, format), asyncio.Lock())
+        async with lock:
+            existing = self.get(version, format)
+            if existing is not None and existing.source_fingerprint == fingerprint:
+                return existing
+
+            digest, size, blob_path = await asyncio.to_thread(self._ingest, Path(source_path))
+            artifact = OTAArtifact(
+                version=version,
+                format=format,
+                sha256=digest,
+                size_bytes=size,
+                source_fingerprint=fingerprint,
+                published_at=time.time(),
+                path=blob_path
+            )
+
+            self._artifacts.setdefault(version, {})[format] = artifact
+            if existing is not None and existing.sha256 != digest:
+                self._prune_blob(existing.sha256)
+            self._prune_versions(current=version)
+            self._save_index()
+
+            logger.info(f"📦 OTA artifact published: {version}/{format} {artifact.checksum} ({size} bytes)")
+            return artifact
+
+
+    def _delta_path(self, base_sha256: str, target_sha256: str) -> Path:
+        return self.delta_dir / f"{base_sha256}-{target_sha256}.delta"
+
+    def _build_delta(self, base: OTAArtifact, target: OTAArtifact) -> Optional[Dict]:
+        """Compute and store a delta (None when it would not save enough bytes)"""
+        delta = compute_delta(base.path.read_bytes(), target.path.read_bytes())
+        if len(delta) > DELTA_MAX_RATIO * target.size_bytes:
+            return None
+
+        self.delta_dir.mkdir(parents=True, exist_ok=True)
+        path = self._delta_path(base.sha256, target.sha256)
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+        tmp_path.write_bytes(delta)
+        os.replace(tmp_path, path)
+
+        return {"sha256": hashlib.sha256(delta).hexdigest(), "size_bytes": len(delta)}
+
+    async def get_delta(self, base: OTAArtifact, target: OTAArtifact) -> Optional[OTADelta]:
+        """
+        Delta turning base into target, built on first request and cached
+
+        Returns:
+            Delta package, or None if base == target or a delta is not worthwhile
+        """
+        if base.sha256 == target.sha256:
+            return None
+
+        key = f"{base.sha256}:{target.sha256}"
+        path = self._delta_path(base.sha256, target.sha256)
+
+        if key not in self._deltas or (self._deltas[key] is not None and not path.exists()):
+            lock = self._locks.setdefault(("delta", key), asyncio.Lock())
+            async with lock:
+                if key not in self._deltas or (self._deltas[key] is not None and not path.exists()):
+                    start = time.time()
+                    self._deltas[key] = await asyncio.to_thread(self._build_delta, base, target)
+                    self._write_json(self.delta_index_path, self._deltas)
+
+                    entry = self._deltas[key]
+                    logger.info(
+                        f"📦 OTA delta {base.version} -> {target.version}: "
+                        f"{entry['size_bytes'] if entry else 'not worthwhile'} bytes "
+                        f"(full {target.size_bytes}) in {time.time() - start:.2f}s"
+                    )
+
+        entry = self._deltas[key]
+        if entry is None:
+            return None
+
+        return OTADelta(
+            base_version=base.version,
+            target_version=target.version,
+            base_sha256=base.sha256,
+            target_sha256=target.sha256,
+            sha256=entry["sha256"],
+            size_bytes=entry["size_bytes"],
+            path=path
+        )
+
+
+# Singleton instance
+_ota_store: Optional[OTAArtifactStore] = None
+
+
+def get_ota_store() -> OTAArtifactStore:
+    """Get or create OTA artifact store singleton"""
+    global _ota_store
+
+    if _ota_store is None:
+        _ota_store = OTAArtifactStore(settings.OTA_ARTIFACT_DIR, keep_versions=settings.OTA_KEEP_VERSIONS)
+
+    return _ota_store
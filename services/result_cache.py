@@ -0,0 +1,252 @@
+"""
+Analysis Result Cache
+Content-addressed cache for media analysis results shared by Halo, SAIT and the media API
+
+Results are keyed by the SHA-256 of the raw media bytes plus the model version:
+- Tier 1: in-process LRU (per worker, no network hop)
+- Tier 2: Redis (REDIS_URL, shared across workers and restarts)
+
+Retries from mobile clients and duplicate forwards from SAIT gateways cost one
+lookup instead of a full inference. Concurrent identical requests share a single
+inference (single-flight).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis is optional - the LRU tier works on its own
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    logger.warning("redis not installed - analysis cache is in-process only")
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# How long to stop talking to Redis after a connection error
+REDIS_RETRY_AFTER_SEC = 30.0
+
+
+def file_fingerprint(path: Optional[Union[str, Path]]) -> str:
+    """Cheap fingerprint of a weights file (size + mtime) for cache versioning"""
+    if not path:
+        return "none"
+    try:
+        stat = os.stat(path)
+        return f"{stat.st_size}-{stat.st_mtime_ns}"
+    except OSError:
+        return "missing"
+
+
+class AnalysisResultCache:
+    """
+    Two-tier content-addressed cache for analysis results
+
+    Values must be JSON-serializable dicts (they are stored in Redis as JSON).
+    Redis errors never fail a request - the cache degrades to the local tier
+    and retries Redis after REDIS_RETRY_AFTER_SEC.
+    """
+
+    KEY_PREFIX = "atlas:analysis"
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        enabled: bool = True,
+        redis_client: Optional[Any] = None,
+        redis_url: Optional[str] = None
+    ):
+        """
+        Args:
+            max_entries: Size of the in-process LRU tier
+            ttl_seconds: Expiry for both tiers
+            enabled: When False every lookup misses and compute() always runs
+            redis_client: Pre-built async Redis client (or a fake exposing get/set)
+            redis_url: Redis URL used when no client is given
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.redis = redis_client
+        if self.redis is None and enabled and redis_url and REDIS_AVAILABLE:
+            self.redis = aioredis.from_url(
+                redis_url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5
+            )
+        self._redis_down_until = 0.0
+
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "shared_inflight": 0}
+
+    @classmethod
+    def make_key(cls, namespace: str, media_bytes: BytesLike, model_version: str) -> str:
+        """Build cache key from media content hash and model version"""
+        digest = hashlib.sha256(media_bytes).hexdigest()
+        return f"{cls.KEY_PREFIX}:{namespace}:{model_version}:{digest}"
+
+    def _get_local(self, key: str) -> Optional[Dict]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Dict):
+        self._local[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def _redis_usable(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _mark_redis_down(self, error: Exception):
+        if time.monotonic() >= self._redis_down_until:
+            logger.warning(f"Analysis cache: Redis unavailable, using local tier only ({error})")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER_SEC
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """Look up a result (local tier first, then Redis)"""
+        if not self.enabled:
+            return None
+
+        value = self._get_local(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+
+        if self._redis_usable():
+            try:
+                raw = await self.redis.get(key)
+                if raw is not None:
+                    value = json.loads(raw)
+                    self._set_local(key, value)
+                    self.stats["redis_hits"] += 1
+                    return value
+            except Exception as e:
+                self._mark_redis_down(e)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Dict):
+        """Store a result in both tiers"""
+        if not self.enabled:
+            return
+
+        self._set_local(key, value)
+
+        if self._redis_usable():
+            try:
+                await self.redis.set(key, json.dumps(value), ex=self.ttl_seconds)
+            except Exception as e:
+                self._mark_redis_down(e)
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        media_bytes: BytesLike,
+        model_version: str,
+        compute: Callable[[], Awaitable[Dict]],
+        cacheable: Callable[[Dict], bool] = lambda result: result.get("success", True)
+    ) -> Dict:
+        """
+        Return cached result for media, or run compute() once and cache it
+
+        Args:
+            namespace: Analysis kind (e.g. 'photo', 'audio', 'sait_audio')
+            media_bytes: Raw media bytes as received
+            model_version: Version of the model(s) producing the result
+            compute: Coroutine factory running the actual inference
+            cacheable: Predicate deciding whether a result may be cached
+
+        Returns:
+            Analysis result dict
+        """
+        if not self.enabled:
+            return await compute()
+
+        key = self.make_key(namespace, media_bytes, model_version)
+
+        # Callers get shallow copies so per-request fields never leak into the cache
+        cached = await self.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        # Share in-flight inference with identical concurrent requests
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["shared_inflight"] += 1
+            return dict(await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+            if cacheable(result):
+                await self.set(key, result)
+            future.set_result(result)
+            return dict(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log noise
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """Cache statistics for monitoring"""
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "local_entries": len(self._local),
+            "max_entries": self.max_entries,
+            "redis_configured": self.redis is not None,
+            "redis_available": self._redis_usable()
+        }
+
+
+# Singleton instance
+_analysis_cache: Optional[AnalysisResultCache] = None
+
+
+def get_analysis_cache() -> AnalysisResultCache:
+    """Get or create analysis result cache singleton"""
+    global _analysis_cache
+
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisResultCache(
+            max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ANALYSIS_CACHE_TTL_SEC,
+            enabled=settings.ANALYSIS_CACHE_ENABLED,
+            redis_url=settings.REDIS_URL
+        )
+
+    return _analysis_cache
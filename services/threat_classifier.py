@@ -232,3 +232,16 @@ async def get_threat_classifier() -> ThreatClassifier:
         _threat_classifier = ThreatClassifier()
         await _threat_classifier.initialize()
     return _threat_classifier
+
+
+async def create_threat_classifier() -> ThreatClassifier:
+    """Build a new (unshared) threat classifier with a freshly read taxonomy"""
+    classifier = ThreatClassifier()
+    await classifier.initialize()
+    return classifier
+
+
+def set_threat_classifier(classifier: Optional[ThreatClassifier]):
+    """Replace the singleton (model manager swap)"""
+    global _threat_classifier
+    _threat_classifier = classifier
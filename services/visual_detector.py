@@ -29,6 +29,7 @@ except ImportError:
 
 from config.settings import settings
 from services.model_storage import get_model_storage
+from services.result_cache import file_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class VisualDetector:
             "weapon": 0.3  # Custom class if available
         }
 
-    async def initialize(self):
+    async def initialize(self, version: str = "latest", force_download: bool = False):
         """Load YOLOv8 model (from S3 if configured, else local/download)"""
         if not YOLO_AVAILABLE:
             logger.warning("⚠️ YOLOv8 not available - using mock detection")
@@ -75,7 +76,7 @@ class VisualDetector:
 
             # Try to get model from storage (S3 or local cache)
             storage = get_model_storage()
-            model_path = await storage.get_model(model_name, version="latest")
+            model_path = await storage.get_model(model_name, version=version, force_download=force_download)
 
             # Fallback: Check Frontline location (local dev)
             if not model_path:
@@ -117,6 +118,13 @@ class VisualDetector:
             self.loaded = False
             return False
 
+    def warm_up(self):
+        """Run one blank frame through YOLO (fuses layers, allocates buffers)"""
+        if not self.loaded:
+            return
+        blank = np.zeros((640, 640, 3), dtype=np.uint8)
+        self.model(blank, device=self.device, verbose=False)
+
     async def detect_from_bytes(self, image_bytes: bytes) -> Dict:
         """
         Detect objects in image from bytes
@@ -146,6 +154,41 @@ class VisualDetector:
             logger.error(f"Error in detect_from_bytes: {e}")
             return {"error": str(e), "objects_detected": []}
 
+    def _detect_objects(self, images: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Run YOLO on a batch of OpenCV images (blocking)
+
+        Returns:
+            Per image, detections above their class confidence threshold
+        """
+        results = self.model(images, device=self.device, verbose=False)
+
+        batch_detections = []
+        for result in results:
+            detections = []
+            for box in result.boxes:
+                class_id = int(box.cls[0])
+                confidence = float(box.conf[0])
+                bbox = box.xyxy[0].tolist()  # [x1, y1, x2, y2]
+
+                # Get class name
+                class_name = result.names[class_id]
+
+                # Check confidence threshold
+                threshold = self.confidence_thresholds.get(class_name, 0.5)
+                if confidence >= threshold:
+                    detections.append({
+                        "class": class_name,
+                        "class_id": class_id,
+                        "confidence": round(confidence, 3),
+                        "bbox": [round(coord, 1) for coord in bbox]
+                    })
+            batch_detections.append(detections)
+        return batch_detections
+
+    async def _detect(self, image: np.ndarray) -> List[Dict]:
+        return self._detect_objects([image])[0]
+
     async def detect(self, image: np.ndarray) -> Dict:
         """
         Detect objects in OpenCV image
@@ -156,34 +199,12 @@ class VisualDetector:
         Returns:
             Detection results
         """
-        if not self.loaded or not YOLO_AVAILABLE:
+        if not self.loaded:
             return self._mock_detection()
 
         try:
             # Run inference
-            results = self.model(image, device=self.device, verbose=False)
-
-            # Parse results
-            detections = []
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].tolist()  # [x1, y1, x2, y2]
-
-                    # Get class name
-                    class_name = result.names[class_id]
-
-                    # Check confidence threshold
-                    threshold = self.confidence_thresholds.get(class_name, 0.5)
-                    if confidence >= threshold:
-                        detections.append({
-                            "class": class_name,
-                            "class_id": class_id,
-                            "confidence": round(confidence, 3),
-                            "bbox": [round(coord, 1) for coord in bbox]
-                        })
+            detections = await self._detect(image)
 
             # Analyze threat level
             threat_analysis = self._analyze_threats(detections)
@@ -205,6 +226,13 @@ class VisualDetector:
                 "objects_detected": []
             }
 
+    @property
+    def cache_version(self) -> str:
+        """Version string keying cached results (model file + weights fingerprint)"""
+        if not self.loaded or not self.model_path:
+            return "mock-detector"
+        return f"{Path(self.model_path).name}:{file_fingerprint(self.model_path)}"
+
     def _analyze_threats(self, detections: List[Dict]) -> Dict:
         """Analyze detections for threats"""
         people_count = len([d for d in detections if d['class'] == 'person'])
@@ -272,3 +300,16 @@ async def get_visual_detector() -> VisualDetector:
         _visual_detector = VisualDetector()
         await _visual_detector.initialize()
     return _visual_detector
+
+
+async def create_visual_detector(version: str = "latest", force_download: bool = False) -> VisualDetector:
+    """Build and load a new (unshared) visual detector instance"""
+    detector = VisualDetector()
+    await detector.initialize(version=version, force_download=force_download)
+    return detector
+
+
+def set_visual_detector(detector: Optional[VisualDetector]):
+    """Replace the singleton (model manager swap, or None on eviction so weights can be freed)"""
+    global _visual_detector
+    _visual_detector = detector
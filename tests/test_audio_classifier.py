@@ -0,0 +1,62 @@
+"""Audio classifier: batched classification"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from config.settings import settings
+from services.audio_classifier import AudioClassifier
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    monkeypatch.setattr(settings, "FEATURE_POOL_ENABLED", False)
+    classifier = AudioClassifier(model_path=None)
+    asyncio.run(classifier.load_model())
+    return classifier
+
+
+def test_invalid_clips_do_not_fail_the_batch(classifier, monkeypatch):
+    predicted_rows = []
+    predict = classifier._predict_async
+
+    async def counting_predict(features):
+        predicted_rows.append(len(features))
+        return await predict(features)
+
+    monkeypatch.setattr(classifier, "_predict_async", counting_predict)
+
+    noise = np.random.default_rng(0).uniform(-0.5, 0.5, 16000).astype(np.float32)
+    clips = [noise, np.array([], dtype=np.float32), np.full(16000, np.nan, dtype=np.float32), "not audio", noise[::-1].copy()]
+
+    results = asyncio.run(classifier.classify_audio_batch(clips))
+
+    assert len(results) == len(clips)
+    assert [result["success"] for result in results] == [True, False, False, False, True]
+    assert all(result["error"] for result in results[1:4])
+    assert predicted_rows == [2]
+
+
+class _S3Storage:
+    storage_type = "s3"
+
+    def __init__(self, path):
+        self.path = path
+        self.requests = []
+
+    async def get_model(self, model_name, version=None, force_download=False):
+        self.requests.append((model_name, version, force_download))
+        return self.path
+
+
+def test_latest_weights_are_resolved_in_s3(tmp_path, monkeypatch):
+    from services import audio_classifier, model_storage
+
+    storage = _S3Storage(tmp_path / "sait_audio_classifier.pth")
+    monkeypatch.setattr(model_storage, "get_model_storage", lambda: storage)
+
+    model_path = asyncio.run(audio_classifier._resolve_model_path("latest"))
+
+    assert storage.requests == [("sait_audio_classifier.pth", "latest", False)]
+    assert model_path == str(storage.path)
@@ -0,0 +1,37 @@
+"""Edge packages: formats and cache retention"""
+
+import os
+
+import torch
+
+from services.audio_classifier import AudioClassifierModel
+from services.edge_package import FLAT_MAGIC, build_edge_package
+
+
+def _model(seed):
+    torch.manual_seed(seed)
+    return AudioClassifierModel().eval()
+
+
+def test_int8_package_is_flat_binary(tmp_path):
+    path = build_edge_package(_model(0), "int8", tmp_path)
+
+    assert path is not None and path.suffix == ".bin"
+    assert path.read_bytes().startswith(FLAT_MAGIC)
+
+
+def test_packages_beyond_keep_are_pruned_per_format(tmp_path):
+    header = build_edge_package(_model(0), "cmsis-nn", tmp_path, keep=1)
+    packages = []
+    for seed in range(3):
+        packages.append(build_edge_package(_model(seed), "int8", tmp_path, keep=2))
+        os.utime(packages[-1], (seed, seed))  # Distinct mtimes regardless of clock resolution
+
+    assert sorted(tmp_path.glob("sait_edge-*-int8.bin")) == sorted(packages[1:])
+
+    # Reuse marks a package as recently used, so the next build prunes the other one
+    assert build_edge_package(_model(1), "int8", tmp_path, keep=2) == packages[1]
+    latest = build_edge_package(_model(3), "int8", tmp_path, keep=2)
+
+    assert sorted(tmp_path.glob("sait_edge-*-int8.bin")) == sorted([packages[1], latest])
+    assert header.exists()
@@ -0,0 +1,58 @@
+"""Model manager: load states and memory accounting"""
+
+import asyncio
+
+import pytest
+
+from services import model_manager as mm
+from services.inference_client import InferenceServerError, RemoteAudioClassifier
+
+
+class _UnreadyClient:
+    """Inference server that has not loaded the audio classifier"""
+
+    async def model_info(self, name):
+        return {"status": "unloaded"}
+
+
+@pytest.fixture
+def manager():
+    manager = mm.ModelManager()
+    manager._initialized = True
+    return manager
+
+
+def test_remote_proxy_raises_when_server_model_not_ready():
+    with pytest.raises(InferenceServerError):
+        asyncio.run(RemoteAudioClassifier(_UnreadyClient()).load_model())
+
+
+def test_unready_remote_proxy_is_recorded_as_failed(manager, monkeypatch):
+    async def connect():
+        classifier = RemoteAudioClassifier(_UnreadyClient())
+        await classifier.load_model()
+        return classifier
+
+    monkeypatch.setattr(mm, "_model_factories", lambda: {"audio_classifier": (connect, None, lambda model: None)})
+
+    asyncio.run(manager._load_in_background("audio_classifier"))
+
+    assert manager._status["audio_classifier"] == "failed"
+    assert "audio_classifier" not in manager._handles
+
+
+class _YOLO:
+    """Stand-in for ultralytics.YOLO: not an nn.Module, holds the network in .model"""
+
+    def __init__(self):
+        import torch.nn as nn
+        self.model = nn.Sequential(nn.Conv2d(3, 64, 3), nn.Conv2d(64, 128, 3))
+
+
+def test_detector_behind_yolo_wrapper_counts_toward_budget():
+    from services.visual_detector import VisualDetector
+
+    detector = VisualDetector()
+    detector.model = _YOLO()
+
+    assert mm._resident_mb(detector) > 0.2
@@ -0,0 +1,51 @@
+"""OTA artifact store: versions, retention and deltas"""
+
+import asyncio
+
+import numpy as np
+
+from services.ota_delta import apply_delta
+from services.ota_store import OTAArtifactStore
+
+
+def _package(path, seed, changed=0):
+    """A 64KB 'model package'; changed bytes differ from the seed-0 package"""
+    data = np.random.default_rng(0).integers(0, 256, 64 * 1024, dtype=np.uint8)
+    if changed:
+        data[:changed] = np.random.default_rng(seed).integers(0, 256, changed, dtype=np.uint8)
+    path.write_bytes(data.tobytes())
+    return path
+
+
+def test_publish_new_version_offers_delta_from_previous(tmp_path):
+    store = OTAArtifactStore(tmp_path / "ota")
+    v1 = asyncio.run(store.publish("1.0.0.aaaa", "int8", _package(tmp_path / "v1.bin", 0)))
+    v2 = asyncio.run(store.publish("1.0.0.bbbb", "int8", _package(tmp_path / "v2.bin", 1, changed=2048)))
+
+    assert sorted(store.versions()) == ["1.0.0.aaaa", "1.0.0.bbbb"]
+    assert v1.path.exists() and v2.path.exists()
+
+    base = store.get("1.0.0.aaaa", "int8")
+    delta = asyncio.run(store.get_delta(base, v2))
+    assert delta is not None
+    assert delta.base_version == "1.0.0.aaaa"
+    assert delta.size_bytes < v2.size_bytes
+    assert apply_delta(base.path.read_bytes(), delta.path.read_bytes()) == v2.path.read_bytes()
+
+
+def test_versions_beyond_keep_are_unpublished(tmp_path):
+    store = OTAArtifactStore(tmp_path / "ota", keep_versions=2)
+    def publish(index):
+        package = _package(tmp_path / f"{index}.bin", index + 1, changed=1024)
+        return asyncio.run(store.publish(f"1.0.0.{index}", "int8", package))
+
+    artifacts = [publish(0), publish(1)]
+    assert asyncio.run(store.get_delta(artifacts[0], artifacts[1])) is not None
+    artifacts.append(publish(2))
+
+    assert sorted(store.versions()) == ["1.0.0.1", "1.0.0.2"]
+    assert not artifacts[0].path.exists()
+    assert not list((tmp_path / "ota" / "deltas").glob(f"{artifacts[0].sha256}-*"))
+
+    # Reopened from disk
+    assert sorted(OTAArtifactStore(tmp_path / "ota").versions()) == ["1.0.0.1", "1.0.0.2"]